@@ -0,0 +1,257 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # ✅ Aucune fenêtre réelle
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("POKEMON_NEW_GAME", "1")  # ✅ Mesures reproductibles : aucune sauvegarde reprise
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # ✅ Bannière de pygame absente de la sortie JSON
+
+import argparse
+import contextlib
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+
+from utils.startup import timeline  # Avant pygame : la chronologie couvre tous les imports
+
+import pygame
+
+# Script d'entrée par défaut : un tour de carte, l'équipe affichée puis masquée
+DEFAULT_SCRIPT = {
+    "hold": [
+        {"key": "right", "start": 0, "frames": 60},
+        {"key": "down", "start": 60, "frames": 60},
+        {"key": "left", "start": 120, "frames": 60},
+        {"key": "up", "start": 180, "frames": 60}
+    ],
+    "press": [
+        {"key": "t", "at": 90},
+        {"key": "t", "at": 150}
+    ]
+}
+
+PHASES = ("events", "movement", "render", "team", "present", "frame")
+
+
+def stub_fetch_pokemon(pokemon_name):
+    """Remplace PokéAPI : statistiques fixes et sprites locaux"""
+    name = pokemon_name.lower()
+    return {
+        "name": name.capitalize(),
+        "hp": 40,
+        "attack": 50,
+        "defense": 40,
+        "sprite_front": None,
+        "sprite_back": None,
+        "sprite_path_front": f"assets/sprites/{name}_front.png",
+        "sprite_path_back": f"assets/sprites/{name}_back.png"
+    }
+
+
+class ScriptedKeys:
+    """Remplace pygame.key.get_pressed() : touches enfoncées selon le script"""
+
+    def __init__(self, held):
+        self.held = held
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+def load_script(path):
+    if not path:
+        return DEFAULT_SCRIPT
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def compile_script(script, frames):
+    """Convertit le script en touches maintenues et touches pressées par image"""
+    held = [set() for _ in range(frames)]
+    pressed = [[] for _ in range(frames)]
+    length = max([h["start"] + h["frames"] for h in script.get("hold", [])] +
+                 [p["at"] + 1 for p in script.get("press", [])] + [1])
+
+    # Le script est rejoué en boucle jusqu'au nombre d'images demandé
+    for offset in range(0, frames, length):
+        for hold in script.get("hold", []):
+            key = pygame.key.key_code(hold["key"])
+            for frame in range(offset + hold["start"], min(frames, offset + hold["start"] + hold["frames"])):
+                held[frame].add(key)
+        for press in script.get("press", []):
+            frame = offset + press["at"]
+            if frame < frames:
+                pressed[frame].append(pygame.key.key_code(press["key"]))
+    return held, pressed
+
+
+def percentiles(samples):
+    """p50 / p95 / p99 / moyenne / max en millisecondes (rang le plus proche)"""
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+
+    def rank(p):
+        index = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+        return round(ordered[index] * 1000, 4)
+
+    return {
+        "p50": rank(50),
+        "p95": rank(95),
+        "p99": rank(99),
+        "mean": round(sum(ordered) / len(ordered) * 1000, 4),
+        "max": round(ordered[-1] * 1000, 4)
+    }
+
+
+def build_controller(map_mode, debug):
+    """Construit le GameController avec PokéAPI remplacée par un stub local"""
+    from utils import pokeapi
+    pokeapi.fetch_pokemon = stub_fetch_pokemon
+
+    # Importé après le remplacement : le contrôleur et le service de rencontres utilisent le stub
+    with timeline.phase("imports"):
+        import controllers.game_controller as game_controller
+    from utils import trace
+
+    if map_mode == "grid":
+        game_controller.USE_TILED = False
+
+    controller = game_controller.GameController()
+    controller.debug_movement = debug
+    trace.disable(*trace.CATEGORIES)
+
+    # Les rencontres sont comptées mais pas jouées (le combat attend des clics)
+    controller.encounters = 0
+
+    def count_encounter(pokemon_data):
+        controller.encounters += 1
+    controller._trigger_pokemon_encounter = count_encounter
+
+    return controller
+
+
+def benchmark_resume(controller, runs):
+    """
+    Reprise rapide : instantané sur le thread principal, écriture atomique, puis relecture
+    et restauration du joueur, de l'équipe et de l'inventaire (sans PokéAPI)
+    """
+    from models.inventory import Inventory
+    from models.player import Player
+    from utils.save_game import apply_snapshot, read_save, take_snapshot, write_save
+
+    clock = time.perf_counter
+    timings = {"snapshot": [], "write": [], "resume": []}
+    size = 0
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "save.pksv")
+        for _ in range(runs):
+            start = clock()
+            snapshot = take_snapshot(controller.player, controller.inventory, controller.map_id)
+            after_snapshot = clock()
+            size = write_save(path, snapshot)
+            after_write = clock()
+            apply_snapshot(read_save(path), Player(name=""), Inventory())
+            end = clock()
+
+            timings["snapshot"].append(after_snapshot - start)
+            timings["write"].append(after_write - after_snapshot)
+            timings["resume"].append(end - after_write)
+
+    result = {phase: percentiles(samples) for phase, samples in timings.items()}
+    result["bytes"] = size
+    return result
+
+
+def run_benchmark(frames, script, map_mode="auto", debug=True, seed=0, resume_runs=100):
+    random.seed(seed)
+    controller = build_controller(map_mode, debug)
+    held, pressed = compile_script(script, frames)
+    timings = {phase: [] for phase in PHASES}
+    clock = time.perf_counter
+
+    for frame in range(frames):
+        for key in pressed[frame]:
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0))
+
+        start = clock()
+        controller.handle_events()
+        after_events = clock()
+        controller.simulate(ScriptedKeys(held[frame]))
+        after_movement = clock()
+        controller.view.render()
+        after_render = clock()
+        if controller.team_view.visible:
+            controller.team_view.render()
+        after_team = clock()
+        controller.present()
+        end = clock()
+
+        timings["events"].append(after_events - start)
+        timings["movement"].append(after_movement - after_events)
+        timings["render"].append(after_render - after_movement)
+        timings["team"].append(after_team - after_render)
+        timings["present"].append(end - after_team)
+        timings["frame"].append(end - start)
+
+        # Boucle non limitée : tick() sans argument ne fait que mesurer
+        controller.clock.tick()
+
+    from utils.asset_pack import get_asset_pack
+    pack = get_asset_pack()
+    result = {
+        "frames": frames,
+        "map": "tiled" if controller.using_tiled else "grid",
+        "dirty_rects": controller.view.dirty_rendering,
+        "reused_frames": controller.view.reused_frames,
+        "team_panel_rebuilds": controller.team_view.rebuilds,
+        "asset_pack": pack.stats() if pack is not None else None,
+        "debug": debug,
+        "encounters": controller.encounters,
+        "startup_ms": timeline.as_dict(),
+        "save_ms": benchmark_resume(controller, resume_runs),
+        "phases_ms": {phase: percentiles(samples) for phase, samples in timings.items()},
+        "environment": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "video_driver": os.environ.get("SDL_VIDEODRIVER")
+        }
+    }
+    controller.encounter_service.shutdown()
+    pygame.quit()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du temps d'image du jeu (sans fenêtre)")
+    parser.add_argument("--frames", type=int, default=600, help="nombre d'images à exécuter")
+    parser.add_argument("--script", help="script d'entrées JSON (touches 'hold' et 'press')")
+    parser.add_argument("--map", choices=("auto", "grid"), default="auto",
+                        help="carte Tiled si disponible (auto) ou carte traditionnelle (grid)")
+    parser.add_argument("--no-debug", action="store_true", help="désactiver l'affichage de débogage")
+    parser.add_argument("--seed", type=int, default=0, help="graine aléatoire")
+    parser.add_argument("--resume-runs", type=int, default=100,
+                        help="nombre de sauvegardes/reprises mesurées")
+    parser.add_argument("--output", help="fichier JSON de sortie (sinon sortie standard)")
+    args = parser.parse_args(argv)
+
+    # Messages du jeu et traces sur la sortie d'erreur : la sortie standard ne porte que le JSON
+    from utils import trace
+    trace.set_output(sys.stderr)
+    with contextlib.redirect_stdout(sys.stderr):
+        result = run_benchmark(args.frames, load_script(args.script), args.map, not args.no_debug, args.seed,
+                               args.resume_runs)
+        trace.flush()
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
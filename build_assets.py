@@ -0,0 +1,62 @@
+import argparse
+import glob
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # ✅ Aucune fenêtre réelle
+
+from utils import settings
+from utils.asset_pack import build_asset_pack
+from utils.encounter_service import BATTLE_SPRITE_SIZE
+from views.team_view import ICON_SIZE
+
+SPRITES_DIR = "assets/sprites"
+# Tailles d'affichage du joueur : tuiles Tiled (16 px x2) et carte en grille (40 px)
+PLAYER_SIZES = [(32, 32), (40, 40)]
+EXCLUDED = {"mew-sprite.png"}  # Planche d'origine, jamais affichée telle quelle
+
+
+def default_sprites(sprites_dir=SPRITES_DIR):
+    """Couples (sprite, taille) tels que les vues les demandent au cache de surfaces"""
+    sprites = []
+    for path in sorted(glob.glob(os.path.join(sprites_dir, "mew", "*.png"))):
+        sprites.extend((path, size) for size in PLAYER_SIZES)
+    for path in sorted(glob.glob(os.path.join(sprites_dir, "*.png"))):
+        if os.path.basename(path) in EXCLUDED:
+            continue
+        # Combat : face et dos ; écran de l'équipe : icône du sprite de face
+        sprites.append((path, BATTLE_SPRITE_SIZE))
+        if not path.endswith("_back.png"):
+            sprites.append((path, (ICON_SIZE, ICON_SIZE)))
+    return sprites
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Construit le paquet de sprites pré-mis à l'échelle lu par le jeu (mmap)")
+    parser.add_argument("--sprites", default=SPRITES_DIR, help="dossier des sprites")
+    parser.add_argument("--output", default=settings.ASSET_PACK_PATH, help="fichier paquet à écrire")
+    args = parser.parse_args(argv)
+
+    sprites = default_sprites(args.sprites)
+    if not sprites:
+        print(f"❌ ERREUR : Aucun sprite dans {args.sprites}.")
+        return
+
+    start = time.perf_counter()
+    try:
+        report = build_asset_pack(sprites, args.output)
+    except (OSError, ValueError) as e:
+        print(f"❌ Construction du paquet impossible: {e}")
+        return
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"✅ {report['entries']} sprites : {report['built']} mis à l'échelle, {report['reused']} repris du paquet")
+    if report["written"]:
+        print(f"✅ {report['path']} ({os.path.getsize(report['path'])} octets, {elapsed:.0f} ms)")
+    else:
+        print(f"✅ {report['path']} déjà à jour ({elapsed:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # ✅ Aucune fenêtre réelle
+
+from utils.map_compiler import compile_map
+
+DEFAULT_MAPS = ["assets/maps/pokemon_map.tmx"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile les cartes TMX en cartes binaires (.pkmap)")
+    parser.add_argument("maps", nargs="*", default=DEFAULT_MAPS, help="fichiers TMX à compiler")
+    args = parser.parse_args(argv)
+
+    for tmx_path in args.maps:
+        start = time.perf_counter()
+        try:
+            output = compile_map(tmx_path)
+        except Exception as e:
+            print(f"❌ Échec de la compilation de {tmx_path}: {e}")
+            continue
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"✅ {tmx_path} -> {output} ({os.path.getsize(output)} octets, {elapsed:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
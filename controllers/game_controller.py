@@ -1,6 +1,7 @@
 import pygame
-import random
+import importlib.util
 import os
+import time
 from models.player import Player
 from models.pokemon import Pokemon
 from models.inventory import Inventory
@@ -8,31 +9,60 @@ from views.game_view import GameView
 from models.combat import Combat
 from views.combat_view import CombatView
 from views.team_view import TeamView
-from utils.pokeapi import fetch_pokemon, fetch_trainer_sprite
+from utils.pokeapi import fetch_trainer_sprite
+from utils import settings, trace
+from utils.save_game import Autosaver, apply_snapshot, read_save, take_snapshot
+from utils.startup import timeline
+from utils.encounter_service import EncounterService
+from utils.encounters import EncounterEngine, build_map_encounter_zones
+from utils.surface_cache import get_surface_cache
 
-# Importer les deux types de cartes
-try:
-    from utils.map_loader import TiledMap
-    USE_TILED = True
-except ImportError:
-    USE_TILED = False
+# Cartes Tiled : pytmx et pyscroll ne sont importés qu'au chargement de la carte
+USE_TILED = all(importlib.util.find_spec(name) is not None for name in ("pytmx", "pyscroll"))
+if not USE_TILED:
     print("⚠️ Module pytmx non trouvé. Utilisation de la carte traditionnelle.")
 from models.map import Map  # Toujours importer la carte traditionnelle comme fallback
 
+# Pokémon de départ (données PokéAPI chargées en arrière-plan pendant le démarrage)
+STARTER_POKEMON = "pikachu"
+
+# Durée minimale de la transition vers un combat (millisecondes)
+ENCOUNTER_TRANSITION_MS = 600
+
 class GameController:
     def __init__(self):
-        pygame.init()
+        with timeline.phase("pygame"):
+            pygame.init()
+        
+        # Ouvrir la fenêtre tout de suite : la carte et les sprites sont convertis à son format
+        with timeline.phase("display"):
+            pygame.display.set_mode((800, 600))
+            pygame.display.set_caption("Pokémon Game")
+        
+        # Sauvegarde relue avant tout le reste : une équipe sauvegardée évite toute requête PokéAPI
+        with timeline.phase("save"):
+            self._resume = read_save(settings.SAVE_PATH) if settings.RESUME_SAVE else None
+        
+        # Données réseau lancées en arrière-plan pendant le chargement de la carte et des sprites
+        self.encounter_service = EncounterService()
+        self._team_future = None
+        if self._resume is None or not self._resume.party:
+            timeline.begin("team")
+            self._team_future = self.encounter_service.request(STARTER_POKEMON)
+            self._team_future.add_done_callback(lambda _: timeline.end("team"))
         
         # Taille des tuiles en pixels
         self.tile_size = 40
         
         # Carte Tiled ou traditionnelle
         self.using_tiled = False
+        timeline.begin("map")
         try:
             if USE_TILED:
-                map_path = "assets/maps/pokemon_map.tmx"
+                map_path = settings.MAP_PATH
                 if os.path.exists(map_path):
-                    self.map = TiledMap(map_path)
+                    from utils.map_streaming import open_tiled_map
+                    self.map = open_tiled_map(map_path)
                     self.using_tiled = True
                     print("✅ Carte Tiled chargée avec succès")
                     # Ajuster la taille des tuiles selon le facteur d'échelle
@@ -47,6 +77,13 @@ class GameController:
             self.map = Map(width=20, height=10)
             print("✅ Carte traditionnelle chargée (fallback)")
         
+        # Sans pytmx, aucune carte Tiled n'a été tentée
+        if not self.using_tiled and not hasattr(self, 'map'):
+            self.map = Map(width=20, height=10)
+            print("✅ Carte traditionnelle chargée")
+        timeline.end("map")
+        self.map_id = settings.MAP_PATH if self.using_tiled else "grid"
+        
         # Position initiale du joueur
         try:
             if self.using_tiled and hasattr(self.map, 'get_spawn_position'):
@@ -65,35 +102,91 @@ class GameController:
         self.inventory = Inventory()
         self.inventory.add_item("Pokeball", 5)
         
+        # Reprise rapide : équipe, inventaire et position (sur la même carte) relus de la sauvegarde
+        if self._resume is not None:
+            with timeline.phase("resume"):
+                same_map = self._resume.map_id == self.map_id
+                apply_snapshot(self._resume, self.player, self.inventory, restore_position=same_map)
+            print(f"💾 Partie reprise : {[p.name for p in self.player.pokemons]} en {self.player.position}")
+        if self.using_tiled:
+            self.map.focus(*self.player.position)
+        
         # Rectangle pour les collisions
-        self.player_rect = pygame.Rect(
-            self.player.position[0],
-            self.player.position[1],
-            self.tile_size,
-            self.tile_size
-        )
+        self.player_rect = self._player_hitbox(*self.player.position)
+        
+        # Le joueur est une entité de l'index spatial de la carte (objets touchés à chaque pas)
+        self._touching = set()
+        if self.using_tiled:
+            self.map.object_index.insert(self.player, self.player_rect)
+            self._touching = set(self._objects_touching())
         
         # Autres initialisations
         self.running = True
         self.clock = pygame.time.Clock()
         
-        # Charger les Pokémon
-        self._init_pokemon_team()
+        # Initialiser les vues (sprites du joueur, textures)
+        with timeline.phase("views"):
+            self.view = GameView(self, self.tile_size)
+            self.team_view = TeamView(self)
+        
+        # Vitesse de déplacement en pixels par pas de simulation
+        self.move_speed = 10
+        self._last_position = self.player.position
         
-        # Initialiser les vues
-        self.view = GameView(self, self.tile_size)
-        self.team_view = TeamView(self)
+        # Pas de temps fixe : la simulation avance par pas de 1/SIMULATION_RATE seconde,
+        # le rendu interpole entre l'état précédent et l'état courant
+        self.simulation_step = 1.0 / settings.SIMULATION_RATE
+        self._accumulator = 0.0
+        self._last_frame_time = None
+        self._previous_position = self.player.position
+        self._previous_camera = self._camera_position()
         
         # Variables pour le débogage du mouvement
         self.debug_movement = True
         
+        # Traces de débogage : catégories de la touche D, plus celles de POKEMON_TRACE
+        trace.set_enabled(trace.DEBUG_CATEGORIES, self.debug_movement)
+        trace.configure_from_env()
+        
         # Variables pour les rencontres Pokémon
         self.encounter_cooldown = 0  # Pour éviter des rencontres trop fréquentes
         
-    def _init_pokemon_team(self):
+        # Tables de rencontres par zone ; le nombre de pas avant la prochaine rencontre est tiré à l'avance
+        if self.using_tiled:
+            zones = self.map.encounter_zones
+        else:
+            zones = build_map_encounter_zones(self.map)
+        self.encounter_engine = EncounterEngine(zones)
+        
+        # Préparation des rencontres en arrière-plan (données + sprites décodés)
+        self.encounter_service.prefetch(zones.species())
+        if self._team_future is None:
+            self._prefetch_player_sprite()
+        
+        # Sauvegarde automatique sur un thread d'arrière-plan
+        self.autosaver = Autosaver(settings.SAVE_PATH)
+        self._next_autosave = time.perf_counter() + settings.AUTOSAVE_INTERVAL
+        self.pending_encounter = None  # (options, future, début de la transition)
+        timeline.mark("ready")
+    
+    def _prefetch_player_sprite(self):
+        """Prépare le sprite de dos du premier Pokémon de l'équipe"""
+        if self.player.pokemons:
+            lead = self.player.pokemons[0]
+            self.encounter_service.request_sprite(lead.sprite_path_back or lead.sprite_path)
+        
+    def _collect_team(self, wait=False):
+        """Ajoute le Pokémon de départ dès que ses données sont prêtes (ou les attend si wait)"""
+        if self._team_future is None or not (wait or self._team_future.done()):
+            return
+        future, self._team_future = self._team_future, None
+        self._init_pokemon_team(future.result())
+        self._prefetch_player_sprite()
+    
+    def _init_pokemon_team(self, prepared):
         """Initialise l'équipe Pokémon du joueur"""
         try:
-            pikachu_data = fetch_pokemon("pikachu")
+            pikachu_data = prepared.data if prepared is not None else None
             if pikachu_data:
                 starter_pokemon = Pokemon(
                     name=pikachu_data["name"],
@@ -128,187 +221,369 @@ class GameController:
     
     def run(self):
         """Boucle principale du jeu"""
-        # Vitesse de déplacement en pixels par touche
-        move_speed = 10
+        while self.running:
+            self.step()
+            
+            # Limiter les FPS (le rendu peut être plus lent que la simulation)
+            self.clock.tick(settings.TARGET_FPS)
         
-        last_position = self.player.position
+        # Nettoyage (dernière sauvegarde écrite avant de quitter)
+        self.save_game()
+        self.autosaver.shutdown()
+        self.encounter_service.shutdown()
+        pygame.quit()
+    
+    def save_game(self):
+        """Dépose un instantané pour le thread de sauvegarde (la boucle de jeu n'attend jamais le disque)"""
+        if self._team_future is not None:
+            return False  # Équipe pas encore chargée : rien de cohérent à sauvegarder
+        self.autosaver.submit(take_snapshot(self.player, self.inventory, self.map_id))
+        return True
+    
+    def _autosave(self):
+        """Sauvegarde automatique toutes les AUTOSAVE_INTERVAL secondes (hors transition de combat)"""
+        if settings.AUTOSAVE_INTERVAL <= 0 or self.pending_encounter is not None:
+            return
+        now = time.perf_counter()
+        if now >= self._next_autosave:
+            self._next_autosave = now + settings.AUTOSAVE_INTERVAL
+            self.save_game()
+    
+    def step(self):
+        """Exécute une image complète : événements, pas de simulation fixes, rendu et affichage"""
+        self.handle_events()
         
-        while self.running:
-            # Diminuer le cooldown des rencontres
-            if self.encounter_cooldown > 0:
-                self.encounter_cooldown -= 1
+        # Transition vers un combat en cours : la simulation est suspendue
+        if self.pending_encounter is not None:
+            self._update_pending_encounter()
+            self.reset_timestep()
+        else:
+            keys = pygame.key.get_pressed()
             
-            # Gestion des événements
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+            # Accumuler le temps réel écoulé et le consommer par pas fixes
+            now = time.perf_counter()
+            if self._last_frame_time is not None:
+                self._accumulator += min(now - self._last_frame_time, settings.MAX_FRAME_TIME)
+            self._last_frame_time = now
+            
+            while self._accumulator >= self.simulation_step:
+                self.simulate(keys)
+                self._accumulator -= self.simulation_step
+                # Rencontre déclenchée : le joueur s'arrête sur la case d'herbe, le reste du retard est oublié
+                if self.pending_encounter is not None:
+                    self.reset_timestep()
+                    break
+
+            self.render(self._accumulator / self.simulation_step)
+        
+        self.present()
+        self._autosave()
+    
+    def reset_timestep(self):
+        """Oublie le temps accumulé (après une pause : combat, transition...)"""
+        self._accumulator = 0.0
+        self._last_frame_time = None
+        self._previous_position = self.player.position
+        self._previous_camera = self._camera_position()
+    
+    def simulate(self, keys):
+        """Un pas de simulation fixe : rencontres, déplacement et minuteurs d'animation"""
+        self._previous_position = self.player.position
+        self._previous_camera = self._camera_position()
+        
+        # Diminuer le cooldown des rencontres (en pas de simulation)
+        if self.encounter_cooldown > 0:
+            self.encounter_cooldown -= 1
+        
+        self.update_movement(keys)
+        if self.using_tiled:
+            self.map.camera.step()
+        self.view.tick(self.simulation_step * 1000)
+    
+    def _camera_position(self):
+        if self.using_tiled:
+            return (self.map.camera_x, self.map.camera_y)
+        return (0, 0)
+    
+    def interpolated_position(self, alpha):
+        """Position du joueur entre le pas précédent et le pas courant"""
+        (x0, y0), (x1, y1) = self._previous_position, self.player.position
+        return (x0 + (x1 - x0) * alpha, y0 + (y1 - y0) * alpha)
+    
+    def interpolated_camera(self, alpha):
+        """Position de la caméra entre le pas précédent et le pas courant"""
+        (x0, y0), (x1, y1) = self._previous_camera, self._camera_position()
+        return (x0 + (x1 - x0) * alpha, y0 + (y1 - y0) * alpha)
+    
+    def handle_events(self):
+        """Traite les événements pygame (fermeture, touches T, D, F5 et ESC)"""
+        # Pokémon de départ chargé en arrière-plan
+        self._collect_team()
+        
+        # Gestion des événements
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
                     self.running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        self.running = False
-                    elif event.key == pygame.K_t:
-                        self.team_view.visible = not self.team_view.visible
-                    elif event.key == pygame.K_d:
-                        # Activer/désactiver le débogage
-                        self.debug_movement = not self.debug_movement
-                        print(f"🐛 Débogage {'activé' if self.debug_movement else 'désactivé'}")
-                        
-            # Gestion du mouvement
-            keys = pygame.key.get_pressed()
-            dx, dy = 0, 0
+                elif event.key == pygame.K_F5:
+                    if self.save_game():
+                        print("💾 Partie sauvegardée")
+                elif event.key == pygame.K_t:
+                    self.team_view.visible = not self.team_view.visible
+                elif event.key == pygame.K_d:
+                    # Activer/désactiver le débogage
+                    self.debug_movement = not self.debug_movement
+                    trace.set_enabled(trace.DEBUG_CATEGORIES, self.debug_movement)
+                    print(f"🐛 Débogage {'activé' if self.debug_movement else 'désactivé'}")
+                    if self.using_tiled:
+                        self.map.debug_print_map_state()
+    
+    def update_movement(self, keys):
+        """Déplace le joueur selon les touches enfoncées (collisions, caméra, rencontres)"""
+        move_speed = self.move_speed
+        dx, dy = 0, 0
+        
+        if keys[pygame.K_LEFT]:
+            dx = -move_speed
+            self.view.update_player_sprite("left")
+        elif keys[pygame.K_RIGHT]:
+            dx = move_speed
+            self.view.update_player_sprite("right")
+        elif keys[pygame.K_UP]:
+            dy = -move_speed
+            self.view.update_player_sprite("up")
+        elif keys[pygame.K_DOWN]:
+            dy = move_speed
+            self.view.update_player_sprite("down")
+        else:
+            self.view.is_moving = False
+        
+        # Appliquer le déplacement si possible
+        if dx != 0 or dy != 0:
+            new_x = self.player.position[0] + dx
+            new_y = self.player.position[1] + dy
             
-            if keys[pygame.K_LEFT]:
-                dx = -move_speed
-                self.view.update_player_sprite("left")
-            elif keys[pygame.K_RIGHT]:
-                dx = move_speed
-                self.view.update_player_sprite("right")
-            elif keys[pygame.K_UP]:
-                dy = -move_speed
-                self.view.update_player_sprite("up")
-            elif keys[pygame.K_DOWN]:
-                dy = move_speed
-                self.view.update_player_sprite("down")
+            # Mise à jour du rectangle du joueur pour les collisions
+            new_rect = self._player_hitbox(new_x, new_y)
+            
+            # Vérifier si la position est valide selon le type de carte
+            is_valid = False
+            
+            if self.using_tiled:
+                is_valid = self.map.is_walkable(new_x, new_y)
             else:
-                self.view.is_moving = False
+                # Pour la carte traditionnelle
+                grid_x = new_x // self.tile_size
+                grid_y = new_y // self.tile_size
+                
+                # Vérifier les limites de la carte
+                valid_position = (0 <= grid_x < self.map.width and 
+                                0 <= grid_y < self.map.height)
+                
+                if valid_position:
+                    is_valid = self.map.is_walkable(grid_x, grid_y)
             
-            # Appliquer le déplacement si possible
-            if dx != 0 or dy != 0:
-                new_x = self.player.position[0] + dx
-                new_y = self.player.position[1] + dy
+            # Appliquer le déplacement si la position est valide
+            if is_valid:
+                # Mettre à jour la position du joueur
+                self.player.position = (new_x, new_y)
                 
                 # Mise à jour du rectangle du joueur pour les collisions
-                new_rect = pygame.Rect(new_x, new_y, self.tile_size, self.tile_size)
+                self.player_rect = new_rect
                 
-                # Vérifier si la position est valide selon le type de carte
-                is_valid = False
+                # Mettre à jour la caméra pour la carte Tiled
+                if self.using_tiled and hasattr(self.map, 'update'):
+                    try:
+                        # Force le rectangle du joueur à utiliser le centre
+                        player_center_rect = pygame.Rect(
+                            new_x - (self.tile_size // 2),
+                            new_y - (self.tile_size // 2),
+                            self.tile_size,
+                            self.tile_size
+                        )
+                        
+                        self.map.update(player_center_rect)
+                        if trace.on.camera:
+                            trace.debug("camera", "🎮 Mise à jour de la caméra à (%s, %s)", new_x, new_y)
+                    except Exception as e:
+                        print(f"❌ Erreur lors de la mise à jour de la caméra: {e}")
+                        import traceback
+                        traceback.print_exc()
                 
+                # Portes, panneaux et déclencheurs touchés par le joueur
                 if self.using_tiled:
-                    is_valid = self.map.is_walkable(new_x, new_y)
-                else:
-                    # Pour la carte traditionnelle
-                    grid_x = new_x // self.tile_size
-                    grid_y = new_y // self.tile_size
-                    
-                    # Vérifier les limites de la carte
-                    valid_position = (0 <= grid_x < self.map.width and 
-                                    0 <= grid_y < self.map.height)
-                    
-                    if valid_position:
-                        is_valid = self.map.is_walkable(grid_x, grid_y)
+                    self.map.object_index.move(self.player, self.player_rect)
+                    self._check_object_triggers()
                 
-                # Appliquer le déplacement si la position est valide
-                if is_valid:
-                    # Mettre à jour la position du joueur
-                    self.player.position = (new_x, new_y)
-                    
-                    # Mise à jour du rectangle du joueur pour les collisions
-                    self.player_rect.x = new_x
-                    self.player_rect.y = new_y
-                    
-                    # Mettre à jour la caméra pour la carte Tiled
-                    if self.using_tiled and hasattr(self.map, 'update'):
-                        try:
-                            # Force le rectangle du joueur à utiliser le centre
-                            player_center_rect = pygame.Rect(
-                                new_x - (self.tile_size // 2),
-                                new_y - (self.tile_size // 2),
-                                self.tile_size,
-                                self.tile_size
-                            )
-                            
-                            self.map.update(player_center_rect)
-                            print(f"🎮 Mise à jour de la caméra à ({new_x}, {new_y})")
-                        except Exception as e:
-                            print(f"❌ Erreur lors de la mise à jour de la caméra: {e}")
-                            import traceback
-                            traceback.print_exc()
-                    
-                    # Vérifier les rencontres Pokémon dans l'herbe
-                    self._check_pokemon_encounter(new_x, new_y)
-                    
-                    # Débogage du mouvement
-                    if self.debug_movement and self.player.position != last_position:
-                        print(f"Nouvelle position: {self.player.position}")
-                        last_position = self.player.position
-            
-            # Rendu
-            self.view.render()
-            
-            # Afficher l'équipe si nécessaire
-            if self.team_view.visible:
-                self.team_view.render()
-            
-            # Rafraîchir l'écran et limiter les FPS
-            pygame.display.flip()
-            self.clock.tick(60)
+                # Vérifier les rencontres Pokémon dans l'herbe
+                self._check_pokemon_encounter(*self.player.position)
+                
+                # Débogage du mouvement
+                if trace.on.movement and self.player.position != self._last_position:
+                    trace.debug("movement", "Nouvelle position: %s", self.player.position)
+                    self._last_position = self.player.position
+    
+    def _player_hitbox(self, x, y):
+        """Rectangle du joueur : centré sur sa position (carte Tiled) ou case de la grille"""
+        rect = pygame.Rect(x, y, self.tile_size, self.tile_size)
+        if self.using_tiled:
+            rect.center = (x, y)
+        return rect
+    
+    def _objects_touching(self):
+        return [obj for obj in self.map.objects_in(self.player_rect) if obj is not self.player]
+    
+    def _check_object_triggers(self):
+        """Déclenche les objets que le joueur vient d'atteindre (requête sur l'index spatial)"""
+        touching = self._objects_touching()
+        entered = [obj for obj in touching if obj not in self._touching]
+        self._touching = set(touching)
+        for obj in entered:
+            self._on_object_enter(obj)
+    
+    def _on_object_enter(self, obj):
+        """Interaction avec un objet de la carte (porte, téléporteur, panneau, déclencheur)"""
+        from utils.map_loader import SIGN_OBJECT_TYPE, WARP_OBJECT_TYPES
         
-        # Nettoyage
-        pygame.quit()
+        obj_type = getattr(obj, "type", None)
+        properties = getattr(obj, "properties", None) or {}
+        if trace.on.objects:
+            trace.debug("objects", "📍 Objet atteint: %s (%s)", getattr(obj, "name", None), obj_type)
+        
+        if obj_type in WARP_OBJECT_TYPES and "target_x" in properties and "target_y" in properties:
+            self._warp_to(int(properties["target_x"]), int(properties["target_y"]))
+        elif obj_type == SIGN_OBJECT_TYPE and properties.get("text"):
+            print(f"🪧 {properties['text']}")
+    
+    def _warp_to(self, tile_x, tile_y):
+        """Téléporte le joueur au centre d'une tuile (sans interpolation depuis l'ancienne position)"""
+        x = int((tile_x + 0.5) * self.map.real_tile_width)
+        y = int((tile_y + 0.5) * self.map.real_tile_height)
+        self.player.position = (x, y)
+        self.player_rect = self._player_hitbox(x, y)
+        self.map.object_index.move(self.player, self.player_rect)
+        self.map.focus(x, y)
+        
+        # Les objets de l'arrivée ne se déclenchent qu'une fois quittés puis atteints à nouveau
+        self._touching = set(self._objects_touching())
+        self._previous_position = self.player.position
+        self._previous_camera = self._camera_position()
+        print(f"🚪 Téléportation vers la tuile ({tile_x}, {tile_y})")
+    
+    def render(self, alpha=1.0):
+        """Dessine la vue principale puis l'équipe si elle est affichée"""
+        self.view.render(alpha)
+        
+        # Afficher l'équipe si nécessaire
+        if self.team_view.visible:
+            self.team_view.render()
+    
+    def present(self):
+        """Rafraîchit l'écran (seulement les zones modifiées si possible)"""
+        if self.view.full_redraw:
+            pygame.display.flip()
+        elif self.view.dirty_rects:
+            pygame.display.update(self.view.dirty_rects)
+        if timeline.mark("first_frame"):
+            self._report_startup()
+    
+    def _report_startup(self):
+        """Temps jusqu'à la première image, puis chronologie complète si POKEMON_STARTUP_PROFILE"""
+        print(f"⏱️ Première image affichée en {timeline.time_to_first_frame:.0f} ms")
+        if settings.STARTUP_PROFILE == "1":
+            timeline.report()
+        elif settings.STARTUP_PROFILE:
+            timeline.export(settings.STARTUP_PROFILE)
+            print(f"⏱️ Chronologie du démarrage exportée dans {settings.STARTUP_PROFILE}")
     
     def _check_pokemon_encounter(self, x, y):
-        """Vérifie si une rencontre Pokémon doit se déclencher"""
+        """Fait avancer le compteur de rencontres d'un pas (hors zone : rien à faire)"""
         if self.encounter_cooldown > 0:
             return
         
-        is_in_grass = False
-        
         if self.using_tiled:
-            is_in_grass = self.map.is_grass(x, y)
+            tile_x, tile_y = self.map.pixel_to_tile(x, y)
         else:
-            # Pour la carte traditionnelle
-            grid_x = x // self.tile_size
-            grid_y = y // self.tile_size
-            
-            if 0 <= grid_x < self.map.width and 0 <= grid_y < self.map.height:
-                is_in_grass = self.map.is_grass(grid_x, grid_y)
-        
-        # Déboguer si le joueur est dans l'herbe
-        if is_in_grass and self.debug_movement:
-            print("🌿 Joueur dans les hautes herbes!")
-        
-        # Chance de rencontre uniquement dans les hautes herbes
-        if is_in_grass and random.random() < 0.03:  # 3% de chance par pas
-            print("🌿 Rencontre dans les hautes herbes!")
-            self._trigger_pokemon_encounter()
-            self.encounter_cooldown = 60  # Environ 1 seconde à 60 FPS
+            # Pour la carte traditionnelle (zones reconstruites si la grille a changé)
+            tile_x, tile_y = x // self.tile_size, y // self.tile_size
+            if self.encounter_engine.zones.version != self.map.version:
+                self.encounter_engine.zones = build_map_encounter_zones(self.map)
+        
+        pokemon_data = self.encounter_engine.step(tile_x, tile_y)
+        
+        # Déboguer si le joueur est dans une zone de rencontre
+        if trace.on.encounter and self.encounter_engine.in_zone(tile_x, tile_y):
+            trace.debug("encounter", "🌿 Joueur dans les hautes herbes! (budget %.3f)",
+                        self.encounter_engine.budget)
+        
+        if pokemon_data is not None:
+            trace.info("encounter", "🌿 Rencontre dans les hautes herbes!")
+            self._trigger_pokemon_encounter(pokemon_data)
+            self.encounter_cooldown = settings.SIMULATION_RATE  # Environ 1 seconde de simulation
     
-    def _trigger_pokemon_encounter(self):
-        """Déclenche une rencontre avec un Pokémon sauvage"""
-        # Liste de Pokémon sauvages possibles
-        wild_pokemon_options = [
-            {"name": "rattata", "level": 5},
-            {"name": "pidgey", "level": 4},
-            {"name": "caterpie", "level": 3},
-            {"name": "weedle", "level": 3}
-        ]
-        
-        # Sélectionner un Pokémon au hasard
-        pokemon_data = random.choice(wild_pokemon_options)
+    def _trigger_pokemon_encounter(self, pokemon_data):
+        """Déclenche une rencontre avec un Pokémon sauvage (sans bloquer la boucle de jeu)"""
+        # Les données sont normalement déjà prêtes grâce au préchargement
+        future = self.encounter_service.request(pokemon_data["name"])
+        self.pending_encounter = (pokemon_data, future, pygame.time.get_ticks())
+    
+    def _update_pending_encounter(self):
+        """Affiche la transition et démarre le combat dès que la rencontre est prête"""
+        pokemon_data, future, start = self.pending_encounter
+        elapsed = pygame.time.get_ticks() - start
+        
+        self.view.invalidate()
+        self.view.render()
+        self.view.render_encounter_transition(min(1.0, elapsed / ENCOUNTER_TRANSITION_MS))
+        
+        if elapsed < ENCOUNTER_TRANSITION_MS or not future.done():
+            return
+        
+        self.pending_encounter = None
+        self.encounter_cooldown = settings.SIMULATION_RATE  # Environ 1 seconde de simulation après la rencontre
         
+        # La transition (puis l'écran de combat) a tout recouvert : prochaine image complète
+        self.view.invalidate()
+        prepared = future.result()
+        if prepared is None:
+            print(f"❌ Rencontre annulée : {pokemon_data['name']} indisponible")
+            return
+        
+        # Le combat a besoin de l'équipe : attendre le Pokémon de départ s'il n'est pas encore prêt
+        self._collect_team(wait=True)
+        self._start_encounter(pokemon_data, prepared)
+        
+        # Redessiner le jeu par-dessus l'écran de combat avant l'affichage
+        self.render()
+    
+    def _start_encounter(self, pokemon_data, prepared):
+        """Crée le Pokémon sauvage à partir des données préparées et lance le combat"""
         try:
-            # Récupérer les données du Pokémon
-            fetched_pokemon = fetch_pokemon(pokemon_data["name"])
+            fetched_pokemon = prepared.data
+            level_multiplier = pokemon_data["level"] / 5  # Ajuster selon le niveau
             
-            if fetched_pokemon:
-                level_multiplier = pokemon_data["level"] / 5  # Ajuster selon le niveau
-                
-                wild_pokemon = Pokemon(
-                    name=fetched_pokemon["name"],
-                    hp=int(fetched_pokemon["hp"] * level_multiplier),
-                    max_hp=int(fetched_pokemon["hp"] * level_multiplier),
-                    attack=int(fetched_pokemon["attack"] * level_multiplier),
-                    defense=int(fetched_pokemon["defense"] * level_multiplier),
-                    sprite_path=fetched_pokemon["sprite_path_front"]
-                )
-                
-                print(f"Un {wild_pokemon.name} sauvage apparaît!")
-                
-                # Initialiser le combat
-                combat = Combat(self.player.pokemons[0], wild_pokemon)
-                combat_view = CombatView(self, combat)
-                
-                # Démarrer la boucle de combat
-                self._handle_combat(combat, combat_view)
+            wild_pokemon = Pokemon(
+                name=fetched_pokemon["name"],
+                hp=int(fetched_pokemon["hp"] * level_multiplier),
+                max_hp=int(fetched_pokemon["hp"] * level_multiplier),
+                attack=int(fetched_pokemon["attack"] * level_multiplier),
+                defense=int(fetched_pokemon["defense"] * level_multiplier),
+                sprite_path=fetched_pokemon["sprite_path_front"],
+                level=pokemon_data["level"]
+            )
+            
+            print(f"Un {wild_pokemon.name} sauvage apparaît!")
+            
+            # Initialiser le combat (le sprite du joueur est déjà décodé dans le cache partagé)
+            combat = Combat(self.player.pokemons[0], wild_pokemon)
+            combat_view = CombatView(self, combat, wild_sprite=prepared.sprite("front"))
+            if trace.on.render:
+                trace.debug("render", "Cache de surfaces: %s", get_surface_cache().stats())
+            
+            # Démarrer la boucle de combat
+            self._handle_combat(combat, combat_view)
             
         except Exception as e:
             print(f"❌ Erreur lors de la rencontre Pokémon: {e}")
@@ -370,13 +645,9 @@ class GameController:
                         success = combat.attempt_capture(self.inventory)
                         
                         if success:
-                            # Ajout à l'équipe si possible
-                            added = self.player.add_pokemon(combat.wild_pokemon)
-                            
-                            if added:
-                                print(f"Bravo ! {combat.wild_pokemon.name} capturé !")
-                            else:
-                                print("Équipe pleine, capture impossible !")
+                            # Ajout à l'équipe, ou au PC si elle est pleine
+                            self.player.add_pokemon(combat.wild_pokemon)
+                            print(f"Bravo ! {combat.wild_pokemon.name} capturé !")
                             
                             combat_running = False
                         else:
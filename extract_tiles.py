@@ -1,43 +1,45 @@
+import argparse
 import os
-os.environ["SDL_VIDEODRIVER"] = "dummy"  # ✅ Évite l'erreur "No video mode has been set"
-import pygame
+import time
 
-# Configuration
-spritesheet_path = "assets/tiles/pokemon_tiles.png"
-output_folder = "assets/tiles/"
-tile_size = 32  # ⚠️ Ajuste selon ta spritesheet !
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # ✅ Évite l'erreur "No video mode has been set"
 
-# Vérification du fichier
-if not os.path.exists(spritesheet_path):
-    print(f"❌ ERREUR : Fichier {spritesheet_path} introuvable.")
-    exit(1)
+from utils.tile_atlas import build_tile_atlas
 
-# Initialisation de Pygame
-pygame.init()
-pygame.display.set_mode((1, 1))  # ✅ Simule un écran minimal pour éviter l'erreur
+# Configuration par défaut
+SPRITESHEET_PATH = "assets/tiles/pokemon_tiles.png"
+TILE_SIZE = 16  # ⚠️ Ajuste selon ta spritesheet (tilewidth du .tsx) !
 
-# Charger la spritesheet
-spritesheet = pygame.image.load(spritesheet_path).convert_alpha()
 
-# Détection automatique du nombre de colonnes et lignes
-sheet_width, sheet_height = spritesheet.get_size()
-cols = sheet_width // tile_size
-rows = sheet_height // tile_size
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Découpe une spritesheet de tuiles en un atlas dédoublonné et son index JSON")
+    parser.add_argument("spritesheet", nargs="?", default=SPRITESHEET_PATH, help="image du jeu de tuiles")
+    parser.add_argument("--tile-size", type=int, default=TILE_SIZE, help="côté d'une tuile en pixels")
+    parser.add_argument("--output", help="dossier de sortie (par défaut : celui de la spritesheet, "
+                                         "où le chargeur de cartes cherche l'atlas)")
+    parser.add_argument("--workers", type=int, help="processus de découpe (par défaut : un par cœur)")
+    args = parser.parse_args(argv)
 
-# Création du dossier de sortie s'il n'existe pas
-os.makedirs(output_folder, exist_ok=True)
+    # Vérification du fichier
+    if not os.path.exists(args.spritesheet):
+        print(f"❌ ERREUR : Fichier {args.spritesheet} introuvable.")
+        return
 
-# Extraire et sauvegarder les tuiles
-for y in range(rows):
-    for x in range(cols):
-        tile = pygame.Surface((tile_size, tile_size), pygame.SRCALPHA)
-        tile.blit(spritesheet, (0, 0), (x * tile_size, y * tile_size, tile_size, tile_size))
+    start = time.perf_counter()
+    try:
+        report = build_tile_atlas(args.spritesheet, args.tile_size, args.output, args.workers)
+    except (OSError, ValueError) as e:
+        print(f"❌ Extraction impossible: {e}")
+        return
+    elapsed = time.perf_counter() - start
 
-        # Sauvegarde sous forme de `tile_x_y.png`
-        filename = f"{output_folder}tile_{x}_{y}.png"
-        pygame.image.save(tile, filename)
-        print(f"✅ Tuile enregistrée : {filename}")
+    width, height = report["size"]
+    print(f"✅ {report['tiles']} tuiles -> {report['unique']} tuiles uniques ({width}x{height} px)")
+    print(f"✅ Atlas : {report['image']}")
+    print(f"✅ Index : {report['index']}")
+    print(f"\n✅ Extraction terminée en {elapsed:.2f} s !")
 
-pygame.quit()
-print("\n✅ Extraction terminée !")
 
+if __name__ == "__main__":
+    main()
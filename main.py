@@ -1,5 +1,9 @@
-from controllers.game_controller import GameController
+# Importé en premier : la chronologie du démarrage couvre aussi les imports
+from utils.startup import timeline
+
+with timeline.phase("imports"):
+    from controllers.game_controller import GameController
 
 if __name__ == "__main__":
     game = GameController()
-    game.run()
\ No newline at end of file
+    game.run()
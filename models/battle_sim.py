@@ -0,0 +1,270 @@
+# models/battle_sim.py
+import argparse
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from models.combat import Combat, DAMAGE_ROLL, FLEE_CHANCE
+from models.inventory import Inventory
+from models.pokemon import Pokemon
+
+# Issue d'un combat (ONGOING = pas terminé après max_turns tours)
+ONGOING = 0
+WIN = 1       # Pokémon sauvage K.O.
+LOSS = 2      # Pokémon du joueur K.O.
+CAPTURED = 3
+FLED = 4
+OUTCOMES = {"ongoing": ONGOING, "win": WIN, "loss": LOSS, "captured": CAPTURED, "fled": FLED}
+
+# Stratégies du joueur (une action par tour, comme dans GameController._handle_combat)
+ATTACK = "attack"    # Attaquer jusqu'au K.O.
+CAPTURE = "capture"  # Attaquer, puis lancer des Pokéballs sous le seuil de PV
+RUN = "run"          # Tenter de fuir à chaque tour
+STRATEGIES = (ATTACK, CAPTURE, RUN)
+
+
+class BattleResults:
+    """Résultats d'un lot de combats : tableaux (matchups, combats par matchup)"""
+
+    def __init__(self, outcome, turns, max_turns):
+        self.outcome = outcome  # int8 : ONGOING / WIN / LOSS / CAPTURED / FLED
+        self.turns = turns      # int16 : nombre de tours joués
+        self.max_turns = max_turns
+
+    @property
+    def matchups(self):
+        return self.outcome.shape[0]
+
+    def rate(self, code):
+        """Probabilité d'une issue pour chaque matchup"""
+        return (self.outcome == code).mean(axis=1)
+
+    def distribution(self, code=WIN):
+        """
+        Distribution du nombre de tours des combats terminés par 'code' :
+        tableau (matchups, max_turns + 1) de probabilités (WIN = tours avant K.O.)
+        """
+        width = self.max_turns + 1
+        rows = np.broadcast_to(np.arange(self.matchups)[:, None], self.outcome.shape)
+        mask = self.outcome == code
+        counts = np.bincount(rows[mask] * width + self.turns[mask], minlength=self.matchups * width)
+        return counts.reshape(self.matchups, width) / self.outcome.shape[1]
+
+    def table(self):
+        """Une ligne par matchup : taux de chaque issue et nombre moyen de tours"""
+        rates = {name: self.rate(code) for name, code in OUTCOMES.items()}
+        mean_turns = self.turns.mean(axis=1)
+        return [
+            dict({name: float(values[i]) for name, values in rates.items()}, turns=float(mean_turns[i]))
+            for i in range(self.matchups)
+        ]
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("❌ NumPy est requis pour le simulateur de combats (pip install numpy)")
+
+
+def _simulate(player_hp, player_defense, wild_max_hp, wild_attack, wild_hp, battles,
+              strategy, capture_threshold, pokeballs, max_turns, draw):
+    """
+    Boucle de combat vectorisée. Chaque combat est une case des tableaux ;
+    seuls les combats encore actifs sont traités à chaque tour.
+    draw(tour, indices) retourne (tirage des dégâts, tirage de chance) dans [0, 1).
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Stratégie inconnue : {strategy}")
+
+    columns = np.broadcast_arrays(
+        np.atleast_1d(player_hp), np.atleast_1d(player_defense),
+        np.atleast_1d(wild_max_hp), np.atleast_1d(wild_attack), np.atleast_1d(wild_hp)
+    )
+    matchups = columns[0].shape[0]
+    p_hp, p_def, w_max, w_atk, w_hp = [np.repeat(c.astype(np.int64), battles) for c in columns]
+
+    # Les dégâts du Pokémon sauvage ne dépendent que des statistiques du matchup
+    wild_damage = np.maximum(1, w_atk - p_def)
+    balls = np.full(p_hp.shape, pokeballs, dtype=np.int64)
+    outcome = np.zeros(p_hp.shape, dtype=np.int8)
+    turns = np.zeros(p_hp.shape, dtype=np.int16)
+    active = np.arange(p_hp.shape[0])
+    low, high = DAMAGE_ROLL
+
+    for turn in range(max_turns):
+        if active.size == 0:
+            break
+        roll, chance = draw(turn, active)
+        hp, max_hp = w_hp[active], w_max[active]
+        result = np.zeros(active.shape, dtype=np.int8)
+
+        # Choix de l'action de chaque combat
+        if strategy == ATTACK:
+            attack = np.ones(active.shape, dtype=bool)
+            throw = run = ~attack
+        elif strategy == RUN:
+            run = np.ones(active.shape, dtype=bool)
+            attack = throw = ~run
+        else:
+            throw = (balls[active] > 0) & (hp <= capture_threshold * max_hp)
+            attack = ~throw
+            run = np.zeros(active.shape, dtype=bool)
+
+        # Combat.player_attack
+        damage = np.maximum(1, (max_hp / 3 * (low + (high - low) * roll)).astype(np.int64))
+        hp = np.where(attack, np.maximum(0, hp - damage), hp)
+        w_hp[active] = hp
+        result[attack & (hp <= 0)] = WIN
+
+        # Combat.player_run
+        result[run & (chance < FLEE_CHANCE)] = FLED
+
+        # Combat.attempt_capture (une Pokéball consommée par tentative)
+        balls[active[throw]] -= 1
+        result[throw & (chance < (max_hp - hp) / max_hp)] = CAPTURED
+
+        # Contre-attaque du Pokémon sauvage si le combat continue
+        counter = result == ONGOING
+        p_hp[active[counter]] -= wild_damage[active[counter]]
+        result[counter & (p_hp[active] <= 0)] = LOSS
+
+        outcome[active] = result
+        turns[active] = turn + 1
+        active = active[result == ONGOING]
+
+    shape = (matchups, battles)
+    return BattleResults(outcome.reshape(shape), turns.reshape(shape), max_turns)
+
+
+def simulate_battles(player_hp, player_defense, wild_max_hp, wild_attack, wild_hp=None,
+                     battles=1000, strategy=ATTACK, capture_threshold=0.5, pokeballs=5,
+                     max_turns=100, seed=None):
+    """
+    Simule 'battles' combats pour chaque matchup avec les règles de Combat.
+    Les statistiques sont des scalaires ou des tableaux d'une valeur par matchup.
+    """
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+    if wild_hp is None:
+        wild_hp = wild_max_hp
+
+    def draw(turn, active):
+        return rng.random(active.size), rng.random(active.size)
+
+    return _simulate(player_hp, player_defense, wild_max_hp, wild_attack, wild_hp, battles,
+                     strategy, capture_threshold, pokeballs, max_turns, draw)
+
+
+class _ReplayRandom:
+    """Remplace le module random de Combat : rejoue les tirages d'un combat du lot"""
+
+    def __init__(self, rolls, chances):
+        self.rolls = rolls
+        self.chances = chances
+        self.turn = 0
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.rolls[self.turn]
+
+    def random(self):
+        return self.chances[self.turn]
+
+
+def play_reference(combat, inventory, strategy, capture_threshold, max_turns):
+    """Joue un combat avec la classe Combat (mêmes règles de tour que le contrôleur)"""
+    player, wild = combat.player_pokemon, combat.wild_pokemon
+    for turn in range(max_turns):
+        if isinstance(combat.rng, _ReplayRandom):
+            combat.rng.turn = turn
+
+        if strategy == RUN:
+            if combat.player_run():
+                return FLED, turn + 1
+        elif (strategy == CAPTURE and inventory.items.get("Pokeball", 0) > 0
+              and wild.hp <= capture_threshold * wild.max_hp):
+            if combat.attempt_capture(inventory):
+                return CAPTURED, turn + 1
+        else:
+            combat.player_attack()
+            if wild.is_fainted():
+                return WIN, turn + 1
+
+        combat.wild_attack()
+        if player.is_fainted():
+            return LOSS, turn + 1
+    return ONGOING, max_turns
+
+
+def check_parity(matchups=50, battles=40, strategy=CAPTURE, capture_threshold=0.5,
+                 pokeballs=5, max_turns=100, seed=0):
+    """
+    Vérifie que le simulateur par lots et la classe Combat donnent exactement les mêmes
+    combats à tirages identiques. Retourne le nombre de combats divergents.
+    """
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+    player_hp = rng.integers(20, 80, matchups)
+    player_defense = rng.integers(5, 60, matchups)
+    wild_max_hp = rng.integers(10, 120, matchups)
+    wild_attack = rng.integers(5, 70, matchups)
+    total = matchups * battles
+    rolls = rng.random((max_turns, total))
+    chances = rng.random((max_turns, total))
+
+    def draw(turn, active):
+        return rolls[turn, active], chances[turn, active]
+
+    results = _simulate(player_hp, player_defense, wild_max_hp, wild_attack, wild_max_hp, battles,
+                        strategy, capture_threshold, pokeballs, max_turns, draw)
+
+    mismatches = 0
+    for index in range(total):
+        m = index // battles
+        player = Pokemon("Joueur", int(player_hp[m]), int(player_hp[m]), 0, int(player_defense[m]), None)
+        wild = Pokemon("Sauvage", int(wild_max_hp[m]), int(wild_max_hp[m]), int(wild_attack[m]), 0, None)
+        inventory = Inventory()
+        inventory.items["Pokeball"] = pokeballs
+        combat = Combat(player, wild, rng=_ReplayRandom(rolls[:, index], chances[:, index]))
+
+        expected = play_reference(combat, inventory, strategy, capture_threshold, max_turns)
+        actual = (int(results.outcome.flat[index]), int(results.turns.flat[index]))
+        if expected != actual:
+            mismatches += 1
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulateur de combats par lots (équilibrage)")
+    parser.add_argument("--player-hp", type=int, default=45)
+    parser.add_argument("--player-defense", type=int, default=49)
+    parser.add_argument("--wild-hp", type=int, nargs="+", default=[20, 40, 60])
+    parser.add_argument("--wild-attack", type=int, default=55)
+    parser.add_argument("--battles", type=int, default=100000, help="combats par matchup")
+    parser.add_argument("--strategy", choices=STRATEGIES, default=CAPTURE)
+    parser.add_argument("--threshold", type=float, default=0.5, help="seuil de PV pour lancer une Pokéball")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--parity", action="store_true", help="vérifier la cohérence avec Combat")
+    args = parser.parse_args(argv)
+
+    if args.parity:
+        failed = False
+        for strategy in STRATEGIES:
+            mismatches = check_parity(strategy=strategy, seed=args.seed)
+            print(f"{'✅' if mismatches == 0 else '❌'} Parité {strategy}: {mismatches} combat(s) divergent(s)")
+            failed = failed or mismatches > 0
+        if failed:
+            sys.exit(1)  # Code de sortie non nul : utilisable en intégration continue
+        return
+
+    results = simulate_battles(args.player_hp, args.player_defense, args.wild_hp, args.wild_attack,
+                               battles=args.battles, strategy=args.strategy,
+                               capture_threshold=args.threshold, seed=args.seed)
+    for wild_hp, row in zip(args.wild_hp, results.table()):
+        rates = "  ".join(f"{name}={row[name]:.3f}" for name in OUTCOMES)
+        print(f"PV sauvage {wild_hp:>4}: {rates}  tours={row['turns']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,20 @@
 # models/combat.py
 import random
 
+# Règles partagées avec le simulateur par lots (models/battle_sim.py)
+DAMAGE_ROLL = (0.2, 0.5)  # Facteur aléatoire des dégâts du joueur
+FLEE_CHANCE = 0.5         # Probabilité de fuite réussie
+
 class Combat:
-    def __init__(self, player_pokemon, wild_pokemon):
+    def __init__(self, player_pokemon, wild_pokemon, rng=None):
         self.player_pokemon = player_pokemon
         self.wild_pokemon = wild_pokemon
+        # Source d'aléa (module random par défaut ; injectable pour rejouer un combat)
+        self.rng = rng if rng is not None else random
 
     def player_attack(self):
     # Calcul des dégâts plus doux (30% des PV restants du Pokémon sauvage max)
-        damage = max(1, int((self.wild_pokemon.max_hp / 3) * random.uniform(0.2, 0.5)))
+        damage = max(1, int((self.wild_pokemon.max_hp / 3) * self.rng.uniform(*DAMAGE_ROLL)))
         self.wild_pokemon.hp -= damage
         self.wild_pokemon.hp = max(0, self.wild_pokemon.hp)  # Empêche les HP négatifs
         return damage
@@ -21,12 +27,12 @@ class Combat:
 
     def player_run(self):
         # 50% de chance de fuite réussie
-        return random.random() < 0.5
+        return self.rng.random() < FLEE_CHANCE
 
     def attempt_capture(self, inventory):
         if inventory.use_item("Pokeball"):
             capture_chance = (self.wild_pokemon.max_hp - self.wild_pokemon.hp) / self.wild_pokemon.max_hp
-            success = random.random() < capture_chance
+            success = self.rng.random() < capture_chance
             return success
         else:
             print("Vous n'avez pas de Pokéball !")
@@ -5,6 +5,10 @@ class Map:
         self.width = width
         self.height = height
         
+        # Version de la grille : incrémentée à chaque modification via set_tile
+        self.version = 0
+        self._changes = []  # (version, x, y)
+        
         # Initialiser toute la grille avec de l'eau (W)
         self.grid = [["W" for _ in range(width)] for _ in range(height)]
         
@@ -63,6 +67,18 @@ class Map:
                 if 0 <= y < height and 0 <= x < width:
                     self.grid[y][x] = "H"
     
+    def set_tile(self, x, y, tile):
+        """Modifie une tuile et enregistre le changement (pour les rendus mis en cache)"""
+        if self.grid[y][x] == tile:
+            return
+        self.grid[y][x] = tile
+        self.version += 1
+        self._changes.append((self.version, x, y))
+    
+    def changes_since(self, version):
+        """Retourne les tuiles (x, y) modifiées depuis la version donnée"""
+        return [(x, y) for change_version, x, y in self._changes if change_version > version]
+    
     def is_grass(self, x, y):
         """Vérifie si la tuile à la position (x, y) est de l'herbe"""
         if 0 <= y < len(self.grid) and 0 <= x < len(self.grid[y]):
@@ -77,6 +93,10 @@ class Map:
             return self.grid[y][x] in walkable_tiles
         return False
     
+    def is_tile_walkable(self, x, y):
+        """Même interface que TiledMap pour la recherche de chemin (coordonnées de tuile)"""
+        return self.is_walkable(x, y)
+    
     def display(self):
         """Affiche la carte dans la console pour le débogage"""
         for row in self.grid:
@@ -0,0 +1,147 @@
+# models/pc_box.py
+from array import array
+from bisect import bisect_left, insort
+
+from .pokemon import FREE_SLOT, PokemonStore
+
+# Champs triables du PC (index secondaires)
+SORT_FIELDS = ("level", "hp")
+
+# Une clé d'index combine la valeur et l'emplacement : (valeur << 32) | emplacement,
+# triée comme le couple (valeur, emplacement), y compris pour une valeur négative
+_SLOT_BITS = 32
+_SLOT_MASK = (1 << _SLOT_BITS) - 1
+
+
+def _key(value, slot):
+    return (value << _SLOT_BITS) | slot
+
+
+class PCBox(PokemonStore):
+    """
+    PC de stockage des Pokémon capturés au-delà des 6 de l'équipe (plusieurs dizaines de
+    milliers) : mêmes colonnes compactes que l'équipe, plus des index secondaires tenus à jour
+    à chaque ajout, retrait ou modification. Par espèce : emplacements triés ; par niveau
+    et par PV : clés triées dans une array, ce qui donne le tri et les filtres par intervalle
+    sans parcourir tout le PC.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._by_species = {}  # nom d'espèce -> emplacements triés
+        self._sorted = {field: array("q") for field in SORT_FIELDS}
+
+    # --- Index ---
+
+    def _index(self, slot):
+        insort(self._by_species.setdefault(self.species_of(slot).name, array("I")), slot)
+        for field, keys in self._sorted.items():
+            insort(keys, _key(getattr(self, field)[slot], slot))
+
+    def _unindex(self, slot):
+        name = self.species_of(slot).name
+        slots = self._by_species[name]
+        del slots[bisect_left(slots, slot)]
+        if not slots:
+            del self._by_species[name]
+        for field, keys in self._sorted.items():
+            del keys[bisect_left(keys, _key(getattr(self, field)[slot], slot))]
+
+    def _rebuild_indexes(self):
+        self._by_species = {}
+        columns = {field: getattr(self, field) for field in SORT_FIELDS}
+        slots = self.slots()
+        for slot in slots:
+            self._by_species.setdefault(self.species_of(slot).name, array("I")).append(slot)
+        for field, column in columns.items():
+            self._sorted[field] = array("q", sorted(_key(column[slot], slot) for slot in slots))
+
+    # --- Stockage ---
+
+    def add(self, species, hp, max_hp, attack, defense, level):
+        slot = super().add(species, hp, max_hp, attack, defense, level)
+        self._index(slot)
+        return slot
+
+    def remove(self, slot):
+        if self.species_id[slot] == FREE_SLOT:
+            return
+        self._unindex(slot)
+        super().remove(slot)
+
+    def set_value(self, field, slot, value):
+        keys = self._sorted.get(field)
+        if keys is None:
+            super().set_value(field, slot, value)
+            return
+        del keys[bisect_left(keys, _key(getattr(self, field)[slot], slot))]
+        super().set_value(field, slot, value)
+        insort(keys, _key(value, slot))
+
+    def restore(self, species_keys, columns):
+        super().restore(species_keys, columns)
+        self._rebuild_indexes()
+
+    def deposit(self, pokemon):
+        """Range un Pokémon au PC : ses données passent dans les colonnes du PC"""
+        pokemon._move_to(self)
+        return pokemon
+
+    def withdraw(self, pokemon):
+        """Retire un Pokémon du PC (il redevient un Pokémon hors PC)"""
+        if pokemon._store is not self:
+            raise ValueError(f"{pokemon.name} n'est pas dans le PC")
+        pokemon._move_to()
+        return pokemon
+
+    # --- Requêtes ---
+
+    def species_counts(self):
+        return {name: len(slots) for name, slots in self._by_species.items()}
+
+    def find(self, species=None, level=None, hp=None, order="level", reverse=False):
+        """
+        Pokémon du PC filtrés et triés : species est un nom d'espèce, level et hp des intervalles
+        (min, max) inclusifs, None pour une borne ouverte ; order est "level" ou "hp"
+        (à valeur égale, ordre des emplacements).
+        """
+        if order not in self._sorted:
+            raise ValueError(f"Tri impossible sur {order!r} (champs : {', '.join(SORT_FIELDS)})")
+        ranges = {"level": level, "hp": hp}
+
+        if species is not None:
+            # Index par espèce : seuls les Pokémon de l'espèce sont lus
+            column = getattr(self, order)
+            slots = sorted(self._by_species.get(species, ()), key=lambda slot: (column[slot], slot))
+            others = ranges
+        else:
+            # Index trié sur le champ de tri : l'intervalle sur ce champ se lit par dichotomie
+            keys = self._sorted[order]
+            low, high = ranges[order] or (None, None)
+            start = 0 if low is None else bisect_left(keys, _key(low, 0))
+            end = len(keys) if high is None else bisect_left(keys, _key(high + 1, 0))
+            slots = [key & _SLOT_MASK for key in keys[start:end]]
+            others = {field: bounds for field, bounds in ranges.items() if field != order}
+
+        for field, bounds in others.items():
+            if bounds is None:
+                continue
+            column = getattr(self, field)
+            low, high = bounds
+            slots = [slot for slot in slots
+                     if (low is None or column[slot] >= low) and (high is None or column[slot] <= high)]
+
+        if reverse:
+            slots.reverse()
+        return [self.view(slot) for slot in slots]
+
+    def stats(self):
+        return {
+            "pokemons": len(self),
+            "species": len(self._by_species),
+            "slots": len(self.species_id),
+            "free_slots": len(self._free),
+            "column_bytes": self.nbytes,
+            "index_bytes": sum(len(keys) * keys.itemsize
+                               for keys in (*self._sorted.values(), *self._by_species.values()))
+        }
@@ -1,19 +1,35 @@
 # models/player.py
+from .pc_box import PCBox
 from .pokemon import Pokemon
 
+# Taille maximale de l'équipe ; les captures suivantes vont au PC
+PARTY_SIZE = 6
+
 class Player:
     def __init__(self, name, position=(0, 0)):
         self.name = name
         self.position = position
+        self.party_version = 0  # Incrémenté à chaque changement de l'équipe (affichage en cache)
         self.pokemons = []
+        self.box = PCBox()
+
+    @property
+    def pokemons(self):
+        return self._pokemons
+
+    @pokemons.setter
+    def pokemons(self, pokemons):
+        self._pokemons = pokemons
+        self.party_version += 1
 
     def add_pokemon(self, pokemon):
-            if len(self.pokemons) < 6:
+            if len(self.pokemons) < PARTY_SIZE:
                 self.pokemons.append(pokemon)
-                return True
+                self.party_version += 1
             else:
-                print("Votre équipe est pleine !")
-                return False
+                self.box.deposit(pokemon)
+                print(f"📦 Équipe pleine : {pokemon.name} est envoyé au PC ({len(self.box)} Pokémon)")
+            return True
     
     def move(self, dx, dy):
         # Change la position en fonction du déplacement demandé
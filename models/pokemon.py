@@ -1,16 +1,243 @@
 # models/pokemon.py
+import sys
+from array import array
 
-class Pokemon:
-    def __init__(self, name, hp, max_hp, attack, defense, sprite_path, sprite_path_back=None):
+# Niveau de référence des statistiques de base (statistique = base * niveau / 5)
+BASE_LEVEL = 5
+
+# Colonnes d'un stockage de Pokémon : nom -> code de type de array
+COLUMNS = (
+    ("species_id", "H"),
+    ("level", "B"),
+    ("hp", "i"),
+    ("max_hp", "i"),
+    ("attack", "i"),
+    ("defense", "i"),
+)
+FREE_SLOT = 0xFFFF  # species_id d'un emplacement libre
+
+
+class Species:
+    """
+    Données communes à tous les Pokémon d'une espèce (poids mouche) : nom, sprites
+    et statistiques de base (relevées sur le premier Pokémon de l'espèce rencontré).
+    Une seule instance par nom et sprites, partagée par l'équipe, le PC et les Pokémon sauvages.
+    """
+    __slots__ = ("name", "sprite_path", "sprite_path_back", "base_hp", "base_attack", "base_defense")
+
+    _registry = {}
+
+    def __init__(self, name, sprite_path, sprite_path_back, base_hp, base_attack, base_defense):
         self.name = name
-        self.hp = hp
-        self.max_hp = max_hp
-        self.attack = attack
-        self.defense = defense
-        self.level = 5
-        self.sprite_path = sprite_path 
-        self.sprite_path = sprite_path  # ✅ Sprite de face (par défaut)
-        self.sprite_path_back = sprite_path_back  # ✅ Sprite de dos (optionnel)
+        self.sprite_path = sprite_path
+        self.sprite_path_back = sprite_path_back
+        self.base_hp = base_hp
+        self.base_attack = base_attack
+        self.base_defense = base_defense
+
+    @classmethod
+    def get(cls, name, sprite_path=None, sprite_path_back=None, base_hp=0, base_attack=0, base_defense=0):
+        key = (name, sprite_path, sprite_path_back)
+        species = cls._registry.get(key)
+        if species is None:
+            species = cls._registry[key] = cls(*key, base_hp, base_attack, base_defense)
+        return species
+
+    def key(self):
+        return (self.name, self.sprite_path, self.sprite_path_back,
+                self.base_hp, self.base_attack, self.base_defense)
+
+    def __repr__(self):
+        return f"Species({self.name!r})"
+
+
+def _base_stat(value, level):
+    return int(round(value * BASE_LEVEL / level)) if level else value
+
+
+class PokemonStore:
+    """
+    Stockage compact de Pokémon en colonnes (une array typée par champ) : environ 19 octets
+    par Pokémon au lieu d'un objet avec dictionnaire. Les espèces sont numérotées dans une
+    table locale au stockage. Un emplacement libéré est réutilisé par l'ajout suivant.
+    """
+
+    def __init__(self):
+        for name, typecode in COLUMNS:
+            setattr(self, name, array(typecode))
+        self.species = []        # identifiant local -> Species
+        self._species_ids = {}   # Species -> identifiant local
+        self._free = []
+        self.count = 0
+
+    def _species_id(self, species):
+        species_id = self._species_ids.get(species)
+        if species_id is None:
+            if len(self.species) >= FREE_SLOT:
+                raise ValueError("Trop d'espèces différentes dans le stockage")
+            species_id = self._species_ids[species] = len(self.species)
+            self.species.append(species)
+        return species_id
+
+    def add(self, species, hp, max_hp, attack, defense, level):
+        """Ajoute un Pokémon et retourne son emplacement"""
+        values = (self._species_id(species), level, hp, max_hp, attack, defense)
+        if self._free:
+            slot = self._free.pop()
+            for (name, _), value in zip(COLUMNS, values):
+                getattr(self, name)[slot] = value
+        else:
+            slot = len(self.species_id)
+            for (name, _), value in zip(COLUMNS, values):
+                getattr(self, name).append(value)
+        self.count += 1
+        return slot
+
+    def remove(self, slot):
+        """Libère un emplacement (les vues qui le désignent ne sont plus valides)"""
+        if self.species_id[slot] == FREE_SLOT:
+            return
+        self.species_id[slot] = FREE_SLOT
+        self._free.append(slot)
+        self.count -= 1
+
+    def set_value(self, field, slot, value):
+        getattr(self, field)[slot] = value
+
+    def species_of(self, slot):
+        return self.species[self.species_id[slot]]
+
+    def values(self, slot):
+        """(espèce, hp, max_hp, attack, defense, level) d'un emplacement"""
+        return (self.species_of(slot), self.hp[slot], self.max_hp[slot],
+                self.attack[slot], self.defense[slot], self.level[slot])
+
+    def slots(self):
+        """Emplacements occupés, dans l'ordre du stockage"""
+        species_id = self.species_id
+        return [slot for slot in range(len(species_id)) if species_id[slot] != FREE_SLOT]
+
+    def view(self, slot):
+        return Pokemon._view(self, slot)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return (self.view(slot) for slot in self.slots())
+
+    @property
+    def nbytes(self):
+        return sum(len(column) * column.itemsize for column in (getattr(self, name) for name, _ in COLUMNS))
+
+    # --- Sérialisation (sauvegardes) ---
+
+    def export(self):
+        """Table des espèces et colonnes brutes (petit-boutiste), emplacements libres compris"""
+        columns = []
+        for name, _ in COLUMNS:
+            column = getattr(self, name)
+            if sys.byteorder == "big":
+                column = array(column.typecode, column)
+                column.byteswap()
+            columns.append(column.tobytes())
+        return tuple(species.key() for species in self.species), tuple(columns)
+
+    def restore(self, species_keys, columns):
+        """Remplace le contenu par une exportation (voir export)"""
+        self.__init__()
+        for key in species_keys:
+            self._species_id(Species.get(*key))
+        for (name, typecode), data in zip(COLUMNS, columns):
+            column = array(typecode)
+            column.frombytes(data)
+            if sys.byteorder == "big":
+                column.byteswap()
+            setattr(self, name, column)
+        lengths = {len(getattr(self, name)) for name, _ in COLUMNS}
+        if len(lengths) != 1:
+            raise ValueError("Colonnes de longueurs différentes")
+        species_id = self.species_id
+        for slot in range(len(species_id) - 1, -1, -1):
+            if species_id[slot] == FREE_SLOT:
+                self._free.append(slot)
+            elif species_id[slot] >= len(self.species):
+                raise ValueError(f"Espèce inconnue à l'emplacement {slot}")
+        self.count = len(species_id) - len(self._free)
+
+
+# Stockage des Pokémon hors PC (équipe, Pokémon sauvages) ; un emplacement est libéré
+# quand son objet Pokemon disparaît
+_detached = PokemonStore()
+
+
+def _stat_property(field):
+    def getter(self):
+        return getattr(self._store, field)[self._slot]
+
+    def setter(self, value):
+        self._store.set_value(field, self._slot, value)
+
+    return property(getter, setter)
+
+
+class Pokemon:
+    """
+    Vue sur un Pokémon rangé dans un PokemonStore : les statistiques individuelles vivent
+    dans les colonnes du stockage, les données d'espèce dans un Species partagé.
+    Un Pokémon créé directement occupe un emplacement du stockage hors PC ; déposé au PC,
+    il est recopié dans les colonnes du PC et la vue suit.
+    """
+    __slots__ = ("_store", "_slot")
+
+    def __init__(self, name, hp, max_hp, attack, defense, sprite_path, sprite_path_back=None, level=BASE_LEVEL):
+        species = Species.get(name, sprite_path, sprite_path_back,
+                              _base_stat(max_hp, level), _base_stat(attack, level), _base_stat(defense, level))
+        self._store = _detached
+        self._slot = _detached.add(species, hp, max_hp, attack, defense, level)
+
+    @classmethod
+    def _view(cls, store, slot):
+        pokemon = object.__new__(cls)
+        pokemon._store = store
+        pokemon._slot = slot
+        return pokemon
+
+    def _move_to(self, store=None):
+        """Recopie le Pokémon dans un autre stockage (par défaut hors PC) et y rattache la vue"""
+        store = _detached if store is None else store
+        if store is self._store:
+            return
+        slot = store.add(*self._store.values(self._slot))
+        self._store.remove(self._slot)
+        self._store, self._slot = store, slot
+
+    def __del__(self):
+        store = getattr(self, "_store", None)
+        if store is _detached and _detached is not None:
+            _detached.remove(self._slot)
+
+    hp = _stat_property("hp")
+    max_hp = _stat_property("max_hp")
+    attack = _stat_property("attack")
+    defense = _stat_property("defense")
+    level = _stat_property("level")
+
+    @property
+    def species(self):
+        return self._store.species_of(self._slot)
+
+    @property
+    def name(self):
+        return self.species.name
+
+    @property
+    def sprite_path(self):
+        return self.species.sprite_path  # ✅ Sprite de face (par défaut)
+
+    @property
+    def sprite_path_back(self):
+        return self.species.sprite_path_back  # ✅ Sprite de dos (optionnel)
 
     def take_damage(self, damage):
         self.hp -= damage
@@ -0,0 +1,36 @@
+import argparse
+import glob
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # ✅ Aucune fenêtre réelle
+
+from utils.tileset_optimizer import optimize_tilesets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Regroupe les tuiles utilisées par les cartes dans des atlas compacts")
+    parser.add_argument("maps", nargs="*", help="cartes TMX (par défaut : assets/maps/*.tmx)")
+    parser.add_argument("--output", default="assets/optimized",
+                        help="dossier de sortie (sous-dossiers maps/ et tiles/)")
+    args = parser.parse_args(argv)
+
+    maps = args.maps or sorted(glob.glob("assets/maps/*.tmx"))
+    if not maps:
+        print("❌ Aucune carte TMX trouvée")
+        return
+
+    try:
+        report = optimize_tilesets(maps, args.output)
+    except (OSError, ValueError) as e:
+        print(f"❌ Optimisation impossible: {e}")
+        return
+
+    for name, before, after in report["tilesets"]:
+        print(f"✅ {name}: {before} tuiles -> {after} tuiles utilisées")
+    for path in report["maps"]:
+        print(f"✅ Carte réécrite : {path} (POKEMON_MAP={path} python main.py)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from models import battle_sim
+from models.battle_sim import STRATEGIES, check_parity
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_batch_simulator_matches_combat(strategy):
+    assert check_parity(strategy=strategy) == 0
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_parity_with_other_draws(seed):
+    assert check_parity(matchups=20, battles=20, seed=seed) == 0
+
+
+def test_parity_cli_fails_on_mismatch(monkeypatch):
+    monkeypatch.setattr(battle_sim, "check_parity", lambda **kwargs: 1)
+    with pytest.raises(SystemExit) as error:
+        battle_sim.main(["--parity"])
+    assert error.value.code == 1
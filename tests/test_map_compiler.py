@@ -0,0 +1,53 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from utils.map_compiler import compile_map, load_compiled_map
+
+TILE = 16
+
+
+@pytest.fixture
+def tmx_path(tmp_path):
+    pygame.init()
+    sheet = pygame.Surface((4 * TILE, TILE))
+    for index in range(4):
+        sheet.fill((index * 60, 100, 200 - index * 40), (index * TILE, 0, TILE, TILE))
+    pygame.image.save(sheet, str(tmp_path / "sheet.png"))
+    (tmp_path / "terrain.tsx").write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<tileset version="1.10" name="terrain" tilewidth="{TILE}" tileheight="{TILE}" tilecount="4" columns="4">\n'
+        f' <image source="sheet.png" width="{4 * TILE}" height="{TILE}"/>\n</tileset>\n', encoding="utf-8")
+    path = tmp_path / "carte.tmx"
+    path.write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<map version="1.10" orientation="orthogonal" width="4" height="3" tilewidth="{TILE}" tileheight="{TILE}">\n'
+        ' <tileset firstgid="1" source="terrain.tsx"/>\n'
+        ' <layer id="1" name="sol" width="4" height="3">\n  <data encoding="csv">\n'
+        '1,2,3,4,\n4,3,2,1,\n1,1,2,2\n  </data>\n </layer>\n</map>\n', encoding="utf-8")
+    return str(path)
+
+
+def test_compiled_map_round_trip(tmx_path):
+    output = compile_map(tmx_path)
+    source = load_compiled_map(tmx_path)
+
+    assert source is not None
+    assert (source.width, source.height) == (4, 3)
+    assert list(source.layers[0][2]) == [1, 2, 3, 4, 4, 3, 2, 1, 1, 1, 2, 2]
+    assert os.stat(output).st_mode & 0o777 == 0o644
+
+
+@pytest.mark.parametrize("keep", [0, 5, 20, -1, -100])
+def test_damaged_compiled_map_is_ignored(tmx_path, keep):
+    output = compile_map(tmx_path)
+    with open(output, "rb") as file:
+        data = file.read()
+    with open(output, "wb") as file:
+        file.write(data[:keep])
+
+    # Le TMX reste valide : la carte compilée abîmée est ignorée sans exception
+    assert load_compiled_map(tmx_path) is None
@@ -0,0 +1,105 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from utils.tileset_optimizer import GID_MASK, _MapFile, optimize_tilesets
+
+TILE = 16
+COLUMNS = 4
+
+
+@pytest.fixture(autouse=True)
+def pygame_init():
+    pygame.init()
+
+
+def write_sheet(path, seed):
+    """Image de COLUMNS x COLUMNS tuiles, chacune d'une couleur distincte"""
+    sheet = pygame.Surface((COLUMNS * TILE, COLUMNS * TILE))
+    for index in range(COLUMNS * COLUMNS):
+        color = ((seed * 50 + index * 13) % 256, (index * 29) % 256, (seed * 90 + index * 7) % 256)
+        sheet.fill(color, ((index % COLUMNS) * TILE, (index // COLUMNS) * TILE, TILE, TILE))
+    pygame.image.save(sheet, path)
+
+
+def tileset_xml(name, image):
+    size = COLUMNS * TILE
+    return (f'name="{name}" tilewidth="{TILE}" tileheight="{TILE}" tilecount="{COLUMNS * COLUMNS}" '
+            f'columns="{COLUMNS}">\n  <image source="{image}" width="{size}" height="{size}"/>\n')
+
+
+def write_map(path, tilesets, gids, width=2):
+    rows = [",".join(str(gid) for gid in gids[i:i + width]) for i in range(0, len(gids), width)]
+    with open(path, "w", encoding="utf-8") as file:
+        file.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                   f'<map version="1.10" orientation="orthogonal" width="{width}" height="{len(rows)}" '
+                   f'tilewidth="{TILE}" tileheight="{TILE}">\n')
+        file.write("".join(tilesets))
+        file.write(f'<layer id="1" name="sol" width="{width}" height="{len(rows)}">\n'
+                   '<data encoding="csv">\n' + ",\n".join(rows) + "\n</data>\n</layer>\n</map>\n")
+
+
+def tile_pixels(map_path):
+    """Pixels RGB de chaque cellule de la carte, lus dans l'image de son jeu de tuiles"""
+    map_file = _MapFile(map_path, {})
+    images = {}
+    pixels = []
+    for raw in map_file.layers[0][1]:
+        tileset, local_id = map_file.resolve(raw & GID_MASK)
+        if tileset.image_path not in images:
+            images[tileset.image_path] = pygame.image.load(tileset.image_path)
+        tile = images[tileset.image_path].subsurface(tileset.rect(local_id))
+        pixels.append(pygame.image.tobytes(tile, "RGB"))
+    return pixels
+
+
+def test_external_tileset(tmp_path):
+    write_sheet(tmp_path / "sheet.png", 1)
+    (tmp_path / "terrain.tsx").write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>\n<tileset version="1.10" '
+        + tileset_xml("terrain", "sheet.png") + "</tileset>\n", encoding="utf-8")
+    map_path = tmp_path / "carte.tmx"
+    write_map(map_path, ['<tileset firstgid="1" source="terrain.tsx"/>\n'], [1, 6, 6, 12])
+
+    report = optimize_tilesets([str(map_path)], str(tmp_path / "out"))
+
+    assert report["tilesets"] == [("terrain", 16, 3)]
+    assert tile_pixels(report["maps"][0]) == tile_pixels(map_path)
+
+
+def test_embedded_tilesets(tmp_path):
+    write_sheet(tmp_path / "a.png", 1)
+    write_sheet(tmp_path / "b.png", 2)
+    map_path = tmp_path / "carte.tmx"
+    # Deux jeux intégrés de même nom : ni clé ni fichier d'atlas partagés
+    write_map(map_path, [
+        '<tileset firstgid="1" ' + tileset_xml("interieur", "a.png") + "</tileset>\n",
+        '<tileset firstgid="17" ' + tileset_xml("interieur", "b.png") + "</tileset>\n",
+    ], [2, 17, 20, 2])
+
+    report = optimize_tilesets([str(map_path)], str(tmp_path / "out"))
+
+    assert sorted(report["tilesets"]) == [("interieur", 16, 1), ("interieur", 16, 2)]
+    assert len(os.listdir(tmp_path / "out" / "tiles")) == 4  # deux .png et deux .tsx
+    assert tile_pixels(report["maps"][0]) == tile_pixels(map_path)
+
+
+def test_unused_tileset_is_dropped(tmp_path):
+    write_sheet(tmp_path / "sheet.png", 1)
+    for name in ("terrain", "extra"):
+        (tmp_path / f"{name}.tsx").write_text(
+            '<?xml version="1.0" encoding="UTF-8"?>\n<tileset version="1.10" '
+            + tileset_xml(name, "sheet.png") + "</tileset>\n", encoding="utf-8")
+    map_path = tmp_path / "carte.tmx"
+    write_map(map_path, ['<tileset firstgid="1" source="terrain.tsx"/>\n',
+                         '<tileset firstgid="17" source="extra.tsx"/>\n'], [1, 2, 3, 4])
+
+    report = optimize_tilesets([str(map_path)], str(tmp_path / "out"))
+
+    rewritten = _MapFile(report["maps"][0], {})
+    assert [tileset.name for _, tileset, _ in rewritten.tilesets] == ["terrain_atlas"]
+    assert tile_pixels(report["maps"][0]) == tile_pixels(map_path)
+
@@ -0,0 +1,239 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+
+import pygame
+
+from utils import settings
+
+# Format binaire du paquet de sprites :
+#   en-tête  <6s H I>  magie, version du format, taille de l'index JSON
+#   index JSON         "entries" : clé "chemin@LxH" -> source (chemin relatif au paquet, empreinte
+#                      du contenu, date et taille du fichier), taille affichée, position des pixels
+#   sections alignées sur 8 octets : pixels RGBA bruts de chaque sprite mis à l'échelle
+# Des sources identiques à la même taille partagent une seule section.
+MAGIC = b"PKPACK"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<6sHI")
+ALIGNMENT = 8
+PIXEL_FORMAT = "RGBA"
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _key(path, size):
+    return f"{os.path.normcase(os.path.abspath(path))}@{size[0]}x{size[1]}"
+
+
+def file_digest(path):
+    with open(path, "rb") as file:
+        return hashlib.blake2b(file.read(), digest_size=16).hexdigest()
+
+
+def render_pixels(path, size):
+    """Pixels RGBA du sprite décodé puis mis à l'échelle (comme SurfaceCache le ferait à l'exécution)"""
+    image = pygame.transform.scale(pygame.image.load(path), size)
+    if not image.get_flags() & pygame.SRCALPHA:
+        # Couleur transparente (colorkey) des PNG en palette : convertie en alpha nul
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 0))
+        surface.blit(image, (0, 0))
+        image = surface
+    return pygame.image.tobytes(image, PIXEL_FORMAT)
+
+
+class AssetPack:
+    """
+    Paquet de sprites pré-mis à l'échelle, projeté en mémoire (mmap) : une surface est créée
+    directement sur les pixels du fichier avec pygame.image.frombuffer, sans décodage PNG
+    ni redimensionnement. Une entrée dont le PNG source a changé depuis la construction est ignorée.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            # Copie à l'écriture : une surface modifiée ne touche jamais le fichier
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, version, meta_size = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Format de paquet de sprites non pris en charge: {path}")
+        self.meta = json.loads(self._mmap[HEADER.size:HEADER.size + meta_size].decode("utf-8"))
+        self._base = os.path.dirname(os.path.abspath(path))
+        self._view = memoryview(self._mmap)
+        # Index par clé absolue : les vues appellent load_surface avec des chemins relatifs au dossier courant
+        self.entries = {
+            _key(os.path.join(self._base, entry["source"]), entry["size"]): entry
+            for entry in self.meta["entries"].values()
+        }
+        self.hits = 0
+        self.stale = 0
+
+    def _is_fresh(self, entry):
+        """Vrai si le PNG source n'a pas changé (ou n'est pas fourni : seul le paquet est livré)"""
+        try:
+            stat = os.stat(os.path.join(self._base, entry["source"]))
+        except OSError:
+            return True
+        return stat.st_size == entry["file_size"] and stat.st_mtime <= entry["mtime"]
+
+    def surface(self, path, size):
+        """Surface RGBA du sprite 'path' à la taille 'size' (mémoire du paquet), ou None"""
+        entry = self.entries.get(_key(path, size))
+        if entry is None:
+            return None
+        if not self._is_fresh(entry):
+            self.stale += 1
+            return None
+        offset, length = entry["offset"], entry["length"]
+        self.hits += 1
+        return pygame.image.frombuffer(self._view[offset:offset + length], tuple(entry["size"]), PIXEL_FORMAT)
+
+    def blob(self, digest, size):
+        """Pixels déjà construits pour un contenu source et une taille (reconstruction incrémentale)"""
+        for entry in self.meta["entries"].values():
+            if entry["hash"] == digest and entry["size"] == list(size):
+                return bytes(self._view[entry["offset"]:entry["offset"] + entry["length"]])
+        return None
+
+    def stats(self):
+        return {"entries": len(self.entries), "hits": self.hits, "stale": self.stale,
+                "bytes": len(self._mmap)}
+
+    def close(self):
+        """Libère la projection (aucune surface créée par surface() ne doit rester utilisée)"""
+        self._view.release()
+        self._mmap.close()
+
+
+def _verify_pack(path, entries, blobs):
+    """Relit chaque entrée du paquet écrit et la compare aux pixels construits"""
+    pack = AssetPack(path)
+    try:
+        for key, entry in entries.items():
+            offset, length = entry["offset"], entry["length"]
+            if pack._view[offset:offset + length] != blobs[(entry["hash"], tuple(entry["size"]))]:
+                raise ValueError(f"Pixels relus différents pour {key}")
+    finally:
+        pack.close()
+
+
+def build_asset_pack(sprites, output):
+    """
+    Construit le paquet 'output' pour les couples (chemin PNG, (largeur, hauteur)) donnés.
+    Reconstruction incrémentale : un sprite dont le contenu source (empreinte) et la taille
+    sont déjà dans l'ancien paquet est recopié sans être décodé. Le fichier n'est réécrit
+    que si quelque chose a changé. Retourne {"path", "entries", "built", "reused", "written"}.
+    """
+    base = os.path.dirname(os.path.abspath(output))
+    previous = None
+    if os.path.exists(output):
+        try:
+            previous = AssetPack(output)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Ancien paquet ignoré {output}: {e}")
+
+    entries = {}
+    blobs = {}  # (empreinte, taille) -> pixels
+    built = reused = 0
+    for path, size in sprites:
+        size = tuple(size)
+        key = f"{os.path.relpath(os.path.abspath(path), base).replace(os.sep, '/')}@{size[0]}x{size[1]}"
+        if key in entries:
+            continue
+        digest = file_digest(path)
+        if (digest, size) not in blobs:
+            data = previous.blob(digest, size) if previous is not None else None
+            if data is None:
+                data = render_pixels(path, size)
+                built += 1
+            else:
+                reused += 1
+            blobs[(digest, size)] = data
+        stat = os.stat(path)
+        entries[key] = {
+            "source": os.path.relpath(os.path.abspath(path), base).replace(os.sep, "/"),
+            "hash": digest,
+            "mtime": stat.st_mtime,
+            "file_size": stat.st_size,
+            "size": list(size)
+        }
+
+    report = {"path": output, "entries": len(entries), "built": built, "reused": reused, "written": False}
+    if previous is not None and not built:
+        old = {key: {k: v for k, v in entry.items() if k not in ("offset", "length")}
+               for key, entry in previous.meta["entries"].items()}
+        if old == entries:
+            previous.close()
+            return report  # Paquet déjà à jour
+
+    if previous is not None:
+        previous.close()
+
+    # Positions des sections : elles dépendent de la taille de l'index JSON, qui contient
+    # lui-même les positions ; on recommence jusqu'à ce que le début des sections soit stable
+    order = list(blobs)
+    meta = {"entries": entries}
+    start = None
+    while True:
+        text = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+        data_start = _align(HEADER.size + len(text))
+        if data_start == start:
+            break
+        start = data_start
+        offset = start
+        offsets = {}
+        for blob_key in order:
+            offsets[blob_key] = offset
+            offset = _align(offset + len(blobs[blob_key]))
+        for entry in entries.values():
+            blob_key = (entry["hash"], tuple(entry["size"]))
+            entry["offset"] = offsets[blob_key]
+            entry["length"] = len(blobs[blob_key])
+
+    # Écriture atomique : fichier temporaire puis renommage
+    os.makedirs(base, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=base, prefix=".pack-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(text)))
+            file.write(text)
+            for blob_key in order:
+                if file.tell() > offsets[blob_key]:
+                    raise ValueError(f"Section du paquet chevauchée à l'octet {offsets[blob_key]}")
+                file.write(b"\0" * (offsets[blob_key] - file.tell()))
+                file.write(blobs[blob_key])
+        _verify_pack(temp_path, entries, blobs)
+        os.chmod(temp_path, 0o644)  # mkstemp crée en 0600 : le paquet est livré avec le jeu
+        os.replace(temp_path, output)
+    except (OSError, ValueError):
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    report["written"] = True
+    return report
+
+
+_pack = None
+_pack_loaded = False
+_pack_lock = threading.Lock()
+
+
+def get_asset_pack():
+    """Paquet de sprites du jeu (ouvert une fois), ou None (absent, désactivé ou illisible)"""
+    global _pack, _pack_loaded
+    with _pack_lock:
+        if not _pack_loaded:
+            _pack_loaded = True
+            path = settings.ASSET_PACK_PATH
+            if settings.ASSET_PACK and os.path.exists(path):
+                try:
+                    _pack = AssetPack(path)
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"⚠️ Paquet de sprites ignoré {path}: {e}")
+        return _pack
@@ -0,0 +1,94 @@
+from utils import settings
+
+# En dessous de cet écart (pixels), la caméra se pose sur sa cible
+SNAP_DISTANCE = 0.5
+
+
+class Camera:
+    """
+    Caméra style Pokémon : le joueur se déplace librement dans une zone morte au centre
+    de l'écran et la caméra ne le suit que près des bords, sans sortir de la carte.
+    La position simulée est en sous-pixels et rejoint sa cible avec un amorti exponentiel
+    (CAMERA_EASING, 1 = immédiat). La vue rendue est arrondie au pixel : 'dirty' signale
+    qu'elle a changé depuis le dernier rendu de la carte.
+    """
+
+    def __init__(self, screen_size, map_size, offset=(0, 0), margin=None, easing=None):
+        self.screen_width, self.screen_height = screen_size
+        margin = settings.CAMERA_MARGIN if margin is None else margin
+        self.easing = settings.CAMERA_EASING if easing is None else easing
+
+        # Zone morte et limites calculées une seule fois
+        self.margin_x = self.screen_width * margin
+        self.margin_y = self.screen_height * margin
+        self.min_x = -offset[0]
+        self.min_y = -offset[1]
+        self.max_x = map_size[0] - self.screen_width + offset[0]
+        self.max_y = map_size[1] - self.screen_height + offset[1]
+
+        self.x = 0.0          # Position simulée (coin haut-gauche, sous-pixels)
+        self.y = 0.0
+        self.target_x = 0.0   # Position visée d'après le joueur
+        self.target_y = 0.0
+        self.view_x = None    # Position rendue (pixels entiers)
+        self.view_y = None
+        self.dirty = True
+
+    def _clamp(self, x, y):
+        return (max(self.min_x, min(x, self.max_x)),
+                max(self.min_y, min(y, self.max_y)))
+
+    def follow(self, player_x, player_y):
+        """Met à jour la cible quand le joueur sort de la zone morte ; retourne True si elle a bougé"""
+        target_x, target_y = self.target_x, self.target_y
+        screen_x = player_x - target_x
+        screen_y = player_y - target_y
+
+        if screen_x > self.screen_width - self.margin_x:
+            target_x = player_x - (self.screen_width - self.margin_x)
+        elif screen_x < self.margin_x:
+            target_x = player_x - self.margin_x
+
+        if screen_y > self.screen_height - self.margin_y:
+            target_y = player_y - (self.screen_height - self.margin_y)
+        elif screen_y < self.margin_y:
+            target_y = player_y - self.margin_y
+
+        target_x, target_y = self._clamp(target_x, target_y)
+        if (target_x, target_y) == (self.target_x, self.target_y):
+            return False
+        self.target_x, self.target_y = target_x, target_y
+        if self.easing >= 1.0:
+            self.x, self.y = target_x, target_y
+        return True
+
+    def snap(self, player_x, player_y):
+        """Cible le joueur et s'y place immédiatement (départ, téléportation)"""
+        self.follow(player_x, player_y)
+        self.x, self.y = self.target_x, self.target_y
+
+    def step(self):
+        """Un pas de simulation : rapproche la position de la cible ; retourne True si elle a bougé"""
+        dx = self.target_x - self.x
+        dy = self.target_y - self.y
+        if not dx and not dy:
+            return False
+        if abs(dx) < SNAP_DISTANCE and abs(dy) < SNAP_DISTANCE:
+            self.x, self.y = self.target_x, self.target_y
+        else:
+            self.x += dx * self.easing
+            self.y += dy * self.easing
+        return True
+
+    @property
+    def settled(self):
+        return self.x == self.target_x and self.y == self.target_y
+
+    def set_view(self, x, y):
+        """Position rendue (arrondie au pixel) ; retourne True si la vue a changé"""
+        x, y = round(x), round(y)
+        if (x, y) == (self.view_x, self.view_y):
+            return False
+        self.view_x, self.view_y = x, y
+        self.dirty = True
+        return True
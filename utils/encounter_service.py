@@ -0,0 +1,99 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from utils import trace
+from utils.pokeapi import fetch_pokemon
+from utils.surface_cache import load_surface, RAW
+
+# Taille des sprites affichés en combat
+BATTLE_SPRITE_SIZE = (100, 100)
+
+
+class PreparedSpecies:
+    """Données d'une espèce dont les sprites sont déjà décodés et redimensionnés dans le cache"""
+
+    def __init__(self, data, sprite_size):
+        self.data = data
+        self.sprite_size = sprite_size
+
+    def sprite(self, kind):
+        """Retourne le sprite 'front' ou 'back' converti au format de l'écran (thread principal)"""
+        path = self.data.get(f"sprite_path_{kind}")
+        if not path or not os.path.exists(path):
+            return None
+        return load_surface(path, self.sprite_size)
+
+
+class EncounterService:
+    """
+    Prépare les rencontres sauvages en arrière-plan : données PokéAPI,
+    décodage et mise à l'échelle des sprites dans un pool de threads.
+    La boucle de jeu ne fait que consulter des futures déjà résolues.
+    """
+
+    def __init__(self, max_workers=2, sprite_size=BATTLE_SPRITE_SIZE):
+        self.sprite_size = sprite_size
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="encounter")
+        self._species = {}  # nom -> Future[PreparedSpecies | None]
+        self._sprites = {}  # chemin -> Future[Surface | None]
+        self._lock = threading.Lock()
+
+    def prefetch(self, names):
+        """Lance la préparation des espèces probables de la zone courante"""
+        for name in names:
+            self.request(name)
+
+    def request(self, name):
+        """Retourne la future de préparation d'une espèce (la soumet si nécessaire)"""
+        name = name.lower()
+        with self._lock:
+            future = self._species.get(name)
+            # Nouvelle tentative si une préparation précédente a échoué
+            if future is None or (future.done() and future.result() is None):
+                future = self.executor.submit(self._prepare_species, name)
+                self._species[name] = future
+            return future
+
+    def request_sprite(self, path):
+        """Retourne la future de chargement d'un sprite de combat (ex: Pokémon du joueur)"""
+        with self._lock:
+            future = self._sprites.get(path)
+            if future is None:
+                future = self.executor.submit(self._load_sprite, path)
+                self._sprites[path] = future
+            return future
+
+    def is_ready(self, name):
+        future = self._species.get(name.lower())
+        return future is not None and future.done()
+
+    def _prepare_species(self, name):
+        try:
+            data = fetch_pokemon(name)
+            if data is None:
+                return None
+            self._load_sprite(data.get("sprite_path_front"))
+            self._load_sprite(data.get("sprite_path_back"))
+            prepared = PreparedSpecies(data, self.sprite_size)
+            if trace.on.encounter:
+                trace.debug("encounter", "✅ %s prêt pour les rencontres", data["name"])
+            return prepared
+        except Exception as e:
+            print(f"❌ Erreur lors de la préparation de {name}: {e}")
+            return None
+
+    def _load_sprite(self, path):
+        """Décode et redimensionne un sprite dans le cache (la conversion se fait sur le thread principal)"""
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            return load_surface(path, self.sprite_size, RAW)
+        except pygame.error as e:
+            print(f"⚠️ Sprite illisible {path}: {e}")
+            return None
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,227 @@
+import math
+import random
+
+from utils import settings
+from utils.terrain import TALL_GRASS
+
+# Table par défaut des hautes herbes (utilisée sans propriété 'encounters' dans la carte)
+DEFAULT_ENCOUNTERS = [
+    {"name": "rattata", "min_level": 5, "max_level": 5, "weight": 1},
+    {"name": "pidgey", "min_level": 4, "max_level": 4, "weight": 1},
+    {"name": "caterpie", "min_level": 3, "max_level": 3, "weight": 1},
+    {"name": "weedle", "min_level": 3, "max_level": 3, "weight": 1}
+]
+
+# Propriétés Tiled des calques et objets de zone
+ENCOUNTERS_PROPERTY = "encounters"      # "rattata:3-5:40, pidgey:4:30" (espèce:niveaux:poids)
+RATE_PROPERTY = "encounter_rate"        # Probabilité de rencontre par pas (ex: 0.03)
+ZONE_OBJECT_TYPE = "encounter_zone"     # Rectangle dont les hautes herbes utilisent sa table
+
+
+def parse_encounters(text):
+    """Convertit une propriété 'encounters' en entrées {name, min_level, max_level, weight}"""
+    entries = []
+    for item in text.replace(";", ",").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        parts = [part.strip() for part in item.split(":")]
+        levels = parts[1] if len(parts) > 1 and parts[1] else "5"
+        low, _, high = levels.partition("-")
+        entries.append({
+            "name": parts[0].lower(),
+            "min_level": int(low),
+            "max_level": int(high or low),
+            "weight": float(parts[2]) if len(parts) > 2 else 1.0
+        })
+    return entries
+
+
+class AliasTable:
+    """Méthode des alias (Vose) : tirage pondéré en O(1) après une construction en O(n)"""
+
+    def __init__(self, weights):
+        count = len(weights)
+        total = float(sum(weights))
+        if count == 0 or total <= 0:
+            raise ValueError("La table de tirage doit contenir au moins un poids positif")
+
+        scaled = [weight * count / total for weight in weights]
+        self.probability = [1.0] * count
+        self.alias = list(range(count))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+
+    def sample(self, rng=random):
+        """Un seul nombre aléatoire : la colonne et le seuil d'acceptation"""
+        u = rng.random() * len(self.probability)
+        column = int(u)
+        return column if u - column < self.probability[column] else self.alias[column]
+
+
+class EncounterTable:
+    """Table de rencontres d'une zone : espèces pondérées et taux de rencontre par pas"""
+
+    def __init__(self, entries, rate=None):
+        self.entries = entries
+        self.rate = settings.ENCOUNTER_RATE if rate is None else float(rate)
+        self.alias = AliasTable([entry["weight"] for entry in entries])
+
+        # Taux de risque par pas : chaque pas retire 'hazard' au budget du moteur
+        if self.rate >= 1.0:
+            self.hazard = math.inf
+        elif self.rate <= 0.0:
+            self.hazard = 0.0
+        else:
+            self.hazard = -math.log1p(-self.rate)
+
+    @classmethod
+    def from_properties(cls, properties, default=None):
+        """Table décrite par les propriétés Tiled d'un calque ou d'un objet (None sinon)"""
+        text = properties.get(ENCOUNTERS_PROPERTY)
+        if not text:
+            return None
+        rate = properties.get(RATE_PROPERTY, default.rate if default is not None else None)
+        return cls(parse_encounters(text), rate)
+
+    def sample(self, rng=random):
+        """Tire une espèce et son niveau : {"name": ..., "level": ...}"""
+        entry = self.entries[self.alias.sample(rng)]
+        return {"name": entry["name"], "level": rng.randint(entry["min_level"], entry["max_level"])}
+
+    def species(self):
+        return [entry["name"] for entry in self.entries]
+
+
+def default_table():
+    return EncounterTable(DEFAULT_ENCOUNTERS)
+
+
+class EncounterZones:
+    """Grille des zones de rencontre : un octet par tuile (0 = pas de rencontre, n = table n-1)"""
+
+    def __init__(self, width, height, version=None):
+        self.width = width
+        self.height = height
+        self.version = version  # Version de la carte source (cartes modifiables)
+        self.cells = bytearray(width * height)
+        self.tables = []
+
+    def add_table(self, table):
+        if len(self.tables) >= 255:
+            raise ValueError("Trop de tables de rencontres (255 au maximum)")
+        self.tables.append(table)
+        return len(self.tables)
+
+    def assign(self, tile_x, tile_y, zone):
+        if 0 <= tile_x < self.width and 0 <= tile_y < self.height:
+            self.cells[tile_y * self.width + tile_x] = zone
+
+    def table_at(self, tile_x, tile_y):
+        """Table de la tuile, ou None hors zone (une lecture de tableau)"""
+        if 0 <= tile_x < self.width and 0 <= tile_y < self.height:
+            zone = self.cells[tile_y * self.width + tile_x]
+            if zone:
+                return self.tables[zone - 1]
+        return None
+
+    def species(self):
+        """Toutes les espèces rencontrables (pour le préchargement)"""
+        names = []
+        for table in self.tables:
+            names.extend(name for name in table.species() if name not in names)
+        return names
+
+
+def build_encounter_zones(tmx_data, terrain, default=None):
+    """
+    Construit les zones d'une carte Tiled : table par défaut sur les hautes herbes,
+    puis calques portant une propriété 'encounters' (leurs tuiles non vides),
+    puis objets 'encounter_zone' (hautes herbes comprises dans le rectangle).
+    """
+    default = default or default_table()
+    zones = EncounterZones(terrain.width, terrain.height)
+
+    default_zone = zones.add_table(default)
+    for index, flags in enumerate(terrain.cells):
+        if flags & TALL_GRASS:
+            zones.cells[index] = default_zone
+
+    for layer in tmx_data.visible_layers:
+        if not hasattr(layer, "data"):
+            continue
+        table = EncounterTable.from_properties(getattr(layer, "properties", {}) or {}, default)
+        if table is None:
+            continue
+        zone = zones.add_table(table)
+        for tile_y, row in enumerate(layer.data):
+            for tile_x, gid in enumerate(row):
+                if gid:
+                    zones.assign(tile_x, tile_y, zone)
+
+    for obj in tmx_data.objects:
+        if getattr(obj, "type", None) != ZONE_OBJECT_TYPE:
+            continue
+        table = EncounterTable.from_properties(getattr(obj, "properties", {}) or {}, default)
+        if table is None:
+            continue
+        zone = zones.add_table(table)
+        left = int(obj.x // tmx_data.tilewidth)
+        top = int(obj.y // tmx_data.tileheight)
+        right = int(math.ceil((obj.x + obj.width) / tmx_data.tilewidth))
+        bottom = int(math.ceil((obj.y + obj.height) / tmx_data.tileheight))
+        for tile_y in range(top, bottom):
+            for tile_x in range(left, right):
+                if 0 <= tile_x < terrain.width and 0 <= tile_y < terrain.height and terrain.is_grass(tile_x, tile_y):
+                    zones.assign(tile_x, tile_y, zone)
+
+    return zones
+
+
+def build_map_encounter_zones(game_map, default=None):
+    """Zones de la carte traditionnelle : la table par défaut sur l'herbe ('H')"""
+    zones = EncounterZones(game_map.width, game_map.height, game_map.version)
+    zone = zones.add_table(default or default_table())
+    for y in range(game_map.height):
+        for x in range(game_map.width):
+            if game_map.is_grass(x, y):
+                zones.assign(x, y, zone)
+    return zones
+
+
+class EncounterEngine:
+    """
+    Moteur de rencontres : le nombre de pas avant la prochaine rencontre est tiré à l'avance.
+    Le budget suit une loi exponentielle et chaque pas en zone lui retire le taux de risque
+    de la zone : pour un taux p constant, le nombre de pas suit exactement la loi géométrique
+    de paramètre p, et un changement de zone ne demande pas de nouveau tirage.
+    """
+
+    def __init__(self, zones, rng=None):
+        self.zones = zones
+        self.rng = rng if rng is not None else random
+        self.budget = self._roll()
+
+    def _roll(self):
+        return -math.log(1.0 - self.rng.random())
+
+    def step(self, tile_x, tile_y):
+        """Un pas sur la tuile : retourne {"name", "level"} si une rencontre se déclenche"""
+        table = self.zones.table_at(tile_x, tile_y)
+        if table is None:
+            return None
+        self.budget -= table.hazard
+        if self.budget > 0:
+            return None
+        self.budget = self._roll()
+        return table.sample(self.rng)
+
+    def in_zone(self, tile_x, tile_y):
+        return self.zones.table_at(tile_x, tile_y) is not None
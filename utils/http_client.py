@@ -0,0 +1,114 @@
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import settings
+
+
+class HttpClient:
+    """
+    Client HTTP partagé : connexions réutilisées (keep-alive), délais,
+    nouvelles tentatives avec attente exponentielle et téléchargements parallèles bornés.
+    """
+
+    def __init__(self, timeout=None, retries=None, backoff=None, max_parallel=None):
+        # Import local : requests n'est chargé qu'à la première requête réseau (démarrage plus rapide)
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.timeout = settings.HTTP_TIMEOUT if timeout is None else timeout
+        self.max_parallel = settings.HTTP_MAX_PARALLEL if max_parallel is None else max_parallel
+
+        retry = Retry(
+            total=settings.HTTP_RETRIES if retries is None else retries,
+            backoff_factor=settings.HTTP_BACKOFF if backoff is None else backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET", "HEAD"),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.max_parallel,
+            pool_maxsize=self.max_parallel,
+            max_retries=retry
+        )
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def get(self, url, headers=None):
+        """Requête GET avec délai et nouvelles tentatives"""
+        return self.session.get(url, headers=headers, timeout=self.timeout)
+
+    def download(self, url, path):
+        """
+        Télécharge un fichier : écriture dans un fichier temporaire puis renommage atomique,
+        pour ne jamais laisser de sprite à moitié écrit. Retourne True en cas de succès.
+        """
+        import requests
+
+        try:
+            response = self.get(url)
+        except requests.RequestException as e:
+            print(f"❌ Erreur réseau lors du téléchargement de {url}: {e}")
+            return False
+
+        if response.status_code != 200:
+            return False
+
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".download-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(response.content)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"❌ Impossible d'écrire {path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+        return True
+
+    def _pool(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_parallel, thread_name_prefix="http"
+                )
+            return self._executor
+
+    def map(self, function, items):
+        """Applique une fonction aux éléments en parallèle (au plus max_parallel à la fois)"""
+        items = list(items)
+        if len(items) <= 1:
+            return [function(item) for item in items]
+        return list(self._pool().map(function, items))
+
+    def download_many(self, downloads):
+        """Télécharge une liste de (url, chemin) en parallèle ; retourne la liste des succès"""
+        return self.map(lambda job: self.download(*job), downloads)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Client HTTP partagé par tout le processus"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
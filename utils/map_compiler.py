@@ -0,0 +1,259 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import xml.etree.ElementTree as ET
+from array import array
+
+from utils.encounters import EncounterTable, EncounterZones
+from utils.terrain import TerrainGrid
+
+# Format binaire des cartes compilées :
+#   en-tête  <6s H I>  magie, version du format, taille des métadonnées JSON
+#   métadonnées JSON   dimensions, calques, objets, table des GID utilisés, dépendances
+#   sections alignées sur 8 octets : GID des calques (uint16/uint32), terrain, zones
+MAGIC = b"PKMAP\0"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<6sHI")
+ALIGNMENT = 8
+EXTENSION = ".pkmap"
+
+
+def compiled_path(tmx_path):
+    """Chemin de la carte compilée associée à un fichier TMX"""
+    return os.path.splitext(tmx_path)[0] + EXTENSION
+
+
+def _dependencies(tmx_path):
+    """Fichiers sources de la carte : le TMX et ses jeux de tuiles externes (.tsx)"""
+    paths = [tmx_path]
+    root = ET.parse(tmx_path).getroot()
+    for tileset in root.iter("tileset"):
+        source = tileset.get("source")
+        if source:
+            paths.append(os.path.normpath(os.path.join(os.path.dirname(tmx_path), source)))
+    return paths
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def compile_map(tmx_path, output=None):
+    """
+    Compile une carte TMX : GID des calques, grille de terrain, zones de rencontre,
+    objets et table des GID utilisés dans un seul fichier chargé par mmap au démarrage.
+    Retourne le chemin du fichier écrit.
+    """
+    # Import local : seul le compilateur a besoin de lire le XML
+    from utils.map_streaming import TmxChunkSource
+    from utils.encounters import build_encounter_zones
+    from utils.terrain import build_terrain_grid
+
+    output = output or compiled_path(tmx_path)
+    base = os.path.dirname(os.path.abspath(output))
+    source = TmxChunkSource(tmx_path)
+    window = source.window(0, 0, source.width, source.height)
+    terrain = build_terrain_grid(window)
+    zones = build_encounter_zones(window, terrain)
+
+    sections = []
+    layers = []
+    used = set()
+    for name, properties, cells in source.layers:
+        used.update(cells)
+        typecode = "H" if max(cells, default=0) < 0x10000 else "I"
+        layers.append({"name": name, "properties": properties, "type": typecode})
+        sections.append(array(typecode, cells).tobytes())
+    sections.append(bytes(terrain.cells))
+    sections.append(bytes(zones.cells))
+
+    # Table des GID utilisés : image du jeu de tuiles, rectangle, drapeaux de transformation
+    colorkeys = {ts.firstgid: getattr(ts, "trans", None) for ts in source.tmx_data.tilesets}
+    gids = {}
+    for gid in sorted(used - {0}):
+        entry = source.tmx_data.images[gid] if gid < len(source.tmx_data.images) else None
+        if entry is None:
+            continue
+        path, rect, flags = entry
+        tileset = source.tmx_data.get_tileset_from_gid(gid)
+        gids[str(gid)] = {
+            "image": os.path.relpath(os.path.abspath(path), base),
+            "rect": list(rect),
+            "flags": [bool(flags.flipped_horizontally), bool(flags.flipped_vertically),
+                      bool(flags.flipped_diagonally)],
+            "colorkey": colorkeys.get(tileset.firstgid)
+        }
+
+    meta = {
+        "width": source.width,
+        "height": source.height,
+        "tilewidth": source.tile_width,
+        "tileheight": source.tile_height,
+        "byteorder": sys.byteorder,
+        "layers": layers,
+        "tables": [{"entries": table.entries, "rate": table.rate} for table in zones.tables],
+        "objects": [
+            {"name": obj.name, "type": obj.type, "x": obj.x, "y": obj.y,
+             "width": obj.width, "height": obj.height, "properties": obj.properties}
+            for obj in source.objects
+        ],
+        "gids": gids,
+        "dependencies": [
+            {"path": os.path.relpath(os.path.abspath(path), base), "mtime": os.path.getmtime(path)}
+            for path in _dependencies(tmx_path)
+        ],
+        "sections": []
+    }
+
+    # Les positions des sections dépendent de la taille des métadonnées, qui les contiennent :
+    # on recommence jusqu'à ce que le début des sections soit stable
+    start = None
+    while True:
+        text = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+        data_start = _align(HEADER.size + len(text))
+        if data_start == start:
+            break
+        start = offset = data_start
+        offsets = []
+        for data in sections:
+            offsets.append([offset, len(data)])
+            offset = _align(offset + len(data))
+        meta["sections"] = offsets
+
+    # Écriture atomique : fichier temporaire puis renommage
+    fd, temp_path = tempfile.mkstemp(dir=base, prefix=".compile-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(text)))
+            file.write(text)
+            for (offset, _), data in zip(offsets, sections):
+                if file.tell() > offset:
+                    raise ValueError(f"Section de carte compilée chevauchée à l'octet {offset}")
+                file.write(b"\0" * (offset - file.tell()))
+                file.write(data)
+        os.chmod(temp_path, 0o644)  # mkstemp crée en 0600 : la carte compilée est livrée avec le TMX
+        os.replace(temp_path, output)
+    except (OSError, ValueError):
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return output
+
+
+class CompiledMapSource:
+    """
+    Source de blocs lue dans une carte compilée projetée en mémoire (mmap) :
+    les calques, le terrain et les zones sont lus directement dans le fichier.
+    Même interface que TmxChunkSource pour StreamingTiledMap.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self._mmap)
+        if size < HEADER.size:
+            raise ValueError(f"Carte compilée tronquée ({size} octets): {path}")
+        magic, version, meta_size = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Format de carte compilée non pris en charge: {path}")
+        if HEADER.size + meta_size > size:
+            raise ValueError(f"Métadonnées de carte compilée tronquées: {path}")
+        self.meta = json.loads(self._mmap[HEADER.size:HEADER.size + meta_size].decode("utf-8"))
+        if self.meta["byteorder"] != sys.byteorder:
+            raise ValueError(f"Carte compilée pour un autre ordre d'octets: {path}")
+
+        self.width = self.meta["width"]
+        self.height = self.meta["height"]
+        self.tile_width = self.meta["tilewidth"]
+        self.tile_height = self.meta["tileheight"]
+
+        # Chaque section doit tenir dans le fichier et couvrir exactement la carte
+        cells = self.width * self.height
+        expected = [cells * array(layer["type"]).itemsize for layer in self.meta["layers"]] + [cells, cells]
+        if len(self.meta["sections"]) != len(expected):
+            raise ValueError(f"Sections de carte compilée manquantes: {path}")
+        for (offset, length), wanted in zip(self.meta["sections"], expected):
+            if length != wanted or offset < HEADER.size + meta_size or offset + length > size:
+                raise ValueError(f"Section de carte compilée invalide (octets {offset}-{offset + length}): {path}")
+
+        view = memoryview(self._mmap)
+        sections = [view[offset:offset + length] for offset, length in self.meta["sections"]]
+        self.layers = [
+            (layer["name"], layer["properties"], section.cast(layer["type"]))
+            for layer, section in zip(self.meta["layers"], sections)
+        ]
+        self.terrain_cells = sections[len(self.layers)]
+        self.zone_cells = sections[len(self.layers) + 1]
+        self.tables = [EncounterTable(table["entries"], table["rate"]) for table in self.meta["tables"]]
+
+        from utils.map_streaming import MapObject
+        self.objects = [
+            MapObject(obj["name"], obj["type"], obj["x"], obj["y"], obj["width"], obj["height"], obj["properties"])
+            for obj in self.meta["objects"]
+        ]
+
+        self._base = os.path.dirname(os.path.abspath(path))
+        self._tiles = {}
+        self._lock = threading.Lock()
+
+    def _rows(self, cells, tile_x, tile_y, width, height):
+        return [cells[(y * self.width) + tile_x:(y * self.width) + tile_x + width]
+                for y in range(tile_y, tile_y + height)]
+
+    def chunk(self, tile_x, tile_y, width, height):
+        """Données d'un bloc : (lignes de GID par calque, grille de terrain, zones de rencontre)"""
+        layers = [self._rows(cells, tile_x, tile_y, width, height) for _, _, cells in self.layers]
+        terrain = TerrainGrid(width, height, b"".join(self._rows(self.terrain_cells, tile_x, tile_y, width, height)))
+        zones = EncounterZones(width, height)
+        zones.tables = self.tables
+        zones.cells = bytearray(b"".join(self._rows(self.zone_cells, tile_x, tile_y, width, height)))
+        return layers, terrain, zones
+
+    def species(self):
+        zones = EncounterZones(0, 0)
+        zones.tables = self.tables
+        return zones.species()
+
+    def tile_image(self, gid):
+        """Surface d'une tuile d'après la table des GID utilisés (décodée au premier usage)"""
+        from pytmx import TileFlags
+        from utils.map_streaming import cut_tile
+
+        with self._lock:
+            if gid not in self._tiles:
+                entry = self.meta["gids"].get(str(gid))
+                image = None
+                if entry is not None:
+                    image = cut_tile(os.path.join(self._base, entry["image"]), tuple(entry["rect"]),
+                                     TileFlags(*entry["flags"]), entry["colorkey"])
+                self._tiles[gid] = image
+            return self._tiles[gid]
+
+    def is_fresh(self):
+        """Vrai si aucun fichier source n'a été modifié depuis la compilation"""
+        for dependency in self.meta["dependencies"]:
+            path = os.path.join(self._base, dependency["path"])
+            if not os.path.exists(path) or os.path.getmtime(path) > dependency["mtime"]:
+                return False
+        return True
+
+
+def load_compiled_map(tmx_path):
+    """Carte compilée à jour pour ce TMX, ou None (absente, périmée ou illisible)"""
+    path = compiled_path(tmx_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        source = CompiledMapSource(path)
+    except (OSError, ValueError, KeyError, TypeError, struct.error) as e:
+        print(f"⚠️ Carte compilée ignorée {path}: {e}")
+        return None
+    if not source.is_fresh():
+        print(f"⚠️ Carte compilée périmée ({path}) : lecture du TMX (python compile_map.py pour la recompiler)")
+        return None
+    return source
@@ -2,7 +2,23 @@ import pygame
 import pytmx
 import pyscroll
 import os
-import random
+from utils import settings, trace
+from utils.camera import Camera
+from utils.encounters import build_encounter_zones
+from utils.spatial_hash import SpatialHash
+from utils.terrain import build_terrain_grid, WALKABLE
+from utils.tile_atlas import atlas_image_loader
+
+# Types d'objets Tiled interprétés par le jeu
+PLAYER_START_TYPE = "player_start"
+SOLID_OBJECT_TYPE = "solid"             # Obstacle (ou propriété solid=true sur n'importe quel objet)
+WARP_OBJECT_TYPES = ("warp", "door")    # Téléporte vers les tuiles target_x, target_y
+SIGN_OBJECT_TYPE = "sign"               # Affiche la propriété 'text'
+
+def is_solid_object(obj):
+    properties = getattr(obj, "properties", None) or {}
+    return getattr(obj, "type", None) == SOLID_OBJECT_TYPE or properties.get("solid") in (True, "true")
+
 
 class TiledMap:
     def __init__(self, filename):
@@ -21,13 +37,12 @@ class TiledMap:
         self.screen_width = 800
         self.screen_height = 600
         
-        # Variables pour stocker la position de la caméra
-        self.camera_x = 0
-        self.camera_y = 0
-        
         # Charger les données de la carte TMX
         try:
-            self.tmx_data = pytmx.load_pygame(filename, pixelalpha=True)
+            # Seules les tuiles utilisées par la carte sont découpées (pas les 21 000 du jeu),
+            # dans l'atlas dédoublonné du jeu de tuiles s'il existe (extract_tiles.py)
+            self.tmx_data = pytmx.TiledMap(filename, image_loader=atlas_image_loader,
+                                           pixelalpha=True, load_all=False)
             print(f"✅ Carte Tiled chargée: {filename}")
         except Exception as e:
             raise Exception(f"❌ Erreur lors du chargement de la carte: {e}")
@@ -59,6 +74,11 @@ class TiledMap:
         # IMPORTANT: NE PAS réduire la hauteur de la carte
         # self.map_height_px -= 2 * self.real_tile_height  # Cette ligne a été supprimée
         
+        # Caméra (zone morte, limites de la carte, défilement amorti)
+        self.camera = Camera((self.screen_width, self.screen_height),
+                             (self.map_width_px, self.map_height_px),
+                             (self.offset_x, self.offset_y))
+        
         # Créer un gestionnaire de rendu avec pyscroll avec mise à l'échelle
         map_data = pyscroll.data.TiledMapData(self.tmx_data)
         self.map_layer = pyscroll.orthographic.BufferedRenderer(
@@ -70,6 +90,16 @@ class TiledMap:
         # Créer un groupe de sprites qui contient notre calque de carte
         self.group = pyscroll.PyscrollGroup(map_layer=self.map_layer)
         
+        # Grille de terrain précalculée (collisions, herbes, eau)
+        self.terrain = build_terrain_grid(self.tmx_data)
+        
+        # Zones de rencontre (tables des propriétés 'encounters' des calques et objets)
+        self.encounter_zones = build_encounter_zones(self.tmx_data, self.terrain)
+        
+        # Version de la carte : incrémentée à chaque tuile bloquée ou libérée (chemins mis en cache)
+        self.version = 0
+        self._changes = []  # (version, x, y)
+        
         # Points d'intérêt
         self.points_of_interest = {}
         
@@ -78,19 +108,61 @@ class TiledMap:
         
         print(f"✅ Carte Tiled initialisée avec un facteur d'échelle de {self.scale_factor}")
     
+    def _map_objects(self):
+        """Objets de tous les calques d'objets de la carte"""
+        return self.tmx_data.objects
+    
     def _parse_map_objects(self):
-        """Analyse les objets et points d'intérêt de la carte"""
+        """Analyse les objets et points d'intérêt de la carte, puis les indexe par position"""
         print("🔍 Analyse des objets de la carte...")
         
+        # Index spatial des objets (portes, panneaux, déclencheurs, obstacles) et des entités
+        self.object_index = SpatialHash(self.real_tile_width * settings.OBJECT_INDEX_CELL)
+        
         # Parcourir tous les objets
-        for obj in self.tmx_data.objects:
+        for obj in self._map_objects():
             # Point de départ du joueur
-            if hasattr(obj, 'type') and obj.type == "player_start":
+            if getattr(obj, 'type', None) == PLAYER_START_TYPE:
                 self.points_of_interest["player_start"] = (
                     obj.x * self.scale_factor, 
                     obj.y * self.scale_factor
                 )
                 print(f"✅ Point de départ du joueur trouvé: ({obj.x}, {obj.y})")
+            else:
+                self.object_index.insert(obj, self.object_rect(obj))
+        
+        if len(self.object_index):
+            print(f"✅ {len(self.object_index)} objets indexés")
+        
+        # Tuiles dont le centre est couvert par un objet solide (grille de recherche de chemin)
+        self.blocked_tiles = set()
+        for obj in self.object_index:
+            if is_solid_object(obj):
+                rect = self.object_index.rect(obj)
+                for tile_y in range(rect.top // self.real_tile_height, (rect.bottom - 1) // self.real_tile_height + 1):
+                    for tile_x in range(rect.left // self.real_tile_width, (rect.right - 1) // self.real_tile_width + 1):
+                        if rect.collidepoint((tile_x + 0.5) * self.real_tile_width, (tile_y + 0.5) * self.real_tile_height):
+                            self.blocked_tiles.add((tile_x, tile_y))
+    
+    def object_rect(self, obj):
+        """Rectangle d'un objet Tiled en pixels mis à l'échelle"""
+        return pygame.Rect(
+            int(obj.x * self.scale_factor),
+            int(obj.y * self.scale_factor),
+            int(obj.width * self.scale_factor),
+            int(obj.height * self.scale_factor)
+        )
+    
+    def objects_in(self, rect):
+        """Objets et entités qui chevauchent le rectangle"""
+        return self.object_index.query_rect(rect)
+    
+    def is_blocked_by_object(self, x, y):
+        """Vrai si un objet solide occupe la position (x, y)"""
+        for obj in self.object_index.query_point(x, y):
+            if is_solid_object(obj):
+                return True
+        return False
     
     def get_spawn_position(self):
         """Retourne la position de départ du joueur ou une position par défaut"""
@@ -103,204 +175,116 @@ class TiledMap:
         return (center_x, center_y)
     
     def render(self, screen):
-        """Dessine la carte sur l'écran"""
+        """Dessine la carte sur l'écran (le rendu pyscroll est déjà centré par set_view)"""
         self.group.draw(screen)
+        self.camera.dirty = False
+    
+    @property
+    def camera_x(self):
+        return self.camera.x
+    
+    @property
+    def camera_y(self):
+        return self.camera.y
+    
+    @property
+    def view_x(self):
+        return self.camera.view_x
+    
+    @property
+    def view_y(self):
+        return self.camera.view_y
     
     def update(self, player_rect):
         """
         Met à jour la caméra style Pokémon: le joueur se déplace librement 
         et la caméra ne bouge que lorsqu'il s'approche des bords
+        (la cible change ici, la caméra la rejoint à chaque pas de simulation)
         """
-        try:
-            # Récupérer les coordonnées du joueur
-            player_x, player_y = player_rect.centerx, player_rect.centery
-            
-            # --- Logique de caméra style Pokémon ---
-            # Ne déplacer la caméra que lorsque le joueur s'approche des bords
-            # Zones de déclenchement des bords (25% de l'écran depuis les bords)
-            edge_margin_x = self.screen_width * 0.25
-            edge_margin_y = self.screen_height * 0.25
-            
-            # Initialiser les variables de caméra si ce n'est pas déjà fait
-            if not hasattr(self, 'camera_x') or not hasattr(self, 'camera_y'):
-                self.camera_x = player_x - (self.screen_width // 2)
-                self.camera_y = player_y - (self.screen_height // 2)
-            
-            # Position du joueur par rapport à l'écran
-            screen_x = player_x - self.camera_x
-            screen_y = player_y - self.camera_y
-            
-            # Vérifier si le joueur s'approche des bords et ajuster la caméra
-            camera_moved = False
-            
-            # Bord droit
-            if screen_x > self.screen_width - edge_margin_x:
-                self.camera_x = player_x - (self.screen_width - edge_margin_x)
-                camera_moved = True
-            
-            # Bord gauche
-            elif screen_x < edge_margin_x:
-                self.camera_x = player_x - edge_margin_x
-                camera_moved = True
-            
-            # Bord inférieur
-            if screen_y > self.screen_height - edge_margin_y:
-                self.camera_y = player_y - (self.screen_height - edge_margin_y)
-                camera_moved = True
-            
-            # Bord supérieur
-            elif screen_y < edge_margin_y:
-                self.camera_y = player_y - edge_margin_y
-                camera_moved = True
-            
-            # Limiter la caméra aux bords de la carte en tenant compte de l'écran
-            # Utiliser les dimensions réelles de la carte avec les offsets
-            self.camera_x = max(0 - self.offset_x, min(self.camera_x, self.map_width_px - self.screen_width + self.offset_x))
-            self.camera_y = max(0 - self.offset_y, min(self.camera_y, self.map_height_px - self.screen_height + self.offset_y))
-            
-            # Mettre à jour la position de la caméra
-            if camera_moved:
-                # Appliquer la nouvelle position caméra
-                camera_center_x = self.camera_x + (self.screen_width // 2)
-                camera_center_y = self.camera_y + (self.screen_height // 2)
-                
-                # Utiliser la méthode center avec un tuple pour déplacer la caméra
-                self.map_layer.center((camera_center_x, camera_center_y))
-                
-                # Mettre à jour le groupe
-                self.group.update()
-                
-                print(f"🎮 Caméra déplacée - Position: ({self.camera_x}, {self.camera_y})")
-            
-            # Afficher occasionnellement les infos de débogage
-            if random.random() < 0.02:  # 2% du temps
-                self.debug_print_map_state()
-                
-        except Exception as e:
-            print(f"❌ Erreur lors de la mise à jour de la caméra: {e}")
-            import traceback
-            traceback.print_exc()
+        if self.camera.follow(player_rect.centerx, player_rect.centery) and trace.on.camera:
+            trace.debug("camera", "🎮 Caméra déplacée - Cible: (%s, %s)",
+                        self.camera.target_x, self.camera.target_y)
+    
+    def focus(self, x, y):
+        """Place immédiatement la caméra sur le joueur (départ, téléportation)"""
+        self.camera.snap(x, y)
+    
+    def set_view(self, x, y):
+        """Positionne le rendu sur une caméra interpolée : pyscroll n'est recentré que si la vue change"""
+        if self.camera.set_view(x, y):
+            self._center_view(self.camera.view_x, self.camera.view_y)
+    
+    def _center_view(self, x, y):
+        """Centre le rendu pyscroll sur la caméra dont le coin haut-gauche est (x, y)"""
+        self.map_layer.center((x + (self.screen_width // 2), y + (self.screen_height // 2)))
+        self.group.update()
     
     def debug_print_map_state(self):
-        """Affiche les informations de débogage sur l'état actuel de la carte"""
-        print("\n===== DEBUG MAP STATE =====")
-        print(f"Map dimensions: {self.width}x{self.height} tiles ({self.map_width_px}x{self.map_height_px} px)")
-        print(f"Camera position: ({self.camera_x}, {self.camera_y})")
-        print(f"Offsets: X={self.offset_x}, Y={self.offset_y}")
-        print("==========================\n")
+        """Trace les informations de débogage sur l'état actuel de la carte"""
+        if trace.on.map:
+            trace.info("map", "Map dimensions: %dx%d tiles (%dx%d px)",
+                       self.width, self.height, self.map_width_px, self.map_height_px)
+            trace.info("map", "Camera position: (%s, %s)", self.camera_x, self.camera_y)
+            trace.info("map", "Offsets: X=%s, Y=%s", self.offset_x, self.offset_y)
+    
+    def pixel_to_tile(self, x, y):
+        """Convertit des coordonnées pixel en coordonnées de tuile"""
+        return int(x // self.real_tile_width), int(y // self.real_tile_height)
     
     def is_walkable(self, x, y):
-        """Vérifie si la position (x, y) est praticable avec des logs détaillés"""
-        # Calculer les limites de la carte en pixels
-        map_width = self.map_width_px
-        map_height = self.map_height_px
-        
-        print(f"\n🕹️ Vérification de praticabilité:")
-        print(f"   Position pixel: ({x}, {y})")
-        print(f"   Taille réelle de tuile: {self.real_tile_width}x{self.real_tile_height}")
-        print(f"   Limites de la carte en pixels: {map_width}x{map_height}")
-        
+        """Vérifie si la position (x, y) est praticable (une lecture dans la grille de terrain)"""
         # Pour la vérification de praticabilité, utiliser une plus grande tolérance
         # aux bords de la carte pour éviter les faux-positifs "hors limites"
         margin = 20  # pixels de tolérance
         
         # Vérifier les limites de la carte avec la marge de tolérance
         if (x < -margin or y < -margin or 
-            x >= map_width + margin or y >= map_height + margin):
-            print(f"❌ Position ({x}, {y}) hors limites de la carte")
+            x >= self.map_width_px + margin or y >= self.map_height_px + margin):
             return False
         
         # Convertir en coordonnées de tuile
-        tile_x = int(x // self.real_tile_width)
-        tile_y = int(y // self.real_tile_height)
+        tile_x, tile_y = self.pixel_to_tile(x, y)
         
         # Limiter les coordonnées de tuile aux dimensions de la carte
         tile_x = max(0, min(tile_x, self.width - 1))
         tile_y = max(0, min(tile_y, self.height - 1))
         
-        print(f"   Position tuile: ({tile_x}, {tile_y})")
+        if trace.on.collision:
+            trace.debug("collision", "🕹️ (%s, %s) -> tuile (%d, %d) drapeaux %#04x",
+                        x, y, tile_x, tile_y, self.terrain.flags_at(tile_x, tile_y))
         
-        # Vérifier chaque calque visible
-        walkable_found = False
-        for layer in self.tmx_data.visible_layers:
-            if hasattr(layer, 'data'):
-                try:
-                    # Récupérer le GID de la tuile
-                    gid = layer.data[tile_y][tile_x]
-                    
-                    print(f"   Calque: {layer.name}")
-                    print(f"   GID de la tuile: {gid}")
-                    
-                    # Vérifier les propriétés du calque
-                    if hasattr(layer, 'properties'):
-                        print(f"   Propriétés du calque: {layer.properties}")
-                        # Si le calque est marqué comme praticable
-                        if layer.properties.get('walkable', False):
-                            print("   ✅ Calque marqué comme praticable")
-                            walkable_found = True
-                    
-                    # Vérifier si la tuile est non vide
-                    if gid != 0:
-                        # Mode permissif : considérer certaines tuiles comme praticables
-                        # Liste des GID que vous savez être praticables
-                        walkable_gids = [2954, 2955, 3094, 3095, 5, 2]  # Ajoutez les GID de vos tuiles de sol
-                        if gid in walkable_gids:
-                            print(f"   ✅ GID {gid} considéré comme praticable par défaut")
-                            walkable_found = True
-                    
-                    # Si on a trouvé une tuile praticable, on peut arrêter de chercher
-                    if walkable_found:
-                        break
-                    
-                except (IndexError, AttributeError, KeyError) as e:
-                    print(f"   Erreur lors de la vérification: {e}")
-        
-        print(f"   Résultat final: {'Praticable' if walkable_found else 'Non praticable'}")
-        return walkable_found
+        return self.is_tile_walkable(tile_x, tile_y) and not self.is_blocked_by_object(x, y)
+    
+    def is_tile_walkable(self, tile_x, tile_y):
+        """Praticabilité d'une tuile (terrain et tuiles bloquées), en coordonnées de tuile"""
+        return self.terrain.is_walkable(tile_x, tile_y) and (tile_x, tile_y) not in self.blocked_tiles
+    
+    def set_tile_blocked(self, tile_x, tile_y, blocked=True):
+        """Bloque ou libère une tuile (rocher déplacé, arbre coupé...) et enregistre le changement"""
+        if ((tile_x, tile_y) in self.blocked_tiles) == blocked:
+            return
+        if blocked:
+            self.blocked_tiles.add((tile_x, tile_y))
+        else:
+            self.blocked_tiles.discard((tile_x, tile_y))
+        self.version += 1
+        self._changes.append((self.version, tile_x, tile_y))
+    
+    def changes_since(self, version):
+        """Retourne les tuiles (x, y) modifiées depuis la version donnée"""
+        return [(x, y) for change_version, x, y in self._changes if change_version > version]
 
     def is_grass(self, x, y):
         """Vérifie si la position (x, y) est dans les hautes herbes"""
-        # Convertir en coordonnées de tuile
-        tile_x = int(x // self.real_tile_width)
-        tile_y = int(y // self.real_tile_height)
-        
-        # Vérifier les limites de la carte
-        if (tile_x < 0 or tile_y < 0 or 
-            tile_x >= self.width or tile_y >= self.height):
-            return False
-        
-        # Vérification 1: Rechercher un calque spécifique nommé "hautes_herbes"
-        for layer in self.tmx_data.visible_layers:
-            if hasattr(layer, 'name') and layer.name == "hautes_herbes":
-                if hasattr(layer, 'data'):
-                    try:
-                        # Récupérer le GID de la tuile
-                        gid = layer.data[tile_y][tile_x]
-                        
-                        # Si la tuile n'est pas vide (GID > 0), c'est de l'herbe
-                        if gid > 0:
-                            print(f"🌿 Détection herbe dans calque 'hautes_herbes': GID {gid}")
-                            return True
-                            
-                    except (IndexError, AttributeError, KeyError) as e:
-                        print(f"Erreur lors de la vérification du calque 'hautes_herbes': {e}")
-        
-        # Vérification 2: Rechercher un calque avec type='haute_herbe'
-        # (différent de 'grass' pour éviter la confusion avec le sol)
-        for layer in self.tmx_data.visible_layers:
-            if hasattr(layer, 'properties') and layer.properties.get('type') == 'haute_herbe':
-                if hasattr(layer, 'data'):
-                    try:
-                        # Récupérer le GID de la tuile
-                        gid = layer.data[tile_y][tile_x]
-                        
-                        # Si la tuile n'est pas vide (GID > 0), c'est de l'herbe
-                        if gid > 0:
-                            print(f"🌿 Détection herbe dans calque de type 'haute_herbe': GID {gid}")
-                            return True
-                            
-                    except (IndexError, AttributeError, KeyError) as e:
-                        print(f"Erreur lors de la vérification du calque de type 'haute_herbe': {e}")
-        
-        # Pas d'herbe haute détectée
-        return False
\ No newline at end of file
+        tile_x, tile_y = self.pixel_to_tile(x, y)
+        return self.terrain.is_grass(tile_x, tile_y)
+    
+    def tile_flags(self, x, y):
+        """Retourne les drapeaux de terrain (SOLID, WALKABLE, TALL_GRASS, WATER) à la position (x, y)"""
+        tile_x, tile_y = self.pixel_to_tile(x, y)
+        return self.terrain.flags_at(tile_x, tile_y)
+    
+    def query_many(self, xs, ys, flag=WALKABLE):
+        """Requête vectorisée sur des lots de positions pixel (sans marge de tolérance)"""
+        return self.terrain.query_many(xs, ys, flag,
+                                       tile_size=(self.real_tile_width, self.real_tile_height))
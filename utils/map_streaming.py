@@ -0,0 +1,461 @@
+import collections
+import threading
+import xml.etree.ElementTree as ET
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+import pytmx
+from pytmx.util_pygame import handle_transformation
+
+from utils import settings, trace
+from utils.camera import Camera
+from utils.encounters import build_encounter_zones
+from utils.map_loader import TiledMap
+from utils.surface_cache import load_surface, RAW
+from utils.terrain import build_terrain_grid, TALL_GRASS, WALKABLE
+from utils.tile_atlas import locate_tile
+
+
+def read_map_size(filename):
+    """Lit seulement l'en-tête <map> d'un fichier TMX : (largeur, hauteur) en tuiles"""
+    for _, element in ET.iterparse(filename, events=("start",)):
+        if element.tag == "map":
+            return int(element.get("width")), int(element.get("height"))
+    raise ValueError(f"Pas d'élément <map> dans {filename}")
+
+
+def open_tiled_map(filename):
+    """
+    Ouvre une carte Tiled : carte compilée si elle est à jour, sinon chargement complet
+    (pyscroll) pour les petites cartes et par blocs pour les grandes
+    (POKEMON_MAP_STREAMING=1/0 pour forcer)
+    """
+    # Carte compilée à jour : projection en mémoire du fichier au lieu de l'analyse du XML
+    if settings.COMPILED_MAPS:
+        from utils.map_compiler import load_compiled_map
+        compiled = load_compiled_map(filename)
+        if compiled is not None:
+            return StreamingTiledMap(compiled.path, source=compiled)
+
+    mode = settings.MAP_STREAMING
+    if mode == "auto":
+        width, height = read_map_size(filename)
+        mode = "1" if width * height >= settings.MAP_STREAMING_MIN_TILES else "0"
+    if mode == "1":
+        return StreamingTiledMap(filename)
+    return TiledMap(filename)
+
+
+class _LayerWindow:
+    """Fenêtre d'un calque de tuiles : lignes de GID au format attendu par build_terrain_grid"""
+
+    def __init__(self, name, properties, data):
+        self.name = name
+        self.properties = properties
+        self.data = data
+
+
+class MapObject:
+    """Objet de carte (point de départ, zone de rencontre...) en pixels non mis à l'échelle"""
+
+    def __init__(self, name, type, x, y, width, height, properties):
+        self.name = name
+        self.type = type
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.properties = properties
+
+    @classmethod
+    def from_tmx(cls, obj, dx=0, dy=0):
+        return cls(getattr(obj, "name", None), getattr(obj, "type", None), obj.x - dx, obj.y - dy,
+                   obj.width, obj.height, getattr(obj, "properties", {}) or {})
+
+
+class _MapWindow:
+    """
+    Vue d'une portion rectangulaire de la carte avec l'interface pytmx utilisée par
+    build_terrain_grid et build_encounter_zones : un bloc est indexé comme une petite carte.
+    """
+
+    def __init__(self, source, tile_x, tile_y, width, height):
+        self.width = width
+        self.height = height
+        self.tilewidth = source.tile_width
+        self.tileheight = source.tile_height
+        self.properties = source.tmx_data.properties
+        self.tiledgidmap = source.tmx_data.tiledgidmap
+        self.get_tile_properties_by_gid = source.tmx_data.get_tile_properties_by_gid
+
+        self.visible_layers = []
+        for name, properties, cells in source.layers:
+            rows = []
+            for y in range(tile_y, tile_y + height):
+                start = y * source.width + tile_x
+                rows.append(cells[start:start + width])
+            self.visible_layers.append(_LayerWindow(name, properties, rows))
+
+        dx, dy = tile_x * source.tile_width, tile_y * source.tile_height
+        self.objects = [MapObject(obj.name, obj.type, obj.x - dx, obj.y - dy, obj.width, obj.height, obj.properties)
+                        for obj in source.objects]
+
+
+class TmxChunkSource:
+    """
+    Source de blocs lue depuis un fichier TMX : les GID des calques sont gardés dans des
+    tableaux compacts, sans décoder aucune image de tuile au chargement.
+    """
+
+    def __init__(self, filename):
+        # Le chargeur d'images par défaut de pytmx ne décode rien : (fichier, rectangle, drapeaux)
+        self.tmx_data = pytmx.TiledMap(filename, load_all=False)
+        self.width = self.tmx_data.width
+        self.height = self.tmx_data.height
+        self.tile_width = self.tmx_data.tilewidth
+        self.tile_height = self.tmx_data.tileheight
+
+        self.layers = []  # (nom, propriétés, array('I') de largeur * hauteur GID)
+        for layer in self.tmx_data.visible_layers:
+            if not isinstance(layer, pytmx.TiledTileLayer):
+                continue
+            cells = array("I")
+            for row in layer.data:
+                cells.extend(row)
+            self.layers.append((layer.name, getattr(layer, "properties", {}) or {}, cells))
+            layer.data = None  # Les tableaux compacts remplacent les listes pytmx
+
+        self._tiles = {}  # GID -> surface de la tuile (décodée à la première utilisation)
+        self._colorkeys = {ts.firstgid: getattr(ts, "trans", None) for ts in self.tmx_data.tilesets}
+        self._lock = threading.Lock()
+
+        self.objects = [MapObject.from_tmx(obj) for obj in self.tmx_data.objects]
+
+    def window(self, tile_x, tile_y, width, height):
+        return _MapWindow(self, tile_x, tile_y, width, height)
+
+    def chunk(self, tile_x, tile_y, width, height):
+        """Données d'un bloc : (lignes de GID par calque, grille de terrain, zones de rencontre)"""
+        window = self.window(tile_x, tile_y, width, height)
+        terrain = build_terrain_grid(window)
+        zones = build_encounter_zones(window, terrain)
+        return [layer.data for layer in window.visible_layers], terrain, zones
+
+    def species(self):
+        """Espèces de toutes les zones (une fenêtre vide crée les tables sans parcourir de tuiles)"""
+        empty = self.window(0, 0, 0, 0)
+        return build_encounter_zones(empty, build_terrain_grid(empty)).species()
+
+    def tile_image(self, gid):
+        """Surface d'une tuile, découpée dans l'image du jeu de tuiles au premier usage"""
+        with self._lock:
+            if gid not in self._tiles:
+                entry = self.tmx_data.images[gid] if gid < len(self.tmx_data.images) else None
+                image = None
+                if entry is not None:
+                    path, rect, flags = entry
+                    tileset = self.tmx_data.get_tileset_from_gid(gid)
+                    image = cut_tile(path, rect, flags, self._colorkeys.get(tileset.firstgid))
+                self._tiles[gid] = image
+            return self._tiles[gid]
+
+
+def cut_tile(path, rect, flags, colorkey=None):
+    """Découpe une tuile dans l'image de son jeu de tuiles, ou dans son atlas (décodé une fois via le cache)"""
+    path, rect = locate_tile(path, rect)
+    sheet = load_surface(path, mode=RAW)
+    image = handle_transformation(sheet.subsurface(rect), flags)
+    if colorkey:
+        image.set_colorkey(pygame.Color(f"#{colorkey.lstrip('#')}"))
+    return image
+
+
+class MapChunk:
+    """Bloc de carte chargé : image mise à l'échelle, grille de terrain et zones de rencontre"""
+
+    def __init__(self, key, surface, terrain, zones):
+        self.key = key
+        self.surface = surface
+        self.terrain = terrain
+        self.zones = zones
+        self.converted = False
+        # Taille comptée dans le budget (surface au format de l'écran : 4 octets par pixel)
+        self.bytes = (len(terrain.cells) + len(zones.cells) +
+                      surface.get_width() * surface.get_height() * 4)
+
+
+class ChunkedTerrain:
+    """Grille de terrain d'une carte par blocs : même interface que TerrainGrid"""
+
+    def __init__(self, game_map):
+        self.map = game_map
+        self.width = game_map.width
+        self.height = game_map.height
+
+    def flags_at(self, tile_x, tile_y):
+        if not (0 <= tile_x < self.width and 0 <= tile_y < self.height):
+            return 0
+        chunk, local_x, local_y = self.map.chunk_at_tile(tile_x, tile_y)
+        return chunk.terrain.flags_at(local_x, local_y)
+
+    def has(self, tile_x, tile_y, flag):
+        return bool(self.flags_at(tile_x, tile_y) & flag)
+
+    def is_walkable(self, tile_x, tile_y):
+        return self.has(tile_x, tile_y, WALKABLE)
+
+    def is_grass(self, tile_x, tile_y):
+        return self.has(tile_x, tile_y, TALL_GRASS)
+
+    def query_many(self, tile_xs, tile_ys, flag=WALKABLE, tile_size=None):
+        results = []
+        for x, y in zip(tile_xs, tile_ys):
+            if tile_size is not None:
+                x, y = int(x // tile_size[0]), int(y // tile_size[1])
+            results.append(self.has(int(x), int(y), flag))
+        return results
+
+
+class ChunkedEncounterZones:
+    """Zones de rencontre d'une carte par blocs : même interface que EncounterZones"""
+
+    def __init__(self, game_map, species):
+        self.map = game_map
+        self.version = None
+        self._species = species
+
+    def table_at(self, tile_x, tile_y):
+        if not (0 <= tile_x < self.map.width and 0 <= tile_y < self.map.height):
+            return None
+        chunk, local_x, local_y = self.map.chunk_at_tile(tile_x, tile_y)
+        return chunk.zones.table_at(local_x, local_y)
+
+    def species(self):
+        return list(self._species)
+
+
+class StreamingTiledMap(TiledMap):
+    """
+    Carte Tiled chargée par blocs de MAP_CHUNK_SIZE tuiles : seuls les blocs proches de la
+    caméra sont rendus et indexés (terrain, rencontres), ceux situés dans la direction du
+    déplacement sont préparés par un thread de fond, et les plus anciens sont évincés
+    au-delà de MAP_CHUNK_BUDGET octets. Mêmes requêtes et même rendu que TiledMap.
+    """
+
+    def __init__(self, filename, chunk_size=None, radius=None, budget=None, source=None):
+        if not pygame.get_init():
+            pygame.init()
+
+        self.screen_width = 800
+        self.screen_height = 600
+        try:
+            self.source = source if source is not None else TmxChunkSource(filename)
+            print(f"✅ Carte Tiled ouverte par blocs: {filename}")
+        except Exception as e:
+            raise Exception(f"❌ Erreur lors du chargement de la carte: {e}")
+
+        self.width = self.source.width
+        self.height = self.source.height
+        self.tile_width = self.source.tile_width
+        self.tile_height = self.source.tile_height
+        self.scale_factor = 2.0
+        self.real_tile_width = int(self.tile_width * self.scale_factor)
+        self.real_tile_height = int(self.tile_height * self.scale_factor)
+        self.map_width_px = self.width * self.real_tile_width
+        self.map_height_px = self.height * self.real_tile_height
+        self.offset_x = 0
+        self.offset_y = 0
+        print(f"📏 Dimensions carte : {self.width}x{self.height} tuiles, {self.map_width_px}x{self.map_height_px}px")
+        self.camera = Camera((self.screen_width, self.screen_height),
+                             (self.map_width_px, self.map_height_px),
+                             (self.offset_x, self.offset_y))
+
+        self.chunk_size = settings.MAP_CHUNK_SIZE if chunk_size is None else chunk_size
+        self.radius = settings.MAP_CHUNK_RADIUS if radius is None else radius
+        self.budget_bytes = settings.MAP_CHUNK_BUDGET if budget is None else budget
+        self.chunk_width_px = self.chunk_size * self.real_tile_width
+        self.chunk_height_px = self.chunk_size * self.real_tile_height
+        self.chunks_x = -(-self.width // self.chunk_size)
+        self.chunks_y = -(-self.height // self.chunk_size)
+
+        self._chunks = collections.OrderedDict()  # (cx, cy) -> MapChunk, ordre LRU
+        self._pending = {}  # (cx, cy) -> Future[MapChunk]
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chunks")
+        self._last_view = None
+        self._keep = set()  # Blocs autour de la caméra, jamais évincés
+        self.bytes_used = 0
+        self.loads = 0
+        self.evictions = 0
+
+        self.terrain = ChunkedTerrain(self)
+        self.encounter_zones = ChunkedEncounterZones(self, self.source.species())
+
+        self.version = 0
+        self._changes = []  # (version, x, y)
+        self.points_of_interest = {}
+        self._parse_map_objects()
+
+        print(f"✅ Carte par blocs de {self.chunk_size}x{self.chunk_size} tuiles "
+              f"({self.chunks_x}x{self.chunks_y} blocs)")
+
+    def _map_objects(self):
+        return self.source.objects
+
+    # --- Blocs ---
+
+    def chunk_at_tile(self, tile_x, tile_y):
+        """Bloc contenant la tuile (chargé immédiatement si nécessaire) et coordonnées locales"""
+        key = (tile_x // self.chunk_size, tile_y // self.chunk_size)
+        chunk = self._get_chunk(key)
+        return chunk, tile_x - key[0] * self.chunk_size, tile_y - key[1] * self.chunk_size
+
+    def _get_chunk(self, key):
+        with self._lock:
+            chunk = self._chunks.get(key)
+            if chunk is not None:
+                self._chunks.move_to_end(key)
+                return chunk
+            future = self._pending.get(key)
+
+        # Bloc demandé avant d'être prêt : attendre le thread de fond ou le construire ici
+        chunk = None
+        if future is not None:
+            try:
+                chunk = future.result()
+            except Exception as e:
+                print(f"❌ Erreur lors du chargement du bloc {key}: {e}")
+        if chunk is None:
+            chunk = self._build_chunk(key)
+        self._install(key, chunk)
+        return self._chunks.get(key, chunk)
+
+    def _build_chunk(self, key):
+        """Construit un bloc : indexation du terrain et des zones, puis rendu des calques"""
+        with self._build_lock:
+            tile_x, tile_y = key[0] * self.chunk_size, key[1] * self.chunk_size
+            width = min(self.chunk_size, self.width - tile_x)
+            height = min(self.chunk_size, self.height - tile_y)
+            layers, terrain, zones = self.source.chunk(tile_x, tile_y, width, height)
+
+            surface = pygame.Surface((width * self.tile_width, height * self.tile_height))
+            surface.fill((0, 0, 0))
+            for rows in layers:
+                for y, row in enumerate(rows):
+                    for x, gid in enumerate(row):
+                        if gid:
+                            image = self.source.tile_image(gid)
+                            if image is not None:
+                                surface.blit(image, (x * self.tile_width, y * self.tile_height))
+            surface = pygame.transform.scale(
+                surface, (width * self.real_tile_width, height * self.real_tile_height)
+            )
+            return MapChunk(key, surface, terrain, zones)
+
+    def _install(self, key, chunk):
+        with self._lock:
+            self._pending.pop(key, None)
+            if key in self._chunks:
+                return
+            self._chunks[key] = chunk
+            self.bytes_used += chunk.bytes
+            self.loads += 1
+        self._evict(self._keep | {key})
+        if trace.on.map:
+            trace.debug("map", "🧱 Bloc %s chargé (%d en mémoire)", key, len(self._chunks))
+
+    def _collect(self):
+        """Installe les blocs préparés en arrière-plan (thread principal)"""
+        with self._lock:
+            done = [(key, future) for key, future in self._pending.items() if future.done()]
+        for key, future in done:
+            try:
+                self._install(key, future.result())
+            except Exception as e:
+                print(f"❌ Erreur lors du chargement du bloc {key}: {e}")
+                with self._lock:
+                    self._pending.pop(key, None)
+
+    def _chunks_around(self, x, y, dx=0, dy=0):
+        """Blocs couvrant l'écran en (x, y), élargi de 'radius' blocs et décalé de (dx, dy) blocs"""
+        left = int(x // self.chunk_width_px) - self.radius + dx
+        top = int(y // self.chunk_height_px) - self.radius + dy
+        right = int((x + self.screen_width) // self.chunk_width_px) + self.radius + dx
+        bottom = int((y + self.screen_height) // self.chunk_height_px) + self.radius + dy
+        return [
+            (cx, cy)
+            for cy in range(max(0, top), min(self.chunks_y - 1, bottom) + 1)
+            for cx in range(max(0, left), min(self.chunks_x - 1, right) + 1)
+        ]
+
+    def _stream(self, x, y):
+        """Demande les blocs autour de la caméra et dans la direction du déplacement"""
+        self._collect()
+        heading = (0, 0)
+        if self._last_view is not None:
+            heading = ((x > self._last_view[0]) - (x < self._last_view[0]),
+                       (y > self._last_view[1]) - (y < self._last_view[1]))
+        self._last_view = (x, y)
+
+        wanted = self._chunks_around(x, y)
+        if heading != (0, 0):
+            wanted += [key for key in self._chunks_around(x, y, *heading) if key not in wanted]
+
+        with self._lock:
+            for key in wanted:
+                if key not in self._chunks and key not in self._pending:
+                    self._pending[key] = self._executor.submit(self._build_chunk, key)
+        self._keep = set(wanted)
+        self._evict(self._keep)
+
+    def _evict(self, keep):
+        """Évince les blocs les moins récemment utilisés au-delà du budget mémoire"""
+        with self._lock:
+            for key in list(self._chunks):
+                if self.bytes_used <= self.budget_bytes:
+                    break
+                if key in keep:
+                    continue
+                chunk = self._chunks.pop(key)
+                self.bytes_used -= chunk.bytes
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "loaded": len(self._chunks),
+                "pending": len(self._pending),
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "bytes": self.bytes_used,
+                "budget": self.budget_bytes
+            }
+
+    # --- Caméra et rendu (même interface que TiledMap) ---
+
+    def _center_view(self, x, y):
+        self._stream(x, y)
+
+    def render(self, screen):
+        """Dessine les blocs visibles ; un bloc encore absent est construit immédiatement"""
+        x = self.view_x if self.view_x is not None else self.camera_x
+        y = self.view_y if self.view_y is not None else self.camera_y
+        self.camera.dirty = False
+        self._collect()
+
+        left, top = int(x // self.chunk_width_px), int(y // self.chunk_height_px)
+        right = int((x + self.screen_width - 1) // self.chunk_width_px)
+        bottom = int((y + self.screen_height - 1) // self.chunk_height_px)
+        for cy in range(max(0, top), min(self.chunks_y - 1, bottom) + 1):
+            for cx in range(max(0, left), min(self.chunks_x - 1, right) + 1):
+                chunk = self._get_chunk((cx, cy))
+                if not chunk.converted and pygame.display.get_surface() is not None:
+                    chunk.surface = chunk.surface.convert()
+                    chunk.converted = True
+                screen.blit(chunk.surface, (round(cx * self.chunk_width_px - x),
+                                            round(cy * self.chunk_height_px - y)))
+
+    def close(self):
+        self._executor.shutdown(wait=False)
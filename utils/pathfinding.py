@@ -0,0 +1,314 @@
+import collections
+import heapq
+from array import array
+
+from utils import settings
+
+# Déplacements sur la grille (4 directions, comme le joueur)
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+class Pathfinder:
+    """
+    Recherche de chemin sur la grille de tuiles d'une carte (TiledMap, StreamingTiledMap
+    ou Map) : A* 4 directions, avec recherche par points de saut (JPS) en option.
+    La carte fournit width, height, version, is_tile_walkable(x, y) et changes_since(version).
+
+    Les chemins sont mis en cache par (départ, arrivée, version de la carte). Quand des tuiles
+    changent, seuls les chemins concernés sont retirés : ceux qui traversent une tuile modifiée
+    et ceux qu'une tuile libérée pourrait raccourcir ; les autres passent à la nouvelle version.
+    """
+
+    def __init__(self, grid, jump_points=None, cache_size=None):
+        self.grid = grid
+        self.jump_points = settings.PATH_JUMP_POINTS if jump_points is None else jump_points
+        self.cache_size = settings.PATH_CACHE_SIZE if cache_size is None else cache_size
+        self.version = grid.version
+        self._cache = collections.OrderedDict()  # (départ, arrivée, version) -> chemin ou None, ordre LRU
+        self._columns = {}  # (x, dy) -> arrêts des sauts verticaux de la colonne (JPS)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def walkable(self, x, y):
+        return 0 <= x < self.grid.width and 0 <= y < self.grid.height and self.grid.is_tile_walkable(x, y)
+
+    # --- Cache ---
+
+    def _sync(self):
+        """Reporte les modifications de la carte sur le cache (invalidation incrémentale)"""
+        version = self.grid.version
+        if version == self.version:
+            return
+        changed = set(self.grid.changes_since(self.version))
+        # Une case modifiée change les arrêts de sa colonne et des deux colonnes voisines
+        for x, _ in changed:
+            for column_x in (x - 1, x, x + 1):
+                self._columns.pop((column_x, 1), None)
+                self._columns.pop((column_x, -1), None)
+        cache = collections.OrderedDict()
+        for (start, goal, _), path in self._cache.items():
+            if self._still_valid(start, goal, path, changed):
+                cache[(start, goal, version)] = path
+            else:
+                self.invalidations += 1
+        self._cache = cache
+        self.version = version
+
+    @staticmethod
+    def _still_valid(start, goal, path, changed):
+        if not changed:
+            return True
+        if path is None:
+            # Une tuile libérée peut ouvrir un passage
+            return False
+        length = len(path) - 1
+        for tile in changed:
+            # Tuile bloquée sur le chemin, ou tuile libérée par laquelle un chemin plus court passerait
+            if manhattan(start, tile) + manhattan(tile, goal) < length:
+                return False
+        return not changed.intersection(path)
+
+    def _remember(self, start, goal, path):
+        self._cache[(start, goal, self.version)] = path
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _cached(self, start, goal):
+        key = (start, goal, self.version)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return True, self._cache[key]
+        self.misses += 1
+        return False, None
+
+    # --- Recherche ---
+
+    def find_path(self, start, goal):
+        """
+        Chemin le plus court de la tuile 'start' à la tuile 'goal' : liste de tuiles (x, y)
+        départ et arrivée comprises, ou None si l'arrivée est inaccessible.
+        """
+        start, goal = tuple(start), tuple(goal)
+        self._sync()
+        found, path = self._cached(start, goal)
+        if found:
+            return path
+        return self._search(start, goal)
+
+    def _search(self, start, goal):
+        """Calcule le chemin (sans consulter le cache) et le met en cache"""
+        if not self.walkable(*start) or not self.walkable(*goal):
+            path = None
+        elif start == goal:
+            path = [start]
+        elif self.jump_points:
+            path = self._jps(start, goal)
+        else:
+            path = self._astar(start, goal)
+        self._remember(start, goal, path)
+        return path
+
+    def find_paths(self, requests):
+        """
+        Chemins de plusieurs agents pour une même image : [(départ, arrivée), ...] -> [chemin, ...].
+        Les demandes identiques ne sont calculées qu'une fois ; quand au moins PATH_FIELD_MIN_AGENTS
+        agents visent la même arrivée, un seul parcours en largeur depuis l'arrivée les sert tous.
+        """
+        self._sync()
+        requests = [(tuple(start), tuple(goal)) for start, goal in requests]
+        results = {}
+        by_goal = collections.defaultdict(list)
+        for start, goal in set(requests):
+            found, path = self._cached(start, goal)
+            if found:
+                results[(start, goal)] = path
+            else:
+                by_goal[goal].append(start)
+
+        for goal, starts in by_goal.items():
+            if len(starts) >= settings.PATH_FIELD_MIN_AGENTS and self.walkable(*goal):
+                distances = self._distance_field(goal)
+                for start in starts:
+                    path = self._descend(start, distances)
+                    self._remember(start, goal, path)
+                    results[(start, goal)] = path
+            else:
+                for start in starts:
+                    results[(start, goal)] = self._search(start, goal)
+
+        return [results[request] for request in requests]
+
+    def _astar(self, start, goal):
+        # À f égal, la case la plus proche de l'arrivée d'abord (beaucoup moins d'expansions en terrain dégagé)
+        open_heap = [(manhattan(start, goal), manhattan(start, goal), 0, start)]
+        g_score = {start: 0}
+        came_from = {}
+        while open_heap:
+            _, _, g, node = heapq.heappop(open_heap)
+            if node == goal:
+                return self._rebuild(came_from, goal)
+            if g > g_score[node]:
+                continue
+            x, y = node
+            for dx, dy in DIRECTIONS:
+                neighbor = (x + dx, y + dy)
+                cost = g + 1
+                if cost < g_score.get(neighbor, cost + 1) and self.walkable(*neighbor):
+                    g_score[neighbor] = cost
+                    came_from[neighbor] = node
+                    h = manhattan(neighbor, goal)
+                    heapq.heappush(open_heap, (cost + h, h, cost, neighbor))
+        return None
+
+    # --- Points de saut (JPS 4 directions) ---
+    # Ordre canonique : déplacements horizontaux d'abord. Un saut horizontal lance deux sauts
+    # verticaux à chaque case ; un saut vertical ne s'arrête que sur l'arrivée ou sur une case
+    # dont un voisin horizontal est libre alors que la case en diagonale arrière est bloquée.
+    # Les arrêts des sauts verticaux sont précalculés par colonne (à la demande), ce qui rend
+    # chaque saut vertical constant : un saut horizontal coûte une lecture par case traversée.
+
+    def _forced(self, x, y, dy):
+        walkable = self.walkable
+        return (walkable(x - 1, y) and not walkable(x - 1, y - dy)) or \
+            (walkable(x + 1, y) and not walkable(x + 1, y - dy))
+
+    def _column(self, x, dy):
+        """
+        Arrêts des sauts verticaux dans la colonne x : pour chaque ligne y, la première case
+        après y qui est un point de saut (c) ou un obstacle (~c, saut sans issue).
+        """
+        column = self._columns.get((x, dy))
+        if column is None:
+            height = self.grid.height
+            column = array("i", bytes(4 * height))
+            rows = range(height - 1, -1, -1) if dy > 0 else range(height)
+            for y in rows:
+                c = y + dy
+                if not self.walkable(x, c):
+                    column[y] = ~c
+                elif self._forced(x, c, dy):
+                    column[y] = c
+                else:
+                    column[y] = column[c]
+            self._columns[(x, dy)] = column
+        return column
+
+    def _jump_vertical(self, x, y, dy, goal):
+        stop = self._column(x, dy)[y]
+        if goal[0] == x:
+            # Arrivée atteinte avant l'arrêt (un obstacle arrête juste avant sa case)
+            end = stop if stop >= 0 else ~stop - dy
+            if 0 < (goal[1] - y) * dy <= (end - y) * dy:
+                return goal
+        return (x, stop) if stop >= 0 else None
+
+    def _jump_horizontal(self, x, y, dx, goal):
+        while True:
+            x += dx
+            if not self.walkable(x, y):
+                return None
+            if (x, y) == goal:
+                return x, y
+            if self._jump_vertical(x, y, 1, goal) or self._jump_vertical(x, y, -1, goal):
+                return x, y
+
+    def _successor_directions(self, node, direction):
+        if direction is None:
+            return DIRECTIONS
+        dx, dy = direction
+        if dy == 0:
+            return ((dx, 0), (0, 1), (0, -1))
+        x, y = node
+        directions = [(0, dy)]
+        for side in (-1, 1):
+            if self.walkable(x + side, y) and not self.walkable(x + side, y - dy):
+                directions.append((side, 0))
+        return directions
+
+    def _jps(self, start, goal):
+        open_heap = [(manhattan(start, goal), manhattan(start, goal), 0, start, None)]
+        g_score = {start: 0}
+        came_from = {}
+        while open_heap:
+            _, _, g, node, direction = heapq.heappop(open_heap)
+            if node == goal:
+                return self._rebuild(came_from, goal)
+            if g > g_score[node]:
+                continue
+            for dx, dy in self._successor_directions(node, direction):
+                if dy == 0:
+                    jump = self._jump_horizontal(node[0], node[1], dx, goal)
+                else:
+                    jump = self._jump_vertical(node[0], node[1], dy, goal)
+                if jump is None:
+                    continue
+                cost = g + manhattan(node, jump)
+                if cost < g_score.get(jump, cost + 1):
+                    g_score[jump] = cost
+                    came_from[jump] = node
+                    h = manhattan(jump, goal)
+                    heapq.heappush(open_heap, (cost + h, h, cost, jump, (dx, dy)))
+        return None
+
+    @staticmethod
+    def _rebuild(came_from, goal):
+        """Reconstitue le chemin case par case (les sauts sont des segments droits)"""
+        points = [goal]
+        while points[-1] in came_from:
+            points.append(came_from[points[-1]])
+        points.reverse()
+        path = [points[0]]
+        for x1, y1 in points[1:]:
+            x0, y0 = path[-1]
+            step_x = (x1 > x0) - (x1 < x0)
+            step_y = (y1 > y0) - (y1 < y0)
+            for _ in range(abs(x1 - x0) + abs(y1 - y0)):
+                x0, y0 = x0 + step_x, y0 + step_y
+                path.append((x0, y0))
+        return path
+
+    # --- Champ de distances (lots d'agents vers une même arrivée) ---
+
+    def _distance_field(self, goal):
+        distances = {goal: 0}
+        queue = collections.deque([goal])
+        while queue:
+            x, y = node = queue.popleft()
+            distance = distances[node] + 1
+            for dx, dy in DIRECTIONS:
+                neighbor = (x + dx, y + dy)
+                if neighbor not in distances and self.walkable(*neighbor):
+                    distances[neighbor] = distance
+                    queue.append(neighbor)
+        return distances
+
+    @staticmethod
+    def _descend(start, distances):
+        if start not in distances:
+            return None
+        path = [start]
+        x, y = start
+        while distances[(x, y)]:
+            for dx, dy in DIRECTIONS:
+                if distances.get((x + dx, y + dy)) == distances[(x, y)] - 1:
+                    x, y = x + dx, y + dy
+                    break
+            path.append((x, y))
+        return path
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "invalidations": self.invalidations,
+            "entries": len(self._cache),
+            "version": self.version
+        }
@@ -1,21 +1,32 @@
-import requests
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import settings
+from utils.http_client import get_client
+from utils.species_cache import SpeciesCache
 
 API_URL = "https://pokeapi.co/api/v2/pokemon/"
 
 
-def fetch_pokemon(pokemon_name):
-    """Récupère les données et les sprites d'un Pokémon depuis PokéAPI."""
-    
-    url = f"{API_URL}{pokemon_name.lower()}"
-    response = requests.get(url)
+# Cache des espèces (LRU mémoire + SQLite) et résultats complets déjà prêts
+_species_cache = SpeciesCache()
+_ready = {}
+_offline = settings.OFFLINE_MODE
 
-    if response.status_code != 200:
-        print(f"❌ Erreur : Pokémon {pokemon_name} non trouvé sur PokéAPI.")
-        return None
 
-    data = response.json()
-    pokemon = {
+def set_offline(enabled):
+    """Active ou désactive le mode hors ligne (aucune requête réseau)"""
+    global _offline
+    _offline = enabled
+
+
+def is_offline():
+    return _offline
+
+
+def _parse_species(data):
+    """Extrait les champs utiles de la réponse PokéAPI"""
+    return {
         "name": data["name"].capitalize(),
         "hp": data["stats"][0]["base_stat"],
         "attack": data["stats"][1]["base_stat"],
@@ -24,6 +35,71 @@ def fetch_pokemon(pokemon_name):
         "sprite_back": data["sprites"]["back_default"]  # ✅ Sprite de dos (Pokémon du joueur)
     }
 
+
+def fetch_species(pokemon_name):
+    """
+    Récupère les données d'une espèce : cache mémoire, puis cache disque,
+    puis PokéAPI (avec revalidation ETag / Last-Modified si l'entrée a expiré).
+    """
+    name = pokemon_name.lower()
+    entry = _species_cache.get(name)
+
+    if entry is not None and (_offline or _species_cache.is_fresh(entry)):
+        return entry[0]
+
+    if _offline:
+        print(f"📴 Mode hors ligne : {pokemon_name} absent du cache.")
+        return None
+
+    headers = {}
+    if entry is not None:
+        if entry[1]:
+            headers["If-None-Match"] = entry[1]
+        if entry[2]:
+            headers["If-Modified-Since"] = entry[2]
+
+    import requests  # Import local : chargé avec le client HTTP, pas au démarrage
+
+    try:
+        response = get_client().get(f"{API_URL}{name}", headers=headers)
+    except requests.RequestException as e:
+        if entry is not None:
+            print(f"⚠️ PokéAPI injoignable, données en cache utilisées pour {pokemon_name}.")
+            return entry[0]
+        print(f"❌ Erreur réseau pour {pokemon_name}: {e}")
+        return None
+
+    if response.status_code == 304 and entry is not None:
+        return _species_cache.touch(name)[0]
+
+    if response.status_code != 200:
+        if entry is not None:
+            return entry[0]
+        print(f"❌ Erreur : Pokémon {pokemon_name} non trouvé sur PokéAPI.")
+        return None
+
+    species = _parse_species(response.json())
+    _species_cache.put(
+        name, species,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified")
+    )
+    return species
+
+
+def fetch_pokemon(pokemon_name):
+    """Récupère les données et les sprites d'un Pokémon (via le cache local si possible)."""
+    
+    name = pokemon_name.lower()
+    if name in _ready:
+        return dict(_ready[name])
+
+    species = fetch_species(name)
+    if species is None:
+        return None
+
+    pokemon = dict(species)
+
     if not pokemon["sprite_front"]:
         print(f"⚠️ Aucun sprite de face trouvé pour {pokemon_name}.")
         return None
@@ -39,30 +115,29 @@ def fetch_pokemon(pokemon_name):
     front_sprite_path = f"{sprite_dir}/{pokemon['name'].lower()}_front.png"
     back_sprite_path = f"{sprite_dir}/{pokemon['name'].lower()}_back.png"
 
-    # ✅ Télécharger le sprite de face (Pokémon sauvage)
-    if pokemon["sprite_front"] and not os.path.exists(front_sprite_path):
-        sprite_response = requests.get(pokemon["sprite_front"])
-        if sprite_response.status_code == 200:
-            with open(front_sprite_path, "wb") as file:
-                file.write(sprite_response.content)
-            print(f"✅ Sprite de face de {pokemon['name']} téléchargé !")
+    # ✅ Télécharger en parallèle les sprites manquants (face : sauvage, dos : joueur)
+    downloads = []
+    if not _offline:
+        if pokemon["sprite_front"] and not os.path.exists(front_sprite_path):
+            downloads.append(("face", pokemon["sprite_front"], front_sprite_path))
+        if pokemon["sprite_back"] and not os.path.exists(back_sprite_path):
+            downloads.append(("dos", pokemon["sprite_back"], back_sprite_path))
+
+    results = get_client().download_many([(url, path) for _, url, path in downloads])
+    for (side, _, _), success in zip(downloads, results):
+        if success:
+            print(f"✅ Sprite de {side} de {pokemon['name']} téléchargé !")
         else:
-            print(f"❌ Erreur lors du téléchargement du sprite de face de {pokemon['name']}.")
-
-    # ✅ Télécharger le sprite de dos (Pokémon du joueur)
-    if pokemon["sprite_back"] and not os.path.exists(back_sprite_path):
-        sprite_response = requests.get(pokemon["sprite_back"])
-        if sprite_response.status_code == 200:
-            with open(back_sprite_path, "wb") as file:
-                file.write(sprite_response.content)
-            print(f"✅ Sprite de dos de {pokemon['name']} téléchargé !")
-        else:
-            print(f"❌ Erreur lors du téléchargement du sprite de dos de {pokemon['name']}.")
+            print(f"❌ Erreur lors du téléchargement du sprite de {side} de {pokemon['name']}.")
 
     # ✅ Ajouter les chemins aux données du Pokémon
     pokemon["sprite_path_front"] = front_sprite_path
     pokemon["sprite_path_back"] = back_sprite_path
 
+    # Les rencontres suivantes se résument à une recherche dans un dictionnaire
+    if os.path.exists(front_sprite_path):
+        _ready[name] = dict(pokemon)
+
     return pokemon
 
 
@@ -74,13 +149,11 @@ def fetch_trainer_sprite(trainer_name):
     sprite_path = f"assets/sprites/{trainer_name.lower()}.png"
 
     if not os.path.exists(sprite_path):
-        if not os.path.exists("assets/sprites"):
-            os.makedirs("assets/sprites")
+        if _offline:
+            print(f"📴 Mode hors ligne : sprite de {trainer_name} indisponible.")
+            return None
 
-        response = requests.get(sprite_url)
-        if response.status_code == 200:
-            with open(sprite_path, "wb") as file:
-                file.write(response.content)
+        if get_client().download(sprite_url, sprite_path):
             print(f"✅ Sprite du dresseur {trainer_name} téléchargé avec succès !")
         else:
             print(f"❌ Erreur : impossible de télécharger le sprite de {trainer_name}.")
@@ -88,3 +161,14 @@ def fetch_trainer_sprite(trainer_name):
 
     return sprite_path
 
+
+def fetch_many(pokemon_names):
+    """
+    Récupère plusieurs Pokémon en un seul lot parallèle (préchauffage d'une équipe
+    ou d'une zone au démarrage). Retourne un dictionnaire nom -> données (ou None).
+    """
+    names = [name.lower() for name in pokemon_names]
+    # Pool dédié : les téléchargements de sprites utilisent déjà celui du client HTTP
+    with ThreadPoolExecutor(max_workers=settings.HTTP_MAX_PARALLEL, thread_name_prefix="pokeapi") as executor:
+        results = list(executor.map(fetch_pokemon, names))
+    return dict(zip(names, results))
@@ -0,0 +1,272 @@
+import collections
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+from models.pokemon import COLUMNS, Pokemon
+
+# Format binaire des sauvegardes (petit-boutiste) :
+#   en-tête  <4s H>  magie, version du format
+#   carte    chaîne (identifiant de la carte : chemin TMX ou "grid")
+#   joueur   chaîne nom, <i i> position
+#   équipe   <B> nombre, puis par Pokémon : chaîne nom, <i i i i H> PV, PV max, attaque,
+#            défense, niveau, chaînes sprite de face et de dos ("" = aucun)
+#   objets   <H> nombre, puis par objet : chaîne nom, <i> quantité
+#   PC       (version 2) <H> nombre d'espèces, puis par espèce : chaînes nom, sprite de face et
+#            de dos, <i i i> statistiques de base ; <I> nombre d'emplacements, puis les colonnes
+#            brutes du stockage dans l'ordre de models.pokemon.COLUMNS
+#   contrôle <I> CRC32 de tout ce qui précède
+# Une chaîne est codée <H> longueur puis UTF-8.
+MAGIC = b"PKSV"
+FORMAT_VERSION = 2
+READABLE_VERSIONS = (1, 2)
+HEADER = struct.Struct("<4sH")
+POSITION = struct.Struct("<ii")
+STATS = struct.Struct("<iiiiH")
+COUNT_PARTY = struct.Struct("<B")
+COUNT_ITEMS = struct.Struct("<H")
+QUANTITY = struct.Struct("<i")
+LENGTH = struct.Struct("<H")
+COUNT_SPECIES = struct.Struct("<H")
+BASE_STATS = struct.Struct("<iii")
+COUNT_SLOTS = struct.Struct("<I")
+COLUMN_SIZES = tuple(array(typecode).itemsize for _, typecode in COLUMNS)
+CHECKSUM = struct.Struct("<I")
+
+# Instantanés immuables : pris sur le thread principal, écrits par le thread de sauvegarde
+PokemonRecord = collections.namedtuple(
+    "PokemonRecord", "name hp max_hp attack defense level sprite_path sprite_path_back")
+# box : (clés des espèces, colonnes brutes) tel que retourné par PCBox.export
+GameSnapshot = collections.namedtuple("GameSnapshot", "map_id player_name position party inventory box",
+                                      defaults=(((), ()),))
+
+
+def take_snapshot(player, inventory, map_id):
+    """Copie des données de jeu à sauvegarder (quelques tuples : sans coût pour la boucle de jeu)"""
+    party = tuple(
+        PokemonRecord(p.name, p.hp, p.max_hp, p.attack, p.defense, p.level,
+                      p.sprite_path, p.sprite_path_back)
+        for p in player.pokemons
+    )
+    x, y = player.position
+    return GameSnapshot(map_id, player.name, (int(round(x)), int(round(y))), party,
+                        tuple(inventory.items.items()), player.box.export())
+
+
+def apply_snapshot(snapshot, player, inventory, restore_position=True):
+    """Restaure le joueur, l'équipe et l'inventaire (sans aucune requête PokéAPI)"""
+    player.name = snapshot.player_name
+    if restore_position:
+        player.position = snapshot.position
+    party = []
+    for record in snapshot.party:
+        pokemon = Pokemon(
+            name=record.name,
+            hp=record.hp,
+            max_hp=record.max_hp,
+            attack=record.attack,
+            defense=record.defense,
+            sprite_path=record.sprite_path,
+            sprite_path_back=record.sprite_path_back,
+            level=record.level
+        )
+        party.append(pokemon)
+    player.pokemons = party
+    player.box.restore(*snapshot.box)
+    inventory.items = dict(snapshot.inventory)
+
+
+def _pack_string(parts, text):
+    data = (text or "").encode("utf-8")
+    parts.append(LENGTH.pack(len(data)))
+    parts.append(data)
+
+
+def encode(snapshot):
+    """Sérialise un instantané dans le format binaire des sauvegardes"""
+    parts = [HEADER.pack(MAGIC, FORMAT_VERSION)]
+    _pack_string(parts, snapshot.map_id)
+    _pack_string(parts, snapshot.player_name)
+    parts.append(POSITION.pack(*snapshot.position))
+
+    parts.append(COUNT_PARTY.pack(len(snapshot.party)))
+    for record in snapshot.party:
+        _pack_string(parts, record.name)
+        parts.append(STATS.pack(record.hp, record.max_hp, record.attack, record.defense, record.level))
+        _pack_string(parts, record.sprite_path)
+        _pack_string(parts, record.sprite_path_back)
+
+    parts.append(COUNT_ITEMS.pack(len(snapshot.inventory)))
+    for name, quantity in snapshot.inventory:
+        _pack_string(parts, name)
+        parts.append(QUANTITY.pack(quantity))
+
+    species_keys, columns = snapshot.box
+    parts.append(COUNT_SPECIES.pack(len(species_keys)))
+    for name, sprite_path, sprite_path_back, base_hp, base_attack, base_defense in species_keys:
+        _pack_string(parts, name)
+        _pack_string(parts, sprite_path)
+        _pack_string(parts, sprite_path_back)
+        parts.append(BASE_STATS.pack(base_hp, base_attack, base_defense))
+    parts.append(COUNT_SLOTS.pack(len(columns[0]) // COLUMN_SIZES[0] if columns else 0))
+    parts.extend(columns)
+
+    data = b"".join(parts)
+    return data + CHECKSUM.pack(zlib.crc32(data))
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, layout):
+        values = layout.unpack_from(self.data, self.offset)
+        self.offset += layout.size
+        return values
+
+    def string(self):
+        (length,) = self.unpack(LENGTH)
+        if self.offset + length > len(self.data):
+            raise ValueError("Chaîne tronquée")
+        return self.raw(length).decode("utf-8")
+
+    def raw(self, length):
+        if self.offset + length > len(self.data):
+            raise ValueError("Données tronquées")
+        data = bytes(self.data[self.offset:self.offset + length])
+        self.offset += length
+        return data
+
+
+def decode(data):
+    """Relit une sauvegarde ; ValueError si elle est tronquée, corrompue ou d'une autre version"""
+    if len(data) < HEADER.size + CHECKSUM.size:
+        raise ValueError("Sauvegarde tronquée")
+    body = memoryview(data)[:-CHECKSUM.size]
+    (checksum,) = CHECKSUM.unpack_from(data, len(data) - CHECKSUM.size)
+    if zlib.crc32(body) != checksum:
+        raise ValueError("Sauvegarde corrompue (somme de contrôle)")
+
+    reader = _Reader(body)
+    magic, version = reader.unpack(HEADER)
+    if magic != MAGIC or version not in READABLE_VERSIONS:
+        raise ValueError(f"Format de sauvegarde non pris en charge (version {version})")
+    try:
+        map_id = reader.string()
+        player_name = reader.string()
+        position = reader.unpack(POSITION)
+
+        party = []
+        (count,) = reader.unpack(COUNT_PARTY)
+        for _ in range(count):
+            name = reader.string()
+            hp, max_hp, attack, defense, level = reader.unpack(STATS)
+            sprite_path = reader.string()
+            sprite_path_back = reader.string() or None
+            party.append(PokemonRecord(name, hp, max_hp, attack, defense, level, sprite_path, sprite_path_back))
+
+        inventory = []
+        (count,) = reader.unpack(COUNT_ITEMS)
+        for _ in range(count):
+            name = reader.string()
+            (quantity,) = reader.unpack(QUANTITY)
+            inventory.append((name, quantity))
+
+        box = ((), ())
+        if version >= 2:
+            species_keys = []
+            (count,) = reader.unpack(COUNT_SPECIES)
+            for _ in range(count):
+                name = reader.string()
+                sprite_path = reader.string() or None
+                sprite_path_back = reader.string() or None
+                species_keys.append((name, sprite_path, sprite_path_back) + reader.unpack(BASE_STATS))
+            (slots,) = reader.unpack(COUNT_SLOTS)
+            columns = tuple(reader.raw(slots * size) for size in COLUMN_SIZES)
+            box = (tuple(species_keys), columns)
+    except struct.error as e:
+        raise ValueError(f"Sauvegarde tronquée: {e}")
+
+    return GameSnapshot(map_id, player_name, position, tuple(party), tuple(inventory), box)
+
+
+def write_save(path, snapshot):
+    """Écriture atomique : fichier temporaire dans le même dossier puis renommage"""
+    data = encode(snapshot)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".save-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return len(data)
+
+
+def read_save(path):
+    """Instantané sauvegardé, ou None (absent ou illisible)"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as file:
+            return decode(file.read())
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Sauvegarde ignorée {path}: {e}")
+        return None
+
+
+class Autosaver:
+    """
+    Sauvegarde en arrière-plan : la boucle de jeu ne fait que déposer un instantané.
+    Un seul thread écrit ; si plusieurs instantanés arrivent pendant une écriture,
+    seul le plus récent est écrit ensuite. Un instantané identique au dernier écrit est ignoré.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+        self._lock = threading.Lock()
+        self._pending = None
+        self._running = False
+        self._last = None
+        self.saves = 0
+
+    def submit(self, snapshot):
+        with self._lock:
+            if snapshot == self._last and not self._running:
+                return
+            self._pending = snapshot
+            if self._running:
+                return
+            self._running = True
+        self._executor.submit(self._drain)
+
+    def _drain(self):
+        while True:
+            with self._lock:
+                snapshot, self._pending = self._pending, None
+                if snapshot is None or snapshot == self._last:
+                    self._running = False
+                    return
+            try:
+                write_save(self.path, snapshot)
+                self.saves += 1
+            except OSError as e:
+                print(f"❌ Sauvegarde impossible ({self.path}): {e}")
+            with self._lock:
+                self._last = snapshot
+
+    def shutdown(self):
+        """Attend la fin de l'écriture en cours (et du dernier instantané déposé)"""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,82 @@
+import os
+
+# Dossier des caches locaux (données PokéAPI, ressources précalculées...)
+CACHE_DIR = os.environ.get("POKEMON_CACHE_DIR", "cache")
+
+# Durée de validité des données d'espèces en cache avant revalidation (secondes)
+SPECIES_CACHE_TTL = 7 * 24 * 3600
+
+# Nombre d'espèces gardées en mémoire (LRU devant le cache disque)
+SPECIES_LRU_SIZE = 128
+
+# Mode hors ligne : aucune requête réseau, uniquement le cache local
+OFFLINE_MODE = os.environ.get("POKEMON_OFFLINE", "") not in ("", "0")
+
+# Client HTTP : délais (connexion, lecture) en secondes, nouvelles tentatives, parallélisme
+HTTP_TIMEOUT = (3.05, 10)
+HTTP_RETRIES = 2
+HTTP_BACKOFF = 0.3
+HTTP_MAX_PARALLEL = 4
+
+# Budget mémoire du cache de surfaces décodées (octets)
+SURFACE_CACHE_BUDGET = 32 * 1024 * 1024
+
+# Rendu par rectangles sales (POKEMON_DIRTY_RECTS=0 pour toujours redessiner tout l'écran)
+DIRTY_RECT_RENDERING = os.environ.get("POKEMON_DIRTY_RECTS", "1") != "0"
+
+# Nombre de textes rendus gardés en cache (HUD, étiquettes)
+TEXT_CACHE_SIZE = 256
+
+# Simulation à pas fixe : nombre de pas par seconde (déplacement, rencontres, animations)
+SIMULATION_RATE = 60
+
+# Temps réel maximal pris en compte par image (évite la spirale de rattrapage après un blocage)
+MAX_FRAME_TIME = 0.25
+
+# Fréquence d'affichage visée (POKEMON_FPS=30 sur du matériel modeste)
+TARGET_FPS = int(os.environ.get("POKEMON_FPS", "60"))
+
+# Caméra : zone morte (fraction de l'écran depuis chaque bord) et amorti du défilement
+# par pas de simulation (POKEMON_CAMERA_EASING=1 pour suivre le joueur sans amorti)
+CAMERA_MARGIN = 0.25
+CAMERA_EASING = float(os.environ.get("POKEMON_CAMERA_EASING", "0.25"))
+
+# Probabilité de rencontre par pas dans une zone sans propriété 'encounter_rate'
+ENCOUNTER_RATE = 0.03
+
+# Cartes par blocs : "auto" (à partir de MAP_STREAMING_MIN_TILES tuiles), "1" toujours, "0" jamais
+MAP_STREAMING = os.environ.get("POKEMON_MAP_STREAMING", "auto")
+MAP_STREAMING_MIN_TILES = 128 * 128
+MAP_CHUNK_SIZE = 16                     # Côté d'un bloc en tuiles
+MAP_CHUNK_RADIUS = 1                    # Blocs chargés au-delà de l'écran
+MAP_CHUNK_BUDGET = 64 * 1024 * 1024     # Mémoire maximale des blocs chargés
+
+# Index spatial des objets de carte : côté d'une cellule en tuiles
+OBJECT_INDEX_CELL = 4
+
+# Recherche de chemin : points de saut (JPS), chemins en cache, agents par arrivée pour un champ de distances
+PATH_JUMP_POINTS = True
+PATH_CACHE_SIZE = 256
+PATH_FIELD_MIN_AGENTS = 4
+
+# Utiliser les cartes compilées (.pkmap, voir compile_map.py) quand elles sont à jour
+COMPILED_MAPS = os.environ.get("POKEMON_COMPILED_MAPS", "1") != "0"
+
+# Lire les tuiles dans l'atlas dédoublonné d'un jeu de tuiles quand il existe (voir extract_tiles.py)
+TILE_ATLAS = os.environ.get("POKEMON_TILE_ATLAS", "1") != "0"
+
+# Paquet de sprites pré-mis à l'échelle (voir build_assets.py), lu par mmap à la place des PNG
+ASSET_PACK_PATH = os.path.join("assets", "sprites.pkpack")
+ASSET_PACK = os.environ.get("POKEMON_ASSET_PACK", "1") != "0"
+
+# Carte Tiled chargée au démarrage (POKEMON_MAP pour une carte optimisée, voir optimize_tileset.py)
+MAP_PATH = os.environ.get("POKEMON_MAP", "assets/maps/pokemon_map.tmx")
+
+# Sauvegarde : fichier, reprise au lancement (POKEMON_NEW_GAME=1 pour repartir de zéro)
+# et intervalle de la sauvegarde automatique en secondes (0 pour la désactiver)
+SAVE_PATH = os.environ.get("POKEMON_SAVE", os.path.join("saves", "save.pksv"))
+RESUME_SAVE = os.environ.get("POKEMON_NEW_GAME", "0") != "1"
+AUTOSAVE_INTERVAL = float(os.environ.get("POKEMON_AUTOSAVE", "30"))
+
+# Chronologie du démarrage : "1" l'affiche à la première image, un chemin l'exporte en JSON
+STARTUP_PROFILE = os.environ.get("POKEMON_STARTUP_PROFILE", "")
@@ -0,0 +1,148 @@
+import math
+
+import pygame
+
+
+class SpatialHash:
+    """
+    Index spatial en grille uniforme : chaque élément (objet de carte, entité) est rangé
+    dans les cellules que couvre son rectangle. Une requête ne parcourt que les cellules
+    touchées, quel que soit le nombre d'éléments sur la carte.
+    """
+
+    def __init__(self, cell_size):
+        if cell_size <= 0:
+            raise ValueError("La taille des cellules doit être positive")
+        self.cell_size = int(cell_size)
+        self._cells = {}   # (cx, cy) -> set d'éléments
+        self._rects = {}   # élément -> pygame.Rect
+        self._spans = {}   # élément -> cellules couvertes (cx0, cy0, cx1, cy1)
+        self._order = {}   # élément -> rang d'insertion (résultats dans un ordre stable)
+        self._counter = 0
+
+    @staticmethod
+    def _rect(rect):
+        """Copie du rectangle ; un point ou un segment occupe au moins un pixel"""
+        rect = pygame.Rect(rect)
+        rect.width = max(1, rect.width)
+        rect.height = max(1, rect.height)
+        return rect
+
+    def _span(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size, (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def _add_cells(self, item, span):
+        cx0, cy0, cx1, cy1 = span
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                self._cells.setdefault((cx, cy), set()).add(item)
+
+    def _remove_cells(self, item, span):
+        cx0, cy0, cx1, cy1 = span
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                cell = self._cells.get((cx, cy))
+                if cell is not None:
+                    cell.discard(item)
+                    if not cell:
+                        del self._cells[(cx, cy)]
+
+    def insert(self, item, rect):
+        """Ajoute un élément (ou le déplace s'il est déjà indexé)"""
+        if item in self._rects:
+            self.move(item, rect)
+            return
+        rect = self._rect(rect)
+        span = self._span(rect)
+        self._rects[item] = rect
+        self._spans[item] = span
+        self._order[item] = self._counter
+        self._counter += 1
+        self._add_cells(item, span)
+
+    def move(self, item, rect):
+        """Met à jour la position d'un élément : seules les cellules quittées ou gagnées changent"""
+        rect = self._rect(rect)
+        span = self._span(rect)
+        self._rects[item] = rect
+        old = self._spans[item]
+        if span == old:
+            return
+        self._remove_cells(item, old)
+        self._add_cells(item, span)
+        self._spans[item] = span
+
+    def remove(self, item):
+        span = self._spans.pop(item, None)
+        if span is None:
+            return
+        self._remove_cells(item, span)
+        del self._rects[item]
+        del self._order[item]
+
+    def rect(self, item):
+        return self._rects[item]
+
+    def __contains__(self, item):
+        return item in self._rects
+
+    def __len__(self):
+        return len(self._rects)
+
+    def __iter__(self):
+        return iter(sorted(self._rects, key=self._order.__getitem__))
+
+    def _candidates(self, span):
+        cx0, cy0, cx1, cy1 = span
+        if cx0 == cx1 and cy0 == cy1:
+            return self._cells.get((cx0, cy0), ())
+        found = set()
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                cell = self._cells.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        return found
+
+    def _sorted(self, items):
+        if len(items) > 1:
+            items.sort(key=self._order.__getitem__)
+        return items
+
+    def query_rect(self, rect):
+        """Éléments dont le rectangle chevauche 'rect'"""
+        rect = self._rect(rect)
+        return self._sorted([item for item in self._candidates(self._span(rect))
+                             if self._rects[item].colliderect(rect)])
+
+    def query_point(self, x, y):
+        """Éléments dont le rectangle contient le point (x, y) (une seule cellule lue)"""
+        size = self.cell_size
+        cell = self._cells.get((int(x // size), int(y // size)))
+        if not cell:
+            return []
+        return self._sorted([item for item in cell if self._rects[item].collidepoint(x, y)])
+
+    def query_radius(self, x, y, radius):
+        """Éléments dont le rectangle est à moins de 'radius' pixels du point (x, y)"""
+        left, top = math.floor(x - radius), math.floor(y - radius)
+        bounds = pygame.Rect(left, top, math.ceil(x + radius) - left + 1, math.ceil(y + radius) - top + 1)
+        found = []
+        for item in self._candidates(self._span(bounds)):
+            rect = self._rects[item]
+            # Distance du point au rectangle (nulle si le point est dedans)
+            dx = max(rect.left - x, 0, x - (rect.right - 1))
+            dy = max(rect.top - y, 0, y - (rect.bottom - 1))
+            if dx * dx + dy * dy <= radius * radius:
+                found.append(item)
+        return self._sorted(found)
+
+    def stats(self):
+        sizes = [len(cell) for cell in self._cells.values()]
+        return {
+            "items": len(self._rects),
+            "cells": len(self._cells),
+            "max_per_cell": max(sizes, default=0),
+            "cell_size": self.cell_size
+        }
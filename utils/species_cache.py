@@ -0,0 +1,113 @@
+import collections
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from utils import settings
+
+
+class SpeciesCache:
+    """
+    Cache des données d'espèces PokéAPI : LRU en mémoire devant une base SQLite.
+    Chaque entrée garde l'ETag et le Last-Modified pour la revalidation HTTP.
+    """
+
+    def __init__(self, path=None, ttl=None, lru_size=None):
+        self.path = path or os.path.join(settings.CACHE_DIR, "species.sqlite")
+        self.ttl = settings.SPECIES_CACHE_TTL if ttl is None else ttl
+        self.lru_size = settings.SPECIES_LRU_SIZE if lru_size is None else lru_size
+
+        # nom -> (données, etag, last_modified, fetched_at)
+        self._lru = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _connect(self):
+        """Ouvre la base à la première utilisation"""
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS species ("
+                " name TEXT PRIMARY KEY,"
+                " data TEXT NOT NULL,"
+                " etag TEXT,"
+                " last_modified TEXT,"
+                " fetched_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        return self._db
+
+    def _remember(self, name, entry):
+        self._lru[name] = entry
+        self._lru.move_to_end(name)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def get(self, name):
+        """Retourne l'entrée (données, etag, last_modified, fetched_at) ou None"""
+        name = name.lower()
+        with self._lock:
+            entry = self._lru.get(name)
+            if entry is not None:
+                self._lru.move_to_end(name)
+                return entry
+
+            try:
+                row = self._connect().execute(
+                    "SELECT data, etag, last_modified, fetched_at FROM species WHERE name = ?",
+                    (name,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"⚠️ Cache d'espèces illisible: {e}")
+                return None
+
+            if row is None:
+                return None
+
+            entry = (json.loads(row[0]), row[1], row[2], row[3])
+            self._remember(name, entry)
+            return entry
+
+    def is_fresh(self, entry):
+        """Vérifie si une entrée est encore valide sans revalidation"""
+        return time.time() - entry[3] < self.ttl
+
+    def put(self, name, data, etag=None, last_modified=None):
+        """Enregistre (ou remplace) les données d'une espèce"""
+        name = name.lower()
+        entry = (data, etag, last_modified, time.time())
+        with self._lock:
+            self._remember(name, entry)
+            try:
+                db = self._connect()
+                db.execute(
+                    "INSERT OR REPLACE INTO species (name, data, etag, last_modified, fetched_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (name, json.dumps(data), etag, last_modified, entry[3])
+                )
+                db.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Impossible d'écrire dans le cache d'espèces: {e}")
+        return entry
+
+    def touch(self, name):
+        """Prolonge la validité d'une entrée (réponse 304 Not Modified)"""
+        entry = self.get(name)
+        if entry is None:
+            return None
+        return self.put(name, entry[0], entry[1], entry[2])
+
+    def clear_memory(self):
+        with self._lock:
+            self._lru.clear()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,94 @@
+import contextlib
+import json
+import threading
+import time
+
+# Origine de la chronologie : importer ce module en premier (main.py) pour couvrir les imports
+_ORIGIN = time.perf_counter()
+
+
+class StartupTimeline:
+    """
+    Chronologie du démarrage : durée de chaque phase d'initialisation (imports, écran,
+    carte, sprites, équipe...) et repères ponctuels, dont le temps jusqu'à la première image.
+    Les phases peuvent se chevaucher (tâches lancées en arrière-plan).
+    """
+
+    def __init__(self, origin=None):
+        self.origin = _ORIGIN if origin is None else origin
+        self.phases = []  # {"name", "start_ms", "duration_ms", "thread"}
+        self.marks = {}   # nom -> millisecondes depuis l'origine
+        self._open = {}
+        self._lock = threading.Lock()
+
+    def _now(self):
+        return (time.perf_counter() - self.origin) * 1000
+
+    def begin(self, name):
+        """Début d'une phase (terminée par end, éventuellement depuis un autre thread)"""
+        with self._lock:
+            self._open[name] = self._now()
+
+    def end(self, name):
+        now = self._now()
+        with self._lock:
+            start = self._open.pop(name, None)
+            if start is not None:
+                self.phases.append({
+                    "name": name,
+                    "start_ms": round(start, 2),
+                    "duration_ms": round(now - start, 2),
+                    "thread": threading.current_thread().name
+                })
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def mark(self, name):
+        """Repère ponctuel ; seul le premier passage est retenu"""
+        with self._lock:
+            if name not in self.marks:
+                self.marks[name] = round(self._now(), 2)
+                return True
+            return False
+
+    @property
+    def time_to_first_frame(self):
+        return self.marks.get("first_frame")
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "time_to_first_frame_ms": self.marks.get("first_frame"),
+                "phases": sorted(self.phases, key=lambda phase: phase["start_ms"]),
+                "marks": dict(self.marks),
+                "pending": sorted(self._open)
+            }
+
+    def report(self):
+        """Affiche la chronologie (une ligne par phase, barre proportionnelle à la durée)"""
+        data = self.as_dict()
+        total = max([p["start_ms"] + p["duration_ms"] for p in data["phases"]] +
+                    list(data["marks"].values()) + [1.0])
+        print("⏱️ Chronologie du démarrage")
+        for phase in data["phases"]:
+            offset = int(phase["start_ms"] / total * 40)
+            width = max(1, int(phase["duration_ms"] / total * 40))
+            bar = " " * offset + "█" * width
+            print(f"   {phase['name']:<12} {phase['start_ms']:>8.1f} ms +{phase['duration_ms']:>8.1f} ms  |{bar:<41}|")
+        for name in data["pending"]:
+            print(f"   {name:<12} (en cours)")
+        for name, value in data["marks"].items():
+            print(f"   ▶ {name:<10} {value:>8.1f} ms")
+
+    def export(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.as_dict(), file, indent=2)
+
+
+timeline = StartupTimeline()
@@ -0,0 +1,121 @@
+import collections
+import threading
+
+import pygame
+
+from utils import settings
+
+# Modes de conversion
+ALPHA = "alpha"    # convert_alpha() : format de l'écran avec transparence
+OPAQUE = "opaque"  # convert() : format de l'écran sans transparence
+RAW = "raw"        # surface décodée telle quelle (utilisable hors du thread principal)
+
+
+def _surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+class SurfaceCache:
+    """
+    Cache LRU des surfaces décodées, indexé par (chemin, taille cible, mode de conversion).
+    Un même PNG n'est jamais décodé ni redimensionné deux fois tant qu'il tient dans le budget.
+    """
+
+    def __init__(self, budget_bytes=None):
+        self.budget_bytes = settings.SURFACE_CACHE_BUDGET if budget_bytes is None else budget_bytes
+        self._entries = collections.OrderedDict()  # clé -> surface
+        self._lock = threading.RLock()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path, size=None, mode=ALPHA):
+        """Retourne la surface de l'image 'path', redimensionnée à 'size' et convertie selon 'mode'"""
+        key = (path, tuple(size) if size is not None else None, mode)
+        with self._lock:
+            surface = self._entries.get(key)
+            if surface is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return surface
+            self.misses += 1
+
+        surface = self._build(path, key[1], mode)
+        self.put(key, surface)
+        return surface
+
+    def _build(self, path, size, mode):
+        # Réutiliser une version brute déjà décodée (ex: préparée par un thread de fond)
+        with self._lock:
+            raw = self._entries.get((path, size, RAW))
+
+        if raw is None and size is not None:
+            # Sprite pré-mis à l'échelle dans le paquet projeté en mémoire : ni décodage ni redimensionnement
+            from utils.asset_pack import get_asset_pack
+            pack = get_asset_pack()
+            if pack is not None:
+                raw = pack.surface(path, size)
+
+        if raw is None:
+            if size is not None:
+                raw = pygame.transform.scale(self.get(path, None, RAW), size)
+            else:
+                raw = pygame.image.load(path)
+
+        if mode == RAW or pygame.display.get_surface() is None:
+            return raw
+        if mode == OPAQUE:
+            return raw.convert()
+        return raw.convert_alpha()
+
+    def put(self, key, surface):
+        """Ajoute une surface et évince les plus anciennes au-delà du budget"""
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes_used -= _surface_bytes(previous)
+            self._entries[key] = surface
+            self.bytes_used += _surface_bytes(surface)
+
+            while self.bytes_used > self.budget_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes_used -= _surface_bytes(evicted)
+                self.evictions += 1
+
+    def stats(self):
+        """Statistiques du cache (succès, échecs, évictions, octets utilisés)"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.bytes_used,
+                "budget": self.budget_bytes
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes_used = 0
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_surface_cache():
+    """Cache de surfaces partagé par tout le processus"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SurfaceCache()
+        return _cache
+
+
+def load_surface(path, size=None, mode=ALPHA):
+    """Raccourci : charge une image via le cache partagé"""
+    return get_surface_cache().get(path, size, mode)
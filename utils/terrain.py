@@ -0,0 +1,165 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Drapeaux de terrain (un octet par tuile)
+SOLID = 0x01       # Obstacle (bâtiment, arbre...)
+WALKABLE = 0x02    # Praticable (déjà résolu : jamais posé en même temps que SOLID)
+TALL_GRASS = 0x04  # Hautes herbes (rencontres Pokémon)
+WATER = 0x08       # Eau
+
+# GID Tiled considérés comme praticables par défaut (tuiles de sol connues)
+DEFAULT_WALKABLE_GIDS = (2954, 2955, 3094, 3095, 5, 2)
+
+# Propriété de carte : false si les GID ont été renumérotés (voir utils/tileset_optimizer.py)
+DEFAULT_WALKABLE_PROPERTY = "default_walkable"
+
+# Valeurs de la propriété 'type' reconnues sur les calques et les tuiles
+GRASS_TYPES = ("haute_herbe",)
+WATER_TYPES = ("water", "eau")
+SOLID_TYPES = ("solid", "obstacle", "mur")
+
+# Nom historique du calque des hautes herbes
+GRASS_LAYER_NAME = "hautes_herbes"
+
+
+class TerrainGrid:
+    """Grille compacte de drapeaux de terrain : une requête = une lecture de tableau"""
+
+    def __init__(self, width, height, cells=None):
+        self.width = width
+        self.height = height
+        self.cells = bytearray(cells) if cells is not None else bytearray(width * height)
+        if len(self.cells) != width * height:
+            raise ValueError(f"Taille de grille invalide: {len(self.cells)} != {width}x{height}")
+
+        # Vue NumPy partageant la même mémoire (aucune copie) pour les requêtes groupées
+        self.array = None
+        if np is not None:
+            self.array = np.frombuffer(self.cells, dtype=np.uint8).reshape(height, width)
+
+    def flags_at(self, tile_x, tile_y):
+        """Retourne les drapeaux de la tuile (0 hors de la carte)"""
+        if 0 <= tile_x < self.width and 0 <= tile_y < self.height:
+            return self.cells[tile_y * self.width + tile_x]
+        return 0
+
+    def set_flags(self, tile_x, tile_y, flags):
+        """Remplace les drapeaux d'une tuile"""
+        self.cells[tile_y * self.width + tile_x] = flags
+
+    def add_flags(self, tile_x, tile_y, flags):
+        """Ajoute des drapeaux à une tuile"""
+        self.cells[tile_y * self.width + tile_x] |= flags
+
+    def has(self, tile_x, tile_y, flag):
+        """Vérifie si la tuile possède le drapeau donné"""
+        return bool(self.flags_at(tile_x, tile_y) & flag)
+
+    def is_walkable(self, tile_x, tile_y):
+        return bool(self.flags_at(tile_x, tile_y) & WALKABLE)
+
+    def is_grass(self, tile_x, tile_y):
+        return bool(self.flags_at(tile_x, tile_y) & TALL_GRASS)
+
+    def resolve(self):
+        """Retire WALKABLE des tuiles SOLID pour que chaque requête reste une seule lecture"""
+        if self.array is not None:
+            solid = (self.array & SOLID) != 0
+            self.array[solid] &= ~WALKABLE & 0xFF
+        else:
+            for i, value in enumerate(self.cells):
+                if value & SOLID:
+                    self.cells[i] = value & ~WALKABLE & 0xFF
+
+    def query_many(self, tile_xs, tile_ys, flag=WALKABLE, tile_size=None):
+        """
+        Requête vectorisée : retourne pour chaque couple (x, y) si le drapeau est présent.
+        Si tile_size=(largeur, hauteur) est fourni, les coordonnées sont en pixels.
+        Les coordonnées hors de la carte donnent False.
+        """
+        if self.array is not None:
+            xs = np.asarray(tile_xs)
+            ys = np.asarray(tile_ys)
+            if tile_size is not None:
+                xs = np.floor_divide(xs, tile_size[0])
+                ys = np.floor_divide(ys, tile_size[1])
+            xs = xs.astype(np.intp)
+            ys = ys.astype(np.intp)
+            inside = (xs >= 0) & (ys >= 0) & (xs < self.width) & (ys < self.height)
+            result = np.zeros(xs.shape, dtype=bool)
+            result[inside] = (self.array[ys[inside], xs[inside]] & flag) != 0
+            return result
+
+        if tile_size is not None:
+            tile_xs = [int(x // tile_size[0]) for x in tile_xs]
+            tile_ys = [int(y // tile_size[1]) for y in tile_ys]
+        return [bool(self.flags_at(x, y) & flag) for x, y in zip(tile_xs, tile_ys)]
+
+
+def _flags_from_properties(properties):
+    """Convertit des propriétés Tiled ('walkable', 'type') en drapeaux"""
+    flags = 0
+    if not properties:
+        return flags
+
+    walkable = properties.get("walkable")
+    if walkable is True:
+        flags |= WALKABLE
+    elif walkable is False:
+        flags |= SOLID
+
+    tile_type = properties.get("type")
+    if tile_type in GRASS_TYPES:
+        flags |= TALL_GRASS | WALKABLE
+    elif tile_type in WATER_TYPES:
+        flags |= WATER | SOLID
+    elif tile_type in SOLID_TYPES:
+        flags |= SOLID
+
+    return flags
+
+
+def build_terrain_grid(tmx_data):
+    """
+    Construit la grille de terrain d'une carte pytmx à partir des propriétés
+    des calques et des propriétés par GID du jeu de tuiles (.tsx)
+    """
+    grid = TerrainGrid(tmx_data.width, tmx_data.height)
+    map_properties = getattr(tmx_data, "properties", {}) or {}
+    default_walkable = set(DEFAULT_WALKABLE_GIDS) if map_properties.get(DEFAULT_WALKABLE_PROPERTY, True) else set()
+
+    # Drapeaux par GID pytmx, calculés une seule fois
+    gid_flags = {}
+
+    def flags_for_gid(gid):
+        if gid not in gid_flags:
+            flags = _flags_from_properties(tmx_data.get_tile_properties_by_gid(gid))
+            if tmx_data.tiledgidmap.get(gid, gid) in default_walkable:
+                flags |= WALKABLE
+            gid_flags[gid] = flags
+        return gid_flags[gid]
+
+    for layer in tmx_data.visible_layers:
+        if not hasattr(layer, "data"):
+            continue
+
+        properties = getattr(layer, "properties", {}) or {}
+        layer_flags = _flags_from_properties(properties)
+        if getattr(layer, "name", None) == GRASS_LAYER_NAME:
+            layer_flags |= TALL_GRASS | WALKABLE
+
+        # Un calque explicitement praticable l'est sur toute sa surface
+        # (comportement historique de is_walkable pour le calque de sol)
+        if properties.get("walkable") is True:
+            for i in range(len(grid.cells)):
+                grid.cells[i] |= WALKABLE
+
+        for tile_y, row in enumerate(layer.data):
+            for tile_x, gid in enumerate(row):
+                if gid:
+                    grid.add_flags(tile_x, tile_y, layer_flags | flags_for_gid(gid))
+
+    grid.resolve()
+    return grid
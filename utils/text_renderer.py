@@ -0,0 +1,126 @@
+import collections
+
+import pygame
+
+from utils import settings
+
+# Caractères pré-rendus dans les atlas de glyphes (champs numériques du HUD)
+DEFAULT_CHARSET = "0123456789-+/.,:()% "
+
+
+class GlyphAtlas:
+    """
+    Atlas de glyphes pour les champs qui changent à chaque image (FPS, position, HP) :
+    les caractères sont rendus une fois dans une seule surface, puis composés par blits.
+    """
+
+    def __init__(self, font, color, charset=DEFAULT_CHARSET):
+        self.font = font
+        self.color = color
+        self.height = font.get_linesize()
+        self.surface = None
+        self.glyphs = {}  # caractère -> rectangle dans l'atlas
+        self._build(charset)
+
+    def _build(self, charset):
+        """(Re)construit l'atlas pour le jeu de caractères donné"""
+        chars = "".join(sorted(set(charset) | set(self.glyphs)))
+        rendered = [(char, self.font.render(char, True, self.color)) for char in chars]
+
+        width = sum(surface.get_width() for _, surface in rendered) or 1
+        self.surface = pygame.Surface((width, self.height), pygame.SRCALPHA)
+        self.glyphs = {}
+        x = 0
+        for char, surface in rendered:
+            self.surface.blit(surface, (x, 0))
+            self.glyphs[char] = pygame.Rect(x, 0, surface.get_width(), self.height)
+            x += surface.get_width()
+
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+
+    def _ensure(self, text):
+        missing = [char for char in text if char not in self.glyphs]
+        if missing:
+            self._build("".join(missing))
+
+    def size(self, text):
+        """Taille (largeur, hauteur) du texte composé"""
+        self._ensure(text)
+        return sum(self.glyphs[char].width for char in text), self.height
+
+    def draw(self, target, text, position):
+        """Compose le texte sur la surface cible ; retourne le rectangle modifié"""
+        self._ensure(text)
+        x, y = position
+        blits = []
+        for char in text:
+            area = self.glyphs[char]
+            blits.append((self.surface, (x, y), area))
+            x += area.width
+        target.blits(blits, doreturn=False)
+        return pygame.Rect(position[0], y, x - position[0], self.height)
+
+
+class TextRenderer:
+    """
+    Service de rendu de texte partagé par les vues : cache LRU des textes rendus,
+    indexé par (texte, police, couleur), et atlas de glyphes pour les champs numériques.
+    """
+
+    def __init__(self, capacity=None):
+        self.capacity = settings.TEXT_CACHE_SIZE if capacity is None else capacity
+        self._fonts = {}
+        self._atlases = {}
+        self._cache = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size=24, name=None):
+        """Police partagée (une seule instance par nom et taille)"""
+        key = (name, size)
+        if key not in self._fonts:
+            self._fonts[key] = pygame.font.Font(name, size)
+        return self._fonts[key]
+
+    def render(self, text, size=24, color=(255, 255, 255), name=None):
+        """Retourne la surface du texte, rendue une seule fois tant qu'elle reste en cache"""
+        key = (text, name, size, tuple(color))
+        surface = self._cache.get(key)
+        if surface is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.font(size, name).render(text, True, color)
+        self._cache[key] = surface
+        if len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+        return surface
+
+    def atlas(self, size=24, color=(255, 255, 255), name=None):
+        """Atlas de glyphes pour une police et une couleur"""
+        key = (name, size, tuple(color))
+        if key not in self._atlases:
+            self._atlases[key] = GlyphAtlas(self.font(size, name), color)
+        return self._atlases[key]
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._cache),
+            "atlases": len(self._atlases)
+        }
+
+
+_renderer = None
+
+
+def get_text_renderer():
+    """Service de texte partagé par toutes les vues"""
+    global _renderer
+    if _renderer is None:
+        _renderer = TextRenderer()
+    return _renderer
@@ -0,0 +1,270 @@
+import hashlib
+import json
+import math
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pygame
+
+from utils import settings
+
+# Index d'atlas (JSON) écrit à côté de l'image découpée :
+#   source, source_size, source_mtime   image d'origine (chemin relatif à l'index)
+#   source_hash                         empreinte BLAKE2 de son contenu (une copie ou un checkout change la date)
+#   tilewidth, tileheight, columns, rows  grille de découpe de l'image d'origine
+#   image, atlas_columns                atlas des tuiles uniques (chemin relatif à l'index)
+#   tiles                               pour chaque tuile d'origine (GID - firstgid), son rang dans l'atlas
+# Les tuiles identiques (même contenu RGBA) n'occupent qu'une place dans l'atlas.
+INDEX_VERSION = 1
+INDEX_SUFFIX = "_atlas.json"
+IMAGE_SUFFIX = "_atlas.png"
+
+
+def file_digest(path):
+    with open(path, "rb") as file:
+        return hashlib.blake2b(file.read(), digest_size=16).hexdigest()
+
+
+def atlas_index_path(image_path):
+    """Index d'atlas associé à une image de jeu de tuiles"""
+    return os.path.splitext(image_path)[0] + INDEX_SUFFIX
+
+
+# --- Découpe (processus de travail) ---
+
+_sheet = None
+
+
+def _load_sheet(path):
+    """Initialisation d'un processus de travail : l'image est décodée une seule fois par processus"""
+    global _sheet
+    _sheet = pygame.image.load(path)
+
+
+def _slice_rows(task):
+    """
+    Découpe les lignes [row_start, row_end) de l'image : empreinte de chaque tuile
+    et pixels RGBA des tuiles distinctes de la bande.
+    """
+    row_start, row_end, columns, tile_width, tile_height = task
+    digests = []
+    pixels = {}
+    for row in range(row_start, row_end):
+        for column in range(columns):
+            rect = (column * tile_width, row * tile_height, tile_width, tile_height)
+            data = pygame.image.tobytes(_sheet.subsurface(rect), "RGBA")
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            digests.append(digest)
+            pixels.setdefault(digest, data)
+    return digests, pixels
+
+
+def build_tile_atlas(sheet_path, tile_size, output_dir=None, workers=None):
+    """
+    Découpe une image de jeu de tuiles en parallèle, regroupe les tuiles distinctes
+    dans un seul atlas PNG et écrit l'index JSON. Retourne un rapport
+    {"index", "image", "tiles", "unique", "size"}.
+    """
+    output_dir = output_dir or os.path.dirname(sheet_path) or "."
+    tile_width = tile_height = tile_size
+    if not pygame.get_init():
+        pygame.init()
+    sheet_width, sheet_height = pygame.image.load(sheet_path).get_size()
+    columns, rows = sheet_width // tile_width, sheet_height // tile_height
+    if not columns or not rows:
+        raise ValueError(f"Image plus petite qu'une tuile ({sheet_width}x{sheet_height})")
+
+    # Bandes de lignes : quelques tâches par processus pour équilibrer la charge
+    workers = workers or os.cpu_count() or 1
+    band = max(1, math.ceil(rows / (workers * 4)))
+    tasks = [(start, min(start + band, rows), columns, tile_width, tile_height)
+             for start in range(0, rows, band)]
+
+    digests = []
+    pixels = {}
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_load_sheet, initargs=(sheet_path,)) as pool:
+            results = list(pool.map(_slice_rows, tasks))
+    else:
+        _load_sheet(sheet_path)
+        results = [_slice_rows(task) for task in tasks]
+    for band_digests, band_pixels in results:
+        digests.extend(band_digests)
+        for digest, data in band_pixels.items():
+            pixels.setdefault(digest, data)
+
+    # Rangs dans l'atlas dans l'ordre de première apparition
+    slots = {}
+    tiles = [slots.setdefault(digest, len(slots)) for digest in digests]
+    unique = [None] * len(slots)
+    for digest, slot in slots.items():
+        unique[slot] = pixels[digest]
+
+    # Atlas composé directement en octets RGBA, puis une seule surface
+    atlas_columns = max(1, math.ceil(math.sqrt(len(unique))))
+    atlas_rows = math.ceil(len(unique) / atlas_columns)
+    atlas_width = atlas_columns * tile_width
+    row_bytes = tile_width * 4
+    buffer = bytearray(atlas_width * atlas_rows * tile_height * 4)
+    for slot, data in enumerate(unique):
+        x = (slot % atlas_columns) * row_bytes
+        y = (slot // atlas_columns) * tile_height
+        for line in range(tile_height):
+            start = ((y + line) * atlas_width * 4) + x
+            buffer[start:start + row_bytes] = data[line * row_bytes:(line + 1) * row_bytes]
+    atlas = pygame.image.frombuffer(bytes(buffer), (atlas_width, atlas_rows * tile_height), "RGBA")
+
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(sheet_path))[0]
+    image_path = os.path.join(output_dir, stem + IMAGE_SUFFIX)
+    index_path = os.path.join(output_dir, stem + INDEX_SUFFIX)
+    pygame.image.save(atlas, image_path)
+
+    index = {
+        "version": INDEX_VERSION,
+        "source": os.path.relpath(os.path.abspath(sheet_path), os.path.abspath(output_dir)),
+        "source_size": [sheet_width, sheet_height],
+        "source_mtime": os.path.getmtime(sheet_path),
+        "source_hash": file_digest(sheet_path),
+        "tilewidth": tile_width,
+        "tileheight": tile_height,
+        "columns": columns,
+        "rows": rows,
+        "image": os.path.basename(image_path),
+        "atlas_columns": atlas_columns,
+        "tiles": tiles
+    }
+    fd, temp_path = tempfile.mkstemp(dir=output_dir, prefix=".atlas-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(index, file, separators=(",", ":"))
+        os.chmod(temp_path, 0o644)  # mkstemp crée en 0600 : l'index est livré avec le jeu de tuiles
+        os.replace(temp_path, index_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return {"index": index_path, "image": image_path, "tiles": len(tiles),
+            "unique": len(unique), "size": atlas.get_size()}
+
+
+# --- Lecture (chargeurs de cartes) ---
+
+class TileAtlas:
+    """Atlas des tuiles uniques d'une image de jeu de tuiles : rectangle d'origine -> rectangle dans l'atlas"""
+
+    def __init__(self, index_path):
+        with open(index_path, encoding="utf-8") as file:
+            index = json.load(file)
+        if index.get("version") != INDEX_VERSION:
+            raise ValueError(f"Version d'index d'atlas non prise en charge: {index_path}")
+        base = os.path.dirname(os.path.abspath(index_path))
+        self.source_path = os.path.normpath(os.path.join(base, index["source"]))
+        self.image_path = os.path.join(base, index["image"])
+        self.source_mtime = index["source_mtime"]
+        self.source_hash = index.get("source_hash")
+        self.tile_width = index["tilewidth"]
+        self.tile_height = index["tileheight"]
+        self.columns = index["columns"]
+        self.rows = index["rows"]
+        self.atlas_columns = index["atlas_columns"]
+        self.tiles = index["tiles"]
+        if len(self.tiles) != self.columns * self.rows:
+            raise ValueError(f"Index d'atlas incomplet: {index_path}")
+
+    def is_fresh(self):
+        """Vrai si l'image d'origine n'a pas changé depuis la création de l'atlas (ou n'est pas fournie)"""
+        if not os.path.exists(self.image_path):
+            return False
+        if not os.path.exists(self.source_path) or os.path.getmtime(self.source_path) <= self.source_mtime:
+            return True
+        # Date plus récente (checkout, copie...) : seul le contenu fait foi
+        return self.source_hash is not None and file_digest(self.source_path) == self.source_hash
+
+    def rect(self, tile_id):
+        """Rectangle dans l'atlas de la tuile d'origine 'tile_id' (GID - firstgid)"""
+        slot = self.tiles[tile_id]
+        return pygame.Rect((slot % self.atlas_columns) * self.tile_width,
+                           (slot // self.atlas_columns) * self.tile_height,
+                           self.tile_width, self.tile_height)
+
+    def locate(self, rect):
+        """Rectangle dans l'atlas d'un rectangle de l'image d'origine, ou None s'il ne suit pas la grille"""
+        x, y, width, height = rect
+        if (width, height) != (self.tile_width, self.tile_height) or x % width or y % height:
+            return None
+        column, row = x // width, y // height
+        if column >= self.columns or row >= self.rows:
+            return None
+        return self.rect(row * self.columns + column)
+
+
+_atlases = {}
+_atlases_lock = threading.Lock()
+
+
+def load_tile_atlas(image_path):
+    """Atlas à jour pour cette image de jeu de tuiles, ou None (absent, périmé, désactivé ou illisible)"""
+    if not settings.TILE_ATLAS:
+        return None
+    key = os.path.normpath(os.path.abspath(image_path))
+    with _atlases_lock:
+        if key not in _atlases:
+            atlas = None
+            index_path = atlas_index_path(key)
+            if os.path.exists(index_path):
+                try:
+                    atlas = TileAtlas(index_path)
+                    if not atlas.is_fresh():
+                        print(f"⚠️ Atlas de tuiles périmé ignoré: {index_path}")
+                        atlas = None
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"⚠️ Atlas de tuiles ignoré {index_path}: {e}")
+                    atlas = None
+            _atlases[key] = atlas
+        return _atlases[key]
+
+
+def locate_tile(path, rect):
+    """(image, rectangle) où lire une tuile : dans l'atlas s'il existe, sinon dans l'image d'origine"""
+    atlas = load_tile_atlas(path)
+    if atlas is not None:
+        atlas_rect = atlas.locate(rect)
+        if atlas_rect is not None:
+            return atlas.image_path, atlas_rect
+    return path, rect
+
+
+def atlas_image_loader(filename, colorkey, **kwargs):
+    """
+    Chargeur d'images pytmx : les tuiles sont lues dans l'atlas de l'image quand il existe
+    (seul l'atlas est décodé), sinon comme pytmx.util_pygame.pygame_image_loader.
+    """
+    from pytmx.util_pygame import handle_transformation, pygame_image_loader, smart_convert
+
+    atlas = load_tile_atlas(filename)
+    if atlas is None:
+        return pygame_image_loader(filename, colorkey, **kwargs)
+
+    if colorkey:
+        colorkey = pygame.Color(f"#{colorkey.lstrip('#')}")
+    pixelalpha = kwargs.get("pixelalpha", True)
+    image = pygame.image.load(atlas.image_path)
+    fallback = []  # Image d'origine, décodée seulement si une tuile sort de la grille de l'atlas
+
+    def load_image(rect=None, flags=None):
+        atlas_rect = atlas.locate(rect) if rect else None
+        if atlas_rect is not None:
+            tile = image.subsurface(atlas_rect)
+        else:
+            if not fallback:
+                fallback.append(pygame.image.load(filename))
+            tile = fallback[0].subsurface(rect) if rect else fallback[0].copy()
+        if flags:
+            tile = handle_transformation(tile, flags)
+        return smart_convert(tile, colorkey, pixelalpha)
+
+    return load_image
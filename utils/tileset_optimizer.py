@@ -0,0 +1,273 @@
+import base64
+import copy
+import gzip
+import math
+import os
+import struct
+import xml.etree.ElementTree as ET
+import zlib
+
+import pygame
+
+from utils.terrain import DEFAULT_WALKABLE_GIDS, DEFAULT_WALKABLE_PROPERTY
+
+# Bits de transformation des GID Tiled (retournements, rotation hexagonale)
+FLAG_MASK = 0xF0000000
+GID_MASK = 0x0FFFFFFF
+
+
+class SourceTileset:
+    """Jeu de tuiles d'origine (.tsx externe ou intégré à la carte)"""
+
+    def __init__(self, element, path, key=None):
+        self.path = path  # Fichier .tsx, ou TMX pour un jeu intégré
+        self.key = key or path  # Identifiant unique : le .tsx, ou "carte#firstgid" pour un jeu intégré
+        self.element = element
+        self.name = element.get("name", "tileset")
+        self.tile_width = int(element.get("tilewidth"))
+        self.tile_height = int(element.get("tileheight"))
+        self.spacing = int(element.get("spacing", 0))
+        self.margin = int(element.get("margin", 0))
+        self.columns = int(element.get("columns"))
+        image = element.find("image")
+        if image is None:
+            raise ValueError(f"Jeu de tuiles sans image unique non pris en charge: {self.name}")
+        self.image = image
+        self.image_path = os.path.normpath(os.path.join(os.path.dirname(path), image.get("source")))
+        self.tiles = {int(tile.get("id")): tile for tile in element.findall("tile")}
+
+        self.used = set()       # Identifiants locaux utilisés par au moins une carte
+        self.walkable = set()   # Identifiants locaux praticables par défaut (DEFAULT_WALKABLE_GIDS)
+        self.remap = {}         # Identifiant local d'origine -> identifiant dans l'atlas
+
+    def rect(self, local_id):
+        column, row = local_id % self.columns, local_id // self.columns
+        return pygame.Rect(self.margin + column * (self.tile_width + self.spacing),
+                           self.margin + row * (self.tile_height + self.spacing),
+                           self.tile_width, self.tile_height)
+
+    def use(self, local_id):
+        """Marque une tuile utilisée, ainsi que les images de son animation"""
+        if local_id in self.used:
+            return
+        self.used.add(local_id)
+        tile = self.tiles.get(local_id)
+        if tile is not None:
+            for frame in tile.iter("frame"):
+                self.use(int(frame.get("tileid")))
+
+
+def read_layer_gids(data):
+    """GID bruts (avec drapeaux) d'un élément <data> : CSV ou base64 (zlib/gzip)"""
+    if data.find("chunk") is not None:
+        raise ValueError("Les cartes infinies (blocs <chunk>) ne sont pas prises en charge")
+    encoding = data.get("encoding")
+    if encoding == "csv":
+        return [int(value) for value in data.text.replace("\n", "").split(",") if value.strip()]
+    if encoding == "base64":
+        raw = base64.b64decode(data.text.strip())
+        compression = data.get("compression")
+        if compression == "zlib":
+            raw = zlib.decompress(raw)
+        elif compression == "gzip":
+            raw = gzip.decompress(raw)
+        elif compression:
+            raise ValueError(f"Compression non prise en charge: {compression}")
+        return list(struct.unpack(f"<{len(raw) // 4}I", raw))
+    return [int(tile.get("gid", 0)) for tile in data.findall("tile")]
+
+
+class _MapFile:
+    """Carte TMX analysée : jeux de tuiles (firstgid croissants) et éléments à renuméroter"""
+
+    def __init__(self, path, tilesets):
+        self.path = path
+        self.root = ET.parse(path).getroot()
+        self.tilesets = []  # (firstgid, SourceTileset, élément <tileset> de la carte)
+        for element in self.root.findall("tileset"):
+            source = element.get("source")
+            if source:
+                tsx_path = os.path.normpath(os.path.join(os.path.dirname(path), source))
+                if tsx_path not in tilesets:
+                    tilesets[tsx_path] = SourceTileset(ET.parse(tsx_path).getroot(), tsx_path)
+                tileset = tilesets[tsx_path]
+            else:
+                key = f"{path}#{element.get('firstgid')}"
+                tilesets[key] = tileset = SourceTileset(element, path, key)
+            self.tilesets.append((int(element.get("firstgid")), tileset, element))
+        self.tilesets.sort(key=lambda entry: entry[0])
+        self.layers = [(data, read_layer_gids(data)) for data in self.root.iter("data")]
+        self.objects = [obj for obj in self.root.iter("object") if obj.get("gid")]
+
+    def resolve(self, gid):
+        """(jeu de tuiles, identifiant local) d'un GID sans drapeaux"""
+        for firstgid, tileset, _ in reversed(self.tilesets):
+            if gid >= firstgid:
+                return tileset, gid - firstgid
+        raise ValueError(f"GID {gid} hors de tout jeu de tuiles dans {self.path}")
+
+    def properties(self):
+        element = self.root.find("properties")
+        if element is None:
+            return {}
+        return {prop.get("name"): prop.get("value") for prop in element.findall("property")}
+
+    def gids(self):
+        for _, values in self.layers:
+            yield from values
+        for obj in self.objects:
+            yield int(obj.get("gid"))
+
+
+def _build_atlas(tileset, output_dir, name):
+    """Regroupe les tuiles utilisées dans une image compacte et écrit le .tsx 'name' correspondant"""
+    used = sorted(tileset.used)
+    tileset.remap = {old: new for new, old in enumerate(used)}
+    columns = max(1, math.ceil(math.sqrt(len(used))))
+    rows = max(1, math.ceil(len(used) / columns))
+
+    sheet = pygame.image.load(tileset.image_path)
+    has_alpha = sheet.get_flags() & pygame.SRCALPHA
+    size = (columns * tileset.tile_width, rows * tileset.tile_height)
+    atlas = pygame.Surface(size, pygame.SRCALPHA if has_alpha else 0, sheet)
+    atlas.fill((0, 0, 0, 0))
+    for new, old in enumerate(used):
+        position = ((new % columns) * tileset.tile_width, (new // columns) * tileset.tile_height)
+        # BLEND_RGBA_MAX sur un fond nul : copie exacte, transparence comprise
+        atlas.blit(sheet, position, tileset.rect(old), special_flags=pygame.BLEND_RGBA_MAX if has_alpha else 0)
+
+    image_path = os.path.join(output_dir, f"{name}.png")
+    pygame.image.save(atlas, image_path)
+
+    element = ET.Element("tileset", {
+        "version": tileset.element.get("version", "1.10"),
+        "name": name,
+        "tilewidth": str(tileset.tile_width),
+        "tileheight": str(tileset.tile_height),
+        "tilecount": str(len(used)),
+        "columns": str(columns)
+    })
+    image = ET.SubElement(element, "image", {"source": f"{name}.png", "width": str(size[0]), "height": str(size[1])})
+    if tileset.image.get("trans"):
+        image.set("trans", tileset.image.get("trans"))
+
+    for old in used:
+        tile = copy.deepcopy(tileset.tiles[old]) if old in tileset.tiles else ET.Element("tile")
+        tile.set("id", str(tileset.remap[old]))
+        for frame in tile.iter("frame"):
+            frame.set("tileid", str(tileset.remap[int(frame.get("tileid"))]))
+        if old in tileset.walkable:
+            properties = tile.find("properties")
+            if properties is None:
+                properties = ET.SubElement(tile, "properties")
+            if not any(p.get("name") == "walkable" for p in properties.findall("property")):
+                ET.SubElement(properties, "property", {"name": "walkable", "type": "bool", "value": "true"})
+        if len(tile) or tile.attrib.keys() - {"id"}:
+            element.append(tile)
+
+    tsx_path = os.path.join(output_dir, f"{name}.tsx")
+    ET.indent(element, space=" ")
+    ET.ElementTree(element).write(tsx_path, encoding="UTF-8", xml_declaration=True)
+    return tsx_path
+
+
+def _rewrite_map(map_file, atlases, output_dir):
+    """Écrit la carte avec les jeux de tuiles compacts et les GID renumérotés"""
+    root = map_file.root
+
+    # DEFAULT_WALKABLE_GIDS désignait des GID d'origine : reportés en propriétés de tuiles
+    properties = root.find("properties")
+    if properties is None:
+        properties = ET.Element("properties")
+        root.insert(0, properties)
+    for prop in properties.findall("property"):
+        if prop.get("name") == DEFAULT_WALKABLE_PROPERTY:
+            properties.remove(prop)
+    ET.SubElement(properties, "property", {"name": DEFAULT_WALKABLE_PROPERTY, "type": "bool", "value": "false"})
+
+    firstgids = {}
+    next_gid = 1
+    for _, tileset, element in map_file.tilesets:
+        root.remove(element)
+        # Un jeu sans tuile utilisée n'a pas d'atlas : il disparaît de la carte réécrite
+        if tileset.key in firstgids or tileset.key not in atlases:
+            continue
+        firstgids[tileset.key] = next_gid
+        next_gid += len(tileset.used)
+
+    # Les nouveaux jeux de tuiles remplacent les anciens, juste après les propriétés de la carte
+    start = list(root).index(properties) + 1
+    for index, (key, firstgid) in enumerate(firstgids.items()):
+        source = os.path.relpath(atlases[key], output_dir).replace(os.sep, "/")
+        root.insert(start + index, ET.Element("tileset", {"firstgid": str(firstgid), "source": source}))
+
+    def remap(raw):
+        gid = raw & GID_MASK
+        if gid == 0:
+            return raw
+        tileset, local_id = map_file.resolve(gid)
+        return firstgids[tileset.key] + tileset.remap[local_id] | (raw & FLAG_MASK)
+
+    for data, values in map_file.layers:
+        width = int(root.get("width"))
+        for key in ("encoding", "compression"):
+            data.attrib.pop(key, None)
+        data.set("encoding", "csv")
+        for child in list(data):
+            data.remove(child)
+        rows = [",".join(str(remap(v)) for v in values[i:i + width]) for i in range(0, len(values), width)]
+        data.text = "\n" + ",\n".join(rows) + "\n"
+    for obj in map_file.objects:
+        obj.set("gid", str(remap(int(obj.get("gid")))))
+
+    path = os.path.join(output_dir, os.path.basename(map_file.path))
+    ET.indent(root, space=" ")
+    ET.ElementTree(root).write(path, encoding="UTF-8", xml_declaration=True)
+    return path
+
+
+def optimize_tilesets(map_paths, output_dir):
+    """
+    Analyse toutes les cartes, regroupe les tuiles réellement utilisées de chaque jeu
+    dans un atlas compact et réécrit les cartes avec des GID renumérotés.
+    Retourne un rapport {"tilesets": [(nom, tuiles avant, tuiles après)], "maps": [chemins]}.
+    """
+    if not pygame.get_init():
+        pygame.init()
+    tilesets = {}
+    maps = [_MapFile(path, tilesets) for path in map_paths]
+
+    for map_file in maps:
+        for raw in map_file.gids():
+            gid = raw & GID_MASK
+            if gid:
+                tileset, local_id = map_file.resolve(gid)
+                tileset.use(local_id)
+        # Les GID praticables par défaut n'ont de sens que dans leur carte d'origine
+        if map_file.properties().get(DEFAULT_WALKABLE_PROPERTY) == "false":
+            continue
+        for gid in DEFAULT_WALKABLE_GIDS:
+            tileset, local_id = map_file.resolve(gid)
+            if local_id in tileset.used:
+                tileset.walkable.add(local_id)
+
+    tiles_dir = os.path.join(output_dir, "tiles")
+    maps_dir = os.path.join(output_dir, "maps")
+    os.makedirs(tiles_dir, exist_ok=True)
+    os.makedirs(maps_dir, exist_ok=True)
+
+    atlases = {}
+    names = set()
+    report = {"tilesets": [], "maps": []}
+    for key, tileset in tilesets.items():
+        if tileset.used:
+            # Deux jeux de même nom (intégrés à des cartes différentes...) : fichiers d'atlas distincts
+            name, suffix = f"{tileset.name}_atlas", 2
+            while name in names:
+                name, suffix = f"{tileset.name}_atlas_{suffix}", suffix + 1
+            names.add(name)
+            atlases[key] = _build_atlas(tileset, tiles_dir, name)
+            report["tilesets"].append((tileset.name, int(tileset.element.get("tilecount", 0)), len(tileset.used)))
+    for map_file in maps:
+        report["maps"].append(_rewrite_map(map_file, atlases, maps_dir))
+    return report
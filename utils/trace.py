@@ -0,0 +1,174 @@
+"""
+Traces structurées à coût quasi nul pour la boucle de jeu.
+
+Usage dans un chemin critique :
+
+    from utils import trace
+    if trace.on.camera:
+        trace.debug("camera", "Caméra déplacée - Position: (%s, %s)", x, y)
+
+Une catégorie désactivée ne coûte qu'une lecture d'attribut et un branchement.
+Les événements actifs sont ajoutés à un tampon circulaire en mémoire (le
+message n'est formaté qu'au vidage) et un thread d'arrière-plan les écrit
+par lots.
+"""
+import atexit
+import collections
+import os
+import sys
+import threading
+import time
+
+# Niveaux
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARN", ERROR: "ERROR"}
+
+# Catégories connues (sous-systèmes)
+CATEGORIES = ("map", "camera", "collision", "movement", "encounter", "objects", "combat", "render", "api")
+
+# Catégories activées par la touche D
+DEBUG_CATEGORIES = ("map", "camera", "collision", "movement", "encounter", "objects")
+
+# Taille du tampon circulaire et intervalle de vidage (secondes)
+BUFFER_SIZE = 4096
+FLUSH_INTERVAL = 0.25
+
+
+class _Switches:
+    """Interrupteurs par catégorie : trace.on.<catégorie> vaut True si elle est active"""
+
+    def __getattr__(self, name):
+        # Catégorie inconnue : désactivée
+        return False
+
+
+on = _Switches()
+for _category in CATEGORIES:
+    setattr(on, _category, False)
+
+# Niveau minimal par catégorie
+_levels = {}
+
+# Tampon circulaire (deque.append est atomique, pas besoin de verrou côté émetteur)
+_buffer = collections.deque(maxlen=BUFFER_SIZE)
+_output = sys.stdout
+_flusher = None
+_flush_lock = threading.Lock()
+_wake = threading.Event()
+_start_time = time.perf_counter()
+
+
+def enable(*categories, level=DEBUG):
+    """Active une ou plusieurs catégories à partir du niveau donné"""
+    for category in categories:
+        setattr(on, category, True)
+        _levels[category] = level
+    _ensure_flusher()
+
+
+def disable(*categories):
+    """Désactive une ou plusieurs catégories"""
+    for category in categories:
+        setattr(on, category, False)
+        _levels.pop(category, None)
+
+
+def set_enabled(categories, enabled, level=DEBUG):
+    """Active ou désactive un ensemble de catégories (utilisé par la touche D)"""
+    if enabled:
+        enable(*categories, level=level)
+    else:
+        disable(*categories)
+
+
+def enabled_categories():
+    return sorted(_levels)
+
+
+def set_output(stream):
+    """Redirige les traces vers un autre flux (fichier, sys.stderr...)"""
+    global _output
+    flush()
+    _output = stream
+
+
+def emit(level, category, message, *args):
+    """Enregistre un événement si la catégorie est active à ce niveau"""
+    if level >= _levels.get(category, ERROR + 1):
+        _buffer.append((time.perf_counter(), level, category, message, args))
+
+
+def debug(category, message, *args):
+    emit(DEBUG, category, message, *args)
+
+
+def info(category, message, *args):
+    emit(INFO, category, message, *args)
+
+
+def warning(category, message, *args):
+    emit(WARNING, category, message, *args)
+
+
+def error(category, message, *args):
+    emit(ERROR, category, message, *args)
+
+
+def _format(record):
+    timestamp, level, category, message, args = record
+    if args:
+        try:
+            message = message % args
+        except (TypeError, ValueError):
+            message = f"{message} {args}"
+    return f"[{timestamp - _start_time:9.3f}] {LEVEL_NAMES.get(level, level)} {category}: {message}\n"
+
+
+def flush():
+    """Vide le tampon vers la sortie en une seule écriture"""
+    with _flush_lock:
+        records = []
+        while _buffer:
+            try:
+                records.append(_buffer.popleft())
+            except IndexError:
+                break
+        if not records:
+            return
+        try:
+            _output.write("".join(_format(record) for record in records))
+            _output.flush()
+        except (OSError, ValueError):
+            # Flux fermé (fin du programme) : on abandonne les traces restantes
+            pass
+
+
+def _flush_loop():
+    while True:
+        _wake.wait(FLUSH_INTERVAL)
+        _wake.clear()
+        flush()
+
+
+def _ensure_flusher():
+    """Démarre le thread de vidage au premier besoin"""
+    global _flusher
+    if _flusher is None:
+        _flusher = threading.Thread(target=_flush_loop, name="trace-flusher", daemon=True)
+        _flusher.start()
+        atexit.register(flush)
+
+
+def configure_from_env(variable="POKEMON_TRACE"):
+    """Active les catégories listées dans une variable d'environnement (ex: POKEMON_TRACE=camera,map)"""
+    value = os.environ.get(variable, "")
+    categories = [c.strip() for c in value.split(",") if c.strip()]
+    if "all" in categories:
+        categories = list(CATEGORIES)
+    if categories:
+        enable(*categories)
+    return categories
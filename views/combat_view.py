@@ -1,20 +1,25 @@
 import pygame
+from utils.surface_cache import load_surface
+from utils.text_renderer import get_text_renderer
 
 class CombatView:
-    def __init__(self, controller, combat):
+    def __init__(self, controller, combat, player_sprite=None, wild_sprite=None):
         self.controller = controller
         self.combat = combat
         self.screen = controller.view.screen
-        self.font = pygame.font.Font(None, 24)
+        self.text = get_text_renderer()
+        self.font = self.text.font(24)
         
-        # ✅ Charger les sprites des Pokémon
-        self.player_pokemon_sprite = pygame.image.load(combat.player_pokemon.sprite_path_back if combat.player_pokemon.sprite_path_back else combat.player_pokemon.sprite_path).convert_alpha()
-
-        self.wild_pokemon_sprite = pygame.image.load(combat.wild_pokemon.sprite_path).convert_alpha()
+        # ✅ Sprites déjà préparés (service de rencontres) ou chargés ici
+        self.player_pokemon_sprite = player_sprite
+        self.wild_pokemon_sprite = wild_sprite
         
-        # ✅ Redimensionner les sprites
-        self.player_pokemon_sprite = pygame.transform.scale(self.player_pokemon_sprite, (100, 100))
-        self.wild_pokemon_sprite = pygame.transform.scale(self.wild_pokemon_sprite, (100, 100))
+        # (décodés et redimensionnés une seule fois grâce au cache partagé)
+        if self.player_pokemon_sprite is None:
+            self.player_pokemon_sprite = load_surface(combat.player_pokemon.sprite_path_back if combat.player_pokemon.sprite_path_back else combat.player_pokemon.sprite_path, (100, 100))
+
+        if self.wild_pokemon_sprite is None:
+            self.wild_pokemon_sprite = load_surface(combat.wild_pokemon.sprite_path, (100, 100))
 
         # ✅ Position des Pokémon
         self.player_pos = (50, 250)  # Mew en bas à gauche
@@ -26,7 +31,7 @@ class CombatView:
         self.animation_offset = 0
 
         # ✅ Création des boutons
-        self.button_font = pygame.font.Font(None, 30)
+        self.button_font = self.text.font(30)
         self.buttons = {
             "attack": pygame.Rect(50, 400, 120, 40),
             "capture": pygame.Rect(200, 400, 120, 40),
@@ -68,8 +73,8 @@ class CombatView:
 
         pygame.draw.rect(self.screen, (255, 0, 0), (position[0], position[1], max_bar_width, bar_height))  # Barre rouge
         pygame.draw.rect(self.screen, (0, 255, 0), (position[0], position[1], current_bar_width, bar_height))  # Barre verte
-        hp_text = self.font.render(f"{pokemon.hp}/{pokemon.max_hp}", True, (255, 255, 255))
-        self.screen.blit(hp_text, (position[0] + 40, position[1] - 15))
+        # HP composés depuis l'atlas de glyphes (aucun rendu de police par image)
+        self.text.atlas(24).draw(self.screen, f"{pokemon.hp}/{pokemon.max_hp}", (position[0] + 40, position[1] - 15))
 
     def draw_buttons(self):
         """ Affiche les boutons d'attaque, fuite et capture """
@@ -77,7 +82,7 @@ class CombatView:
             pygame.draw.rect(self.screen, (50, 50, 50), rect)
             pygame.draw.rect(self.screen, (255, 255, 255), rect, 2)
 
-            text = self.button_font.render(action.capitalize(), True, (255, 255, 255))
+            text = self.text.render(action.capitalize(), 30)
             text_rect = text.get_rect(center=rect.center)
             self.screen.blit(text, text_rect)
 
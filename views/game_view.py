@@ -1,9 +1,28 @@
+import math
 import pygame
 import random
+from utils import settings
+from utils.surface_cache import load_surface
+from utils.text_renderer import get_text_renderer
+
+
+def merge_rects(rects, bounds):
+    """Fusionne les rectangles qui se chevauchent (chaque pixel n'apparaît qu'une fois)"""
+    merged = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if rect.width == 0 or rect.height == 0:
+            continue
+        # Absorber tous les rectangles déjà fusionnés qui le touchent
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect = rect.union(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
 
 class GameView:
     def __init__(self, controller, tile_size):
-        pygame.init()
         self.controller = controller
         self.tile_size = tile_size
         
@@ -11,9 +30,11 @@ class GameView:
         self.screen_width = 800
         self.screen_height = 600
         
-        # Création de l'écran
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
-        pygame.display.set_caption("Pokémon Game")
+        # Écran déjà ouvert par le contrôleur au démarrage (sinon création)
+        self.screen = pygame.display.get_surface()
+        if self.screen is None or self.screen.get_size() != (self.screen_width, self.screen_height):
+            self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+            pygame.display.set_caption("Pokémon Game")
         
         # Charger les sprites du joueur
         self.sprites = self.load_player_sprites()
@@ -22,20 +43,36 @@ class GameView:
         if not self.controller.using_tiled:
             self.textures = self.create_textures()
         
-        # Variables d'animation
+        # Rendu par rectangles sales : seules les zones modifiées sont envoyées à l'écran
+        self.dirty_rendering = settings.DIRTY_RECT_RENDERING
+        self.background = None       # Carte seule, sans sprite ni texte
+        self.background_key = None   # État ayant produit ce fond
+        self.full_redraw = True      # L'image courante doit être envoyée en entier
+        self.dirty_rects = []        # Zones modifiées par la dernière image
+        self._previous_rects = []
+        self._items = []
+        self.frame_key = None        # État de la dernière image composée (réutilisation)
+        self.reused_frames = 0
+        
+        # Fond précalculé de la carte traditionnelle (construit au premier rendu)
+        self.map_background = None
+        self.map_background_version = -1
+        
+        # Variables d'animation (temps de simulation, en millisecondes)
         self.current_direction = "down"
         self.current_frame = 0
         self.animation_timer = 0
         self.animation_speed = 150
         self.is_moving = False
         
-        # Police pour les textes de débogage
-        self.font = pygame.font.Font(None, 24)
+        # Police et rendu de texte mis en cache (partagés entre les vues)
+        self.text = get_text_renderer()
+        self.font = self.text.font(24)
         
         # Variables pour l'effet des hautes herbes
         self.in_grass_effect = False
         self.grass_effect_timer = 0
-        self.grass_effect_duration = 15  # Durée de l'effet en frames
+        self.grass_effect_duration = 15  # Durée de l'effet en pas de simulation
         
         print(f"✅ Vue du jeu initialisée (mode {'Tiled' if self.controller.using_tiled else 'Traditionnel'})")
     
@@ -123,9 +160,8 @@ class GameView:
             sprites[direction] = []
             for path in paths:
                 try:
-                    sprite = pygame.image.load(path).convert_alpha()
-                    # Redimensionner au format carré
-                    sprite = pygame.transform.scale(sprite, (self.tile_size, self.tile_size))
+                    # Décodé et redimensionné au format carré via le cache partagé
+                    sprite = load_surface(path, (self.tile_size, self.tile_size))
                     sprites[direction].append(sprite)
                     print(f"✅ Sprite '{direction}' chargé: {path}")
                 except Exception as e:
@@ -134,37 +170,62 @@ class GameView:
         
         return sprites
     
-    def render(self):
-        """Affiche le jeu à l'écran"""
-        # Effacer l'écran avec un fond uni
-        self.screen.fill((0, 0, 0))  # Noir par défaut
-        
-        # Afficher la carte appropriée
-        if self.controller.using_tiled:
-            self._render_tiled_map()
-        else:
-            self._render_traditional_map()
-        
+    def tick(self, step_ms):
+        """Avance les minuteurs d'animation d'un pas de simulation"""
         # Gestion de l'animation du joueur
         if self.is_moving:
-            current_time = pygame.time.get_ticks()
-            if current_time - self.animation_timer > self.animation_speed:
-                self.animation_timer = current_time
+            self.animation_timer += step_ms
+            while self.animation_timer >= self.animation_speed:
+                self.animation_timer -= self.animation_speed
                 self.current_frame = (self.current_frame + 1) % len(self.sprites[self.current_direction])
         else:
             self.current_frame = 0
         
+        # Vérifier si le joueur est dans les hautes herbes
+        player_x, player_y = self.controller.player.position
+        is_in_grass = False
+        if self.controller.using_tiled:
+            is_in_grass = self.controller.map.is_grass(player_x, player_y)
+        else:
+            grid_x = player_x // self.tile_size
+            grid_y = player_y // self.tile_size
+            if 0 <= grid_x < self.controller.map.width and 0 <= grid_y < self.controller.map.height:
+                is_in_grass = self.controller.map.is_grass(grid_x, grid_y)
+        
+        # Effet visuel lorsque le joueur est dans les hautes herbes
+        if is_in_grass and self.is_moving:
+            # Activer l'effet
+            self.in_grass_effect = True
+            self.grass_effect_timer = self.grass_effect_duration
+        elif self.grass_effect_timer > 0:
+            # Diminuer le timer de l'effet
+            self.grass_effect_timer -= 1
+            if self.grass_effect_timer <= 0:
+                self.in_grass_effect = False
+    
+    def render(self, alpha=1.0):
+        """
+        Affiche le jeu à l'écran. 'alpha' (0 à 1) situe l'image entre le pas de
+        simulation précédent et le pas courant, pour interpoler les positions.
+        """
+        # Éléments dynamiques de l'image (sprite, effets, textes) : (rectangle, dessin)
+        self._items = []
+        
         # Obtenir le sprite actuel
         current_sprite = self.sprites[self.current_direction][self.current_frame]
         
+        # Image identique à la précédente (caméra et sprites immobiles) : rien à redessiner
+        if self._reuse_frame(current_sprite, alpha):
+            return
+        
         # Afficher le joueur
         if self.controller.using_tiled:
             # En mode Tiled avec une caméra style Pokémon
-            player_x, player_y = self.controller.player.position
+            player_x, player_y = self.controller.interpolated_position(alpha)
             
-            # Récupérer les coordonnées de la caméra
-            camera_x = self.controller.map.camera_x
-            camera_y = self.controller.map.camera_y
+            # Récupérer les coordonnées de la caméra (interpolées, arrondies au pixel par la carte)
+            self.controller.map.set_view(*self.controller.interpolated_camera(alpha))
+            camera_x, camera_y = self.controller.map.view_x, self.controller.map.view_y
             
             # Calculer la position du joueur à l'écran
             screen_x = player_x - camera_x
@@ -174,151 +235,269 @@ class GameView:
             sprite_rect = current_sprite.get_rect()
             sprite_rect.centerx = screen_x
             sprite_rect.centery = screen_y
-            self.screen.blit(current_sprite, sprite_rect)
+            self._blit(current_sprite, sprite_rect)
             
             # Debug - afficher des informations supplémentaires
             if self.controller.debug_movement:
                 # Position du joueur à l'écran
-                pygame.draw.circle(self.screen, (255, 0, 0), (int(screen_x), int(screen_y)), 3)
+                center = (int(screen_x), int(screen_y))
+                self._draw(pygame.Rect(center[0] - 4, center[1] - 4, 9, 9),
+                           lambda: pygame.draw.circle(self.screen, (255, 0, 0), center, 3))
                 
                 # Coordonnées du joueur
-                pos_text = f"Pos: ({player_x}, {player_y})"
-                pos_surf = self.font.render(pos_text, True, (255, 255, 0))
-                self.screen.blit(pos_surf, (10, self.screen_height - 60))
+                self._field("Pos: ", "({}, {})".format(*self.controller.player.position), (10, self.screen_height - 60), (255, 255, 0))
                 
                 # Coordonnées caméra
-                cam_text = f"Cam: ({int(camera_x)}, {int(camera_y)})"
-                cam_surf = self.font.render(cam_text, True, (255, 255, 0))
-                self.screen.blit(cam_surf, (10, self.screen_height - 30))
-                
-                # Zone limite où la caméra commence à suivre le joueur
-                edge_margin_x = self.screen_width * 0.25
-                edge_margin_y = self.screen_height * 0.25
-                
-                # Rectangle montrant la zone "morte" où la caméra ne bouge pas
-                pygame.draw.rect(self.screen, (0, 255, 0), 
-                                (edge_margin_x, edge_margin_y, 
-                                 self.screen_width - (2 * edge_margin_x), 
-                                 self.screen_height - (2 * edge_margin_y)), 
-                                 2)
+                self._field("Cam: ", f"({int(camera_x)}, {int(camera_y)})", (10, self.screen_height - 30), (255, 255, 0))
         else:
             # En mode traditionnel, le joueur est à sa position absolue
-            player_x, player_y = self.controller.player.position
-            self.screen.blit(current_sprite, (player_x, player_y))
-        
-        # Vérifier si le joueur est dans les hautes herbes
-        is_in_grass = False
-        if self.controller.using_tiled:
-            is_in_grass = self.controller.map.is_grass(player_x, player_y)
-        else:
-            grid_x = player_x // self.tile_size
-            grid_y = player_y // self.tile_size
-            if 0 <= grid_x < self.controller.map.width and 0 <= grid_y < self.controller.map.height:
-                is_in_grass = self.controller.map.is_grass(grid_x, grid_y)
-        
-        # Effet visuel lorsque le joueur est dans les hautes herbes
-        if is_in_grass and self.is_moving:
-            # Activer l'effet
-            self.in_grass_effect = True
-            self.grass_effect_timer = self.grass_effect_duration
+            player_x, player_y = self.controller.interpolated_position(alpha)
+            self._blit(current_sprite, (round(player_x), round(player_y)))
         
         # Gérer l'effet des hautes herbes
         if self.in_grass_effect and self.grass_effect_timer > 0:
             # Dessiner de petits points verts autour du joueur
             if self.controller.using_tiled:
-                screen_x = player_x - self.controller.map.camera_x
-                screen_y = player_y - self.controller.map.camera_y
+                screen_x = player_x - camera_x
+                screen_y = player_y - camera_y
             else:
                 screen_x, screen_y = player_x, player_y
             
             # Points aléatoires autour du joueur
+            points = []
             for _ in range(3):
                 offset_x = random.randint(-10, 10)
                 offset_y = random.randint(-10, 10)
-                point_x = int(screen_x + offset_x)
-                point_y = int(screen_y + offset_y)
-                
-                # Dessiner un petit point vert
-                pygame.draw.circle(self.screen, (0, 200, 0), (point_x, point_y), 1)
+                points.append((int(screen_x + offset_x), int(screen_y + offset_y)))
             
-            # Diminuer le timer de l'effet
-            self.grass_effect_timer -= 1
-            if self.grass_effect_timer <= 0:
-                self.in_grass_effect = False
+            # Dessiner de petits points verts
+            self._draw(pygame.Rect(int(screen_x) - 12, int(screen_y) - 12, 25, 25),
+                       lambda: [pygame.draw.circle(self.screen, (0, 200, 0), point, 1) for point in points])
         
         # Afficher les informations de débogage
         self._draw_debug_info()
+        
+        # Composer l'image : fond (carte) puis éléments dynamiques
+        self._present()
+    
+    def _frame_state(self, sprite, alpha):
+        """Tout ce qui détermine l'image : si rien n'a changé, l'image précédente est réutilisable"""
+        if self.in_grass_effect and self.grass_effect_timer > 0:
+            return None  # Effet des hautes herbes : points aléatoires à chaque image
+        player_x, player_y = self.controller.interpolated_position(alpha)
+        if self.controller.using_tiled:
+            self.controller.map.set_view(*self.controller.interpolated_camera(alpha))
+        team_view = getattr(self.controller, "team_view", None)
+        team = team_view.state() if team_view is not None and team_view.visible else None
+        return (self._background_state(), id(sprite), round(player_x), round(player_y),
+                self.controller.player.position, self._fps(), team)
+    
+    def _fps(self):
+        """FPS affichés (entiers ; infini tant que les images sont trop rapides pour être mesurées)"""
+        fps = self.controller.clock.get_fps()
+        return int(fps) if math.isfinite(fps) else 0
     
-    def _render_tiled_map(self):
+    def _reuse_frame(self, sprite, alpha):
+        """Chemin rapide : l'écran contient déjà cette image, aucune zone à envoyer"""
+        if not self.dirty_rendering or self.background is None:
+            return False
+        state = self._frame_state(sprite, alpha)
+        camera_moved = self.controller.using_tiled and self.controller.map.camera.dirty
+        reuse = (state is not None and not camera_moved and state == self.frame_key
+                 and self.background_key == state[0])
+        self.frame_key = state
+        if reuse:
+            self.full_redraw = False
+            self.dirty_rects = []
+            self.reused_frames += 1
+        return reuse
+    
+    def _blit(self, surface, position):
+        """Ajoute une surface aux éléments dynamiques de l'image"""
+        rect = surface.get_rect(topleft=position) if not isinstance(position, pygame.Rect) else position
+        self._items.append((rect, lambda: self.screen.blit(surface, rect)))
+    
+    def _label(self, text, position, color=(255, 255, 255)):
+        """Texte fixe : rendu une seule fois grâce au cache de textes"""
+        self._blit(self.text.render(text, 24, color), position)
+    
+    def _field(self, label, value, position, color=(255, 255, 255)):
+        """Libellé fixe suivi d'une valeur changeante composée depuis l'atlas de glyphes"""
+        label_surface = self.text.render(label, 24, color)
+        self._blit(label_surface, position)
+        
+        atlas = self.text.atlas(24, color)
+        value_position = (position[0] + label_surface.get_width(), position[1])
+        self._draw(pygame.Rect(value_position, atlas.size(value)),
+                   lambda: atlas.draw(self.screen, value, value_position))
+    
+    def _draw(self, rect, draw):
+        """Ajoute un dessin (primitive pygame) couvrant le rectangle donné"""
+        self._items.append((rect, draw))
+    
+    def invalidate(self):
+        """Force un rendu complet à la prochaine image (autre écran affiché entre-temps)"""
+        self.background_key = None
+    
+    def _background_state(self):
+        """État dont dépend le fond : s'il change, l'image entière est redessinée"""
+        team_view = getattr(self.controller, "team_view", None)
+        overlay = team_view.visible if team_view is not None else False
+        if self.controller.using_tiled:
+            game_map = self.controller.map
+            return ("tiled", game_map.view_x, game_map.view_y, self.controller.debug_movement, overlay)
+        return ("grid", self.controller.map.version, overlay)
+    
+    def _draw_background(self, surface):
+        """Dessine la carte (et les repères de débogage fixes) sur la surface donnée"""
+        # Effacer avec un fond uni
+        surface.fill((0, 0, 0))  # Noir par défaut
+        
+        # Afficher la carte appropriée
+        if self.controller.using_tiled:
+            self._render_tiled_map(surface)
+        else:
+            self._render_traditional_map(surface)
+    
+    def _present(self):
+        """
+        Compose l'image à l'écran. En mode rectangles sales, seul le fond sous les
+        éléments de l'image précédente et de l'image courante est restauré, et
+        dirty_rects liste les zones à envoyer à pygame.display.update.
+        """
+        rects = [rect for rect, _ in self._items]
+        
+        # Les lignes de l'équipe sont redessinées avec le panneau : leurs zones aussi
+        team_view = getattr(self.controller, "team_view", None)
+        if team_view is not None and team_view.visible:
+            rects.extend(team_view.content_rects())
+        
+        if not self.dirty_rendering:
+            self._draw_background(self.screen)
+            self.full_redraw = True
+            self.dirty_rects = [self.screen.get_rect()]
+        else:
+            state = self._background_state()
+            if self.background is None or state != self.background_key:
+                # Changement de fond (défilement de la caméra...) : rendu complet
+                if self.background is None:
+                    self.background = pygame.Surface((self.screen_width, self.screen_height)).convert()
+                self._draw_background(self.background)
+                self.background_key = state
+                self.screen.blit(self.background, (0, 0))
+                self.full_redraw = True
+                self.dirty_rects = [self.screen.get_rect()]
+            else:
+                # Restaurer le fond sous les anciens et les nouveaux éléments
+                self.full_redraw = False
+                self.dirty_rects = merge_rects(self._previous_rects + rects, self.screen.get_rect())
+                for rect in self.dirty_rects:
+                    self.screen.blit(self.background, rect, rect)
+        
+        for _, draw in self._items:
+            draw()
+        
+        self._previous_rects = rects
+    
+    def _render_tiled_map(self, surface):
         """Affiche la carte Tiled"""
         if hasattr(self.controller.map, 'render'):
             try:
-                # Appliquer les mises à jour du groupe avant de rendre
-                self.controller.map.group.update()
-                
-                # Rendre la carte avec le groupe mis à jour
-                self.controller.map.group.draw(self.screen)
+                # Rendre la carte (pyscroll ou blocs chargés à la demande)
+                self.controller.map.render(surface)
                 
                 # Affichage de débogage pour visualiser la position
                 if self.controller.debug_movement:
-                    center_x = self.screen_width // 2
-                    center_y = self.screen_height // 2
                     # Dessiner une grille pour aider à visualiser le mouvement
                     for x in range(0, self.screen_width, self.tile_size):
-                        pygame.draw.line(self.screen, (100, 100, 100), (x, 0), (x, self.screen_height), 1)
+                        pygame.draw.line(surface, (100, 100, 100), (x, 0), (x, self.screen_height), 1)
                     for y in range(0, self.screen_height, self.tile_size):
-                        pygame.draw.line(self.screen, (100, 100, 100), (0, y), (self.screen_width, y), 1)
+                        pygame.draw.line(surface, (100, 100, 100), (0, y), (self.screen_width, y), 1)
+                    
+                    # Zone limite où la caméra commence à suivre le joueur
+                    edge_margin_x = self.screen_width * 0.25
+                    edge_margin_y = self.screen_height * 0.25
+                    
+                    # Rectangle montrant la zone "morte" où la caméra ne bouge pas
+                    pygame.draw.rect(surface, (0, 255, 0), 
+                                    (edge_margin_x, edge_margin_y, 
+                                     self.screen_width - (2 * edge_margin_x), 
+                                     self.screen_height - (2 * edge_margin_y)), 
+                                     2)
             except Exception as e:
                 print(f"❌ Erreur lors du rendu de la carte Tiled: {e}")
                 import traceback
                 traceback.print_exc()
-                self.screen.fill((135, 206, 235))  # Bleu ciel en cas d'erreur
+                surface.fill((135, 206, 235))  # Bleu ciel en cas d'erreur
         else:
             # Fallback au cas où render n'existe pas
-            self.screen.fill((135, 206, 235))  # Bleu ciel
+            surface.fill((135, 206, 235))  # Bleu ciel
+    
+    def _render_traditional_map(self, surface):
+        """Dessine la carte traditionnelle : un seul blit du fond précalculé"""
+        game_map = self.controller.map
+        
+        if self.map_background is None:
+            self._bake_traditional_map()
+        elif self.map_background_version != game_map.version:
+            # Ne recalculer que les tuiles modifiées
+            for x, y in game_map.changes_since(self.map_background_version):
+                self._bake_tile(x, y)
+            self.map_background_version = game_map.version
+        
+        surface.blit(self.map_background, (0, 0))
     
-    def _render_traditional_map(self):
-        """Dessine la carte traditionnelle en utilisant les textures"""
+    def _bake_traditional_map(self):
+        """Compose toute la carte traditionnelle dans une surface mise en cache"""
+        game_map = self.controller.map
+        width = max(self.screen_width, game_map.width * self.tile_size)
+        height = max(self.screen_height, game_map.height * self.tile_size)
+        
         # Fond bleu ciel par défaut
-        self.screen.fill((135, 206, 235))
+        self.map_background = pygame.Surface((width, height)).convert()
+        self.map_background.fill((135, 206, 235))
         
-        map_data = self.controller.map.grid
+        for y, row in enumerate(game_map.grid):
+            for x in range(len(row)):
+                self._bake_tile(x, y)
         
-        for y, row in enumerate(map_data):
-            for x, tile in enumerate(row):
-                # Position à l'écran
-                screen_x = x * self.tile_size
-                screen_y = y * self.tile_size
-                
-                # Obtenir la texture pour ce type de tuile
-                texture = self.textures.get(tile, self.textures.get(".", None))
-                
-                if texture:
-                    # Afficher la texture
-                    self.screen.blit(texture, (screen_x, screen_y))
-                else:
-                    # Fallback si la texture est manquante
-                    pygame.draw.rect(
-                        self.screen,
-                        (100, 100, 100),
-                        (screen_x, screen_y, self.tile_size, self.tile_size)
-                    )
-                    
-                    # Afficher le caractère de la tuile
-                    text = self.font.render(tile, True, (255, 255, 255))
-                    text_rect = text.get_rect(center=(
-                        screen_x + self.tile_size // 2,
-                        screen_y + self.tile_size // 2
-                    ))
-                    self.screen.blit(text, text_rect)
+        self.map_background_version = game_map.version
+    
+    def _bake_tile(self, x, y):
+        """Dessine une tuile de la carte traditionnelle dans le fond précalculé"""
+        tile = self.controller.map.grid[y][x]
+        
+        # Position dans le fond
+        screen_x = x * self.tile_size
+        screen_y = y * self.tile_size
+        
+        # Obtenir la texture pour ce type de tuile
+        texture = self.textures.get(tile, self.textures.get(".", None))
+        
+        if texture:
+            # Afficher la texture
+            self.map_background.blit(texture, (screen_x, screen_y))
+        else:
+            # Fallback si la texture est manquante
+            pygame.draw.rect(
+                self.map_background,
+                (100, 100, 100),
+                (screen_x, screen_y, self.tile_size, self.tile_size)
+            )
+            
+            # Afficher le caractère de la tuile
+            text = self.text.render(tile)
+            text_rect = text.get_rect(center=(
+                screen_x + self.tile_size // 2,
+                screen_y + self.tile_size // 2
+            ))
+            self.map_background.blit(text, text_rect)
     
     def _draw_debug_info(self):
         """Affiche des informations de débogage"""
         # Position du joueur
         player_x, player_y = self.controller.player.position
-        position_text = f"Position: ({player_x}, {player_y})"
-        position_surface = self.font.render(position_text, True, (255, 255, 255))
-        self.screen.blit(position_surface, (10, 10))
+        self._field("Position: ", f"({player_x}, {player_y})", (10, 10))
         
         # Position en tuiles
         if self.controller.using_tiled:
@@ -328,39 +507,40 @@ class GameView:
             tile_x = player_x // self.tile_size
             tile_y = player_y // self.tile_size
             
-        grid_text = f"Tuile: ({tile_x}, {tile_y})"
-        grid_surface = self.font.render(grid_text, True, (255, 255, 255))
-        self.screen.blit(grid_surface, (10, 40))
+        self._field("Tuile: ", f"({tile_x}, {tile_y})", (10, 40))
         
         # Type de carte
         map_type = "Tiled" if self.controller.using_tiled else "Traditionnelle"
-        type_text = f"Carte: {map_type}"
-        type_surface = self.font.render(type_text, True, (255, 255, 255))
-        self.screen.blit(type_surface, (10, 70))
+        self._label(f"Carte: {map_type}", (10, 70))
         
         # FPS
-        fps = int(self.controller.clock.get_fps())
-        fps_text = f"FPS: {fps}"
-        fps_surface = self.font.render(fps_text, True, (255, 255, 255))
-        self.screen.blit(fps_surface, (10, 100))
+        fps = self._fps()
+        self._field("FPS: ", str(fps), (10, 100))
         
         # Indication si le joueur est dans l'herbe
         is_in_grass = self.controller.map.is_grass(player_x, player_y) if self.controller.using_tiled else False
         grass_text = f"Dans l'herbe: {'Oui' if is_in_grass else 'Non'}"
-        grass_surface = self.font.render(grass_text, True, (0, 255, 0) if is_in_grass else (255, 255, 255))
-        self.screen.blit(grass_surface, (10, 130))
+        self._label(grass_text, (10, 130), (0, 255, 0) if is_in_grass else (255, 255, 255))
         
         # Instruction
         help_text = "Flèches=déplacement | T=équipe | D=debug | ESC=quitter"
-        help_surface = self.font.render(help_text, True, (255, 255, 255))
-        self.screen.blit(help_surface, (10, self.screen_height - 30))
+        self._label(help_text, (10, self.screen_height - 30))
+    
+    def render_encounter_transition(self, progress):
+        """Transition vers un combat : deux bandes noires qui se referment (progress de 0 à 1)"""
+        band_height = int(self.screen_height / 2 * progress)
+        if band_height > 0:
+            self.screen.fill((0, 0, 0), (0, 0, self.screen_width, band_height))
+            self.screen.fill((0, 0, 0), (0, self.screen_height - band_height, self.screen_width, band_height))
     
     def update_player_sprite(self, direction):
         """Met à jour la direction du sprite du joueur et active l'animation"""
         if direction in self.sprites:
+            # Redémarrer l'animation seulement au changement de direction ou au départ
+            if direction != self.current_direction or not self.is_moving:
+                self.animation_timer = 0
             self.current_direction = direction
             self.is_moving = True
-            self.animation_timer = pygame.time.get_ticks()
     
     def stop_player_animation(self):
         """Arrête l'animation du joueur"""
@@ -1,27 +1,88 @@
 import pygame
+from utils.surface_cache import load_surface
+from utils.text_renderer import get_text_renderer
+
+# Mise en page du panneau de l'équipe
+PANEL_ORIGIN = (50, 50)
+ROW_HEIGHT = 36
+ICON_SIZE = 32
+OVERLAY_ALPHA = 200
 
 class TeamView:
+    """
+    Écran de l'équipe : un voile sombre et la liste des Pokémon (icône, nom, PV), composés
+    dans un panneau en cache. Le panneau n'est redessiné que si l'équipe ou des PV changent
+    (version de l'équipe du joueur) ; sinon une image ne coûte qu'un blit du panneau.
+    """
+
     def __init__(self, controller):
         self.controller = controller
         self.screen = controller.view.screen
-        self.font = pygame.font.Font(None, 24)
+        self.text = get_text_renderer()
+        self.font = self.text.font(24)
         self.visible = False  # visibilité initiale : cachée
+        self.panel = None        # Voile + liste, alloué une seule fois
+        self.panel_key = None    # État de l'équipe dessiné dans le panneau
+        self._rects = []         # Zones des lignes de l'équipe dans le panneau
+        self.rebuilds = 0
+
+    def state(self):
+        """Ce que montre le panneau : version de l'équipe et PV de chaque Pokémon"""
+        player = self.controller.player
+        return player.party_version, tuple((pokemon.hp, pokemon.max_hp) for pokemon in player.pokemons)
+
+    def _icon(self, pokemon):
+        """Icône du Pokémon (sprite de face réduit, via le cache partagé), ou None"""
+        if not pokemon.sprite_path:
+            return None
+        try:
+            return load_surface(pokemon.sprite_path, (ICON_SIZE, ICON_SIZE))
+        except Exception:
+            return None
+
+    def _panel(self):
+        """Panneau à jour : redessiné seulement quand l'état de l'équipe a changé"""
+        key = self.state()
+        if self.panel is not None and key == self.panel_key:
+            return self.panel
+
+        if self.panel is None:
+            self.panel = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+            if pygame.display.get_surface() is not None:
+                self.panel = self.panel.convert_alpha()
+        self.panel.fill((0, 0, 0, OVERLAY_ALPHA))
+
+        self._rects = []
+        x, y = PANEL_ORIGIN
+        for pokemon in self.controller.player.pokemons:
+            row = pygame.Rect(x, y, ICON_SIZE, ROW_HEIGHT)
+            icon = self._icon(pokemon)
+            if icon is not None:
+                self.panel.blit(icon, (x, y + (ROW_HEIGHT - ICON_SIZE) // 2))
+
+            label = self.text.render(f"{pokemon.name} HP: {pokemon.hp}/{pokemon.max_hp}")
+            label_rect = label.get_rect(midleft=(x + ICON_SIZE + 8, y + ROW_HEIGHT // 2))
+            self.panel.blit(label, label_rect)
+            self._rects.append(row.union(label_rect))
+            y += ROW_HEIGHT
+
+        self.panel_key = key
+        self.rebuilds += 1
+        return self.panel
+
+    def content_rects(self):
+        """Zones occupées par les lignes (restaurées à chaque image en mode rectangles sales)"""
+        self._panel()
+        return list(self._rects)
 
     def render(self):
         # Ne pas faire pygame.display.flip() ici.
-        overlay = pygame.Surface(self.screen.get_size())
-        overlay.set_alpha(200)
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
-
-        # Affiche Pokémon
-        for idx, pokemon in enumerate(self.controller.player.pokemons):
-            text = self.font.render(
-                f"{pokemon.name} HP: {pokemon.hp}/{pokemon.max_hp}",
-                True, (255, 255, 255))
-            self.screen.blit(text, (50, 50 + 30 * idx))
-
-           
-            
-        
-   
\ No newline at end of file
+        panel = self._panel()
+
+        # Ne recouvrir que les zones redessinées par la vue principale : ailleurs,
+        # l'écran contient déjà le panneau de l'image précédente
+        view = self.controller.view
+        areas = [self.screen.get_rect()] if view.full_redraw else view.dirty_rects
+
+        for area in areas:
+            self.screen.blit(panel, area.topleft, area)